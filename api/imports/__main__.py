@@ -0,0 +1,51 @@
+async def run():
+    import argparse
+    import json
+
+    from queries.import_queries import IMPORT_TARGETS, ImportQueries
+    from queries.pool import pool
+    from queries.report_queries import stop_pipeline_refresh
+    from utils.exceptions import InvalidImportFileError
+    from utils.imports import ImportFormat, read_rows
+
+    parser = argparse.ArgumentParser(
+        prog="python -m imports",
+        description="Bulk load a CSV or NDJSON file with COPY.",
+    )
+    parser.add_argument("table", choices=sorted(IMPORT_TARGETS))
+    parser.add_argument("path")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in ImportFormat],
+        help="defaults to the file extension",
+    )
+    parser.add_argument(
+        "--all-or-nothing",
+        action="store_true",
+        help="import nothing if any row has an error",
+    )
+    args = parser.parse_args()
+
+    format = args.format or ("ndjson" if args.path.endswith(".ndjson") else "csv")
+    async with pool:
+        with open(args.path, "rb") as stream:
+            try:
+                report = await ImportQueries().import_rows(
+                    args.table,
+                    read_rows(stream, ImportFormat(format)),
+                    args.all_or_nothing,
+                )
+            except InvalidImportFileError as e:
+                print(e)
+                exit(1)
+        # The import only scheduled the refresh of the pipeline report.
+        await stop_pipeline_refresh()
+    print(json.dumps(report.model_dump(), indent=2))
+    if report.errors:
+        exit(1)
+
+
+if __name__ == "__main__":
+    from asyncio import run as run_async
+
+    run_async(run())
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import psycopg
+from pydantic import ValidationError
+from jobs.handlers import HANDLERS
+from models.job import JobKind
+from queries.job_queries import (
+    CHANNEL,
+    JOB_LEASE,
+    claim_job,
+    fail_job,
+    renew_lease,
+    requeue_expired_jobs,
+    succeed_job,
+)
+from queries.invalidation import listen_to, start_listener, stop_listener
+from queries.pool import close_pool, open_pool
+from queries.report_queries import stop_pipeline_refresh
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidImportFileError,
+    JobLeaseExpired,
+)
+
+# The job worker behind `python -m jobs` (see queries.job_queries). Each
+# process runs `concurrency` runners that claim and run jobs one at a
+# time; more throughput comes from more processes. Idle runners wait for
+# the notification of a queued job, heard on the connection of the
+# shared listener (queries.invalidation). A job cut short by a stopped
+# worker runs again once its lease has run out.
+
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "5"))
+
+# Failures that come from the payload or the data it names, not from
+# the attempt: running the job again would fail the same way.
+PERMANENT_ERRORS = (BulkOperationError, InvalidImportFileError)
+
+_wake = asyncio.Event()
+
+
+def _notified(payload) -> None:
+    _wake.set()
+
+
+async def _renew(job: dict) -> None:
+    while True:
+        await asyncio.sleep(JOB_LEASE / 3)
+        try:
+            await renew_lease(job)
+        except psycopg.Error as e:
+            print(f"Error renewing the lease of job {job['job_id']}: {e}")
+
+
+async def run_job(job: dict) -> None:
+    name = f"{job['kind']} job {job['job_id']} (attempt {job['attempts']})"
+    renewal = asyncio.create_task(_renew(job))
+    try:
+        result = await HANDLERS[JobKind(job["kind"])](job)
+    except ValidationError as e:
+        status = await fail_job(job, f"Invalid payload: {e}", retry=False)
+        print(f"{name} {status}: invalid payload")
+    except PERMANENT_ERRORS as e:
+        status = await fail_job(job, f"{type(e).__name__}: {e}", retry=False)
+        print(f"{name} {status}: {type(e).__name__}: {e}")
+    except JobLeaseExpired:
+        # Another attempt has the job now; this one's work was undone.
+        print(f"{name} abandoned: its lease ran out")
+    except Exception as e:
+        status = await fail_job(job, f"{type(e).__name__}: {e}")
+        print(f"{name} {status}: {type(e).__name__}: {e}")
+    else:
+        await succeed_job(job, result)
+        print(f"{name} succeeded")
+    finally:
+        renewal.cancel()
+
+
+async def _runner() -> None:
+    while True:
+        _wake.clear()
+        try:
+            job = await claim_job()
+        except psycopg.Error as e:
+            print(f"Error claiming a job: {e}")
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(_wake.wait(), JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        try:
+            await run_job(job)
+        except psycopg.Error as e:
+            print(f"Error recording the outcome of job {job['job_id']}: {e}")
+
+
+async def _requeuer() -> None:
+    while True:
+        try:
+            requeued = await requeue_expired_jobs()
+            if requeued:
+                print(f"Requeued {requeued} jobs whose worker stopped")
+        except psycopg.Error as e:
+            print(f"Error requeueing expired jobs: {e}")
+        await asyncio.sleep(JOB_LEASE)
+
+
+async def work(concurrency: int = 1) -> None:
+    listen_to(CHANNEL, _notified)
+    await open_pool()
+    await start_listener()
+    try:
+        await asyncio.gather(_requeuer(), *(_runner() for _ in range(concurrency)))
+    finally:
+        await stop_listener()
+        await stop_pipeline_refresh()
+        await close_pool()
@@ -0,0 +1,26 @@
+async def run():
+    import argparse
+
+    from jobs import work
+
+    parser = argparse.ArgumentParser(
+        prog="python -m jobs",
+        description="Run queued background jobs until stopped.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="jobs run at the same time by this process",
+    )
+    args = parser.parse_args()
+    await work(args.concurrency)
+
+
+if __name__ == "__main__":
+    from asyncio import run as run_async
+
+    try:
+        run_async(run())
+    except KeyboardInterrupt:
+        pass
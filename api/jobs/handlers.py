@@ -0,0 +1,49 @@
+import io
+from models.job import DeleteJob, ImportJob, JobKind, RepairJob
+from queries.account_counters import REPAIR_BATCH_SIZE, repair_account_counters
+from queries.cascade import delete_cascading
+from queries.import_queries import ImportQueries
+from queries.report_queries import refresh_pipeline
+from utils.imports import read_rows
+
+# What each kind of job does. A handler receives the claimed job, with
+# the payload as it was queued (see models.job.JOB_PAYLOADS), and returns
+# the job's result as JSON-compatible data; any exception fails the
+# attempt. An attempt may be repeated, when its worker stops or its
+# lease runs out; imports are the one kind of job that is not safe to
+# repeat, and record their success in the transaction that imports.
+
+
+async def import_rows(job: dict) -> dict:
+    payload = ImportJob.model_validate(job["payload"])
+    report = await ImportQueries().import_rows(
+        payload.table,
+        read_rows(io.BytesIO(payload.content.encode()), payload.format),
+        payload.all_or_nothing,
+        job,
+    )
+    return report.model_dump(mode="json")
+
+
+async def delete(job: dict) -> dict:
+    payload = DeleteJob.model_validate(job["payload"])
+    return await delete_cascading(payload.table, payload.keys)
+
+
+async def refresh(job: dict) -> dict:
+    # False when another refresh was already running.
+    return {"refreshed": await refresh_pipeline()}
+
+
+async def repair(job: dict) -> dict:
+    payload = RepairJob.model_validate(job["payload"])
+    repaired = await repair_account_counters(payload.batch_size or REPAIR_BATCH_SIZE)
+    return {"repaired": repaired}
+
+
+HANDLERS = {
+    JobKind.import_rows: import_rows,
+    JobKind.delete: delete,
+    JobKind.refresh_pipeline: refresh,
+    JobKind.repair_account_counters: repair,
+}
@@ -0,0 +1,175 @@
+# Indexes on every foreign key column, plus reverse (second column first)
+# indexes on the composite primary keys of the association tables, so that
+# lookups by either side and the FK checks on delete avoid sequential scans.
+#
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so this
+# migration runs in autocommit mode with one statement per step.
+transactional = False
+
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_parent_account_id_idx
+            ON accounts (parent_account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_parent_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_account_owner_id_idx
+            ON accounts (account_owner_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_account_owner_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_billing_country_id_idx
+            ON accounts (billing_country_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_billing_country_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_shipping_country_id_idx
+            ON accounts (shipping_country_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_shipping_country_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_account_id_idx
+            ON contacts (account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_site_country_id_idx
+            ON contacts (site_country_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_site_country_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_account_id_idx
+            ON opportunities (account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_stage_id_idx
+            ON opportunities (stage_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_stage_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_forecast_category_id_idx
+            ON opportunities (forecast_category_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_forecast_category_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunity_contacts_contact_id_opportunity_id_idx
+            ON opportunity_contacts (contact_id, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunity_contacts_contact_id_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunity_owners_user_id_opportunity_id_idx
+            ON opportunity_owners (user_id, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunity_owners_user_id_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activities_opportunity_id_idx
+            ON activities (opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activities_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activities_activity_type_id_idx
+            ON activities (activity_type_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activities_activity_type_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activity_users_user_id_activity_id_idx
+            ON activity_users (user_id, activity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activity_users_user_id_activity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activity_contacts_contact_id_activity_id_idx
+            ON activity_contacts (contact_id, activity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activity_contacts_contact_id_activity_id_idx;
+        """,
+    ],
+]
@@ -0,0 +1,167 @@
+# Indexes matching the sort orders offered by the list routes (see
+# utils.filters), one for every column a model lists in sort_fields. Each
+# sort column is followed by the primary key, which is appended to every
+# sort as a tie-breaker, so that a sorted page is read in order from the
+# index (backwards for descending sorts) and can stop after LIMIT rows.
+# users.username is unique, and its UNIQUE index serves that sort as is.
+#
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so this
+# migration runs in autocommit mode with one statement per step.
+transactional = False
+
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_account_name_account_id_idx
+            ON accounts (account_name, account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_account_name_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_type_account_id_idx
+            ON accounts (type, account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_type_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_billing_city_account_id_idx
+            ON accounts (billing_city, account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_billing_city_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_billing_state_account_id_idx
+            ON accounts (billing_state, account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_billing_state_account_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_last_name_contact_id_idx
+            ON contacts (last_name, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_last_name_contact_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_first_name_contact_id_idx
+            ON contacts (first_name, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_first_name_contact_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_title_contact_id_idx
+            ON contacts (title, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_title_contact_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_email_contact_id_idx
+            ON contacts (email, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_email_contact_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_close_date_opportunity_id_idx
+            ON opportunities (close_date, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_close_date_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_amount_opportunity_id_idx
+            ON opportunities (amount, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_amount_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_opportunity_name_opportunity_id_idx
+            ON opportunities (opportunity_name, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_opportunity_name_opportunity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activities_due_date_activity_id_idx
+            ON activities (due_date, activity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activities_due_date_activity_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS users_first_name_user_id_idx
+            ON users (first_name, user_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS users_first_name_user_id_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS users_last_name_user_id_idx
+            ON users (last_name, user_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS users_last_name_user_id_idx;
+        """,
+    ],
+]
@@ -0,0 +1,45 @@
+# Pipeline totals for GET /api/reports/pipeline, by stage, forecast
+# category and close month. The view is refreshed CONCURRENTLY by the API
+# (queries.report_queries) shortly after opportunities change, which
+# needs a unique index over plain columns covering every row.
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE MATERIALIZED VIEW pipeline_summary AS
+        SELECT
+            o.stage_id,
+            s.stage_name,
+            o.forecast_category_id,
+            f.category_name,
+            date_trunc('month', o.close_date)::date AS close_month,
+            count(*) AS opportunity_count,
+            coalesce(sum(o.amount), 0) AS total_amount
+        FROM opportunities o
+        JOIN stages s ON s.stage_id = o.stage_id
+        LEFT JOIN forecast_categories f
+            ON f.forecast_category_id = o.forecast_category_id
+        GROUP BY
+            o.stage_id,
+            s.stage_name,
+            o.forecast_category_id,
+            f.category_name,
+            date_trunc('month', o.close_date);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP MATERIALIZED VIEW pipeline_summary;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE UNIQUE INDEX pipeline_summary_key_idx
+            ON pipeline_summary (stage_id, forecast_category_id, close_month);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX pipeline_summary_key_idx;
+        """,
+    ],
+]
@@ -0,0 +1,151 @@
+# Account hierarchy. account_closure holds one row per (ancestor,
+# descendant) pair of accounts, including every account paired with
+# itself at depth 0, so that the whole subtree under an account is one
+# index range scan on the primary key at any depth. It is maintained by
+# triggers on accounts.parent_account_id:
+#
+# - linking an account under a parent adds a path from each ancestor of
+#   the parent to each account in the account's subtree;
+# - moving it first removes the paths from its old ancestors, and
+#   refuses a parent inside its own subtree;
+# - deleting an account removes its rows through ON DELETE CASCADE.
+#
+# Hierarchy changes take a transaction-level advisory lock, so that two
+# concurrent moves cannot build a cycle or read stale paths.
+#
+# stages.is_closed marks the won and lost stages, which do not count as
+# open pipeline in the rollups.
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TABLE account_closure (
+            ancestor_id INTEGER NOT NULL
+                REFERENCES accounts(account_id) ON DELETE CASCADE,
+            descendant_id INTEGER NOT NULL
+                REFERENCES accounts(account_id) ON DELETE CASCADE,
+            depth INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        );
+        CREATE INDEX account_closure_descendant_id_idx
+            ON account_closure (descendant_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TABLE account_closure;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE FUNCTION account_closure_link(account INTEGER, parent INTEGER)
+        RETURNS VOID AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('account_closure'));
+            -- The parent's own row may not exist yet when a child is
+            -- inserted in the same statement ahead of it.
+            INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+            VALUES (account, account, 0), (parent, parent, 0)
+            ON CONFLICT DO NOTHING;
+            IF EXISTS (
+                SELECT 1 FROM account_closure
+                WHERE ancestor_id = account AND descendant_id = parent
+            ) THEN
+                RAISE EXCEPTION 'Account % cannot be moved under its own subsidiary %.',
+                    account, parent
+                    USING ERRCODE = 'check_violation';
+            END IF;
+            INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+            SELECT a.ancestor_id, d.descendant_id, a.depth + d.depth + 1
+            FROM account_closure a, account_closure d
+            WHERE a.descendant_id = parent AND d.ancestor_id = account
+            ON CONFLICT DO NOTHING;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION account_closure_unlink(account INTEGER)
+        RETURNS VOID AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('account_closure'));
+            DELETE FROM account_closure c
+            USING account_closure a, account_closure d
+            WHERE a.descendant_id = account AND a.ancestor_id <> account
+                AND d.ancestor_id = account
+                AND c.ancestor_id = a.ancestor_id
+                AND c.descendant_id = d.descendant_id;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION accounts_closure_insert() RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.parent_account_id IS NULL THEN
+                INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+                VALUES (NEW.account_id, NEW.account_id, 0)
+                ON CONFLICT DO NOTHING;
+            ELSE
+                PERFORM account_closure_link(NEW.account_id, NEW.parent_account_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION accounts_closure_update() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM account_closure_unlink(NEW.account_id);
+            IF NEW.parent_account_id IS NOT NULL THEN
+                PERFORM account_closure_link(NEW.account_id, NEW.parent_account_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER accounts_closure_insert
+            AFTER INSERT ON accounts
+            FOR EACH ROW EXECUTE FUNCTION accounts_closure_insert();
+
+        CREATE TRIGGER accounts_closure_update
+            AFTER UPDATE OF parent_account_id ON accounts
+            FOR EACH ROW
+            WHEN (OLD.parent_account_id IS DISTINCT FROM NEW.parent_account_id)
+            EXECUTE FUNCTION accounts_closure_update();
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TRIGGER accounts_closure_update ON accounts;
+        DROP TRIGGER accounts_closure_insert ON accounts;
+        DROP FUNCTION accounts_closure_update();
+        DROP FUNCTION accounts_closure_insert();
+        DROP FUNCTION account_closure_unlink(INTEGER);
+        DROP FUNCTION account_closure_link(INTEGER, INTEGER);
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        LOCK TABLE accounts IN SHARE ROW EXCLUSIVE MODE;
+        INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+            SELECT account_id, account_id, 0 FROM accounts
+            UNION ALL
+            SELECT p.ancestor_id, a.account_id, p.depth + 1
+            FROM paths p
+            JOIN accounts a ON a.parent_account_id = p.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM paths;
+        """,
+        # "Down" SQL statement
+        """--sql
+        DELETE FROM account_closure;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        ALTER TABLE stages ADD COLUMN is_closed BOOLEAN NOT NULL DEFAULT FALSE;
+        """,
+        # "Down" SQL statement
+        """--sql
+        ALTER TABLE stages DROP COLUMN is_closed;
+        """,
+    ],
+]
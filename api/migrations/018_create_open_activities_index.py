@@ -0,0 +1,24 @@
+# Partial index for the activity queues of GET /api/users/{user_id}/
+# activities (see queries.user_queries): the open activities in due date
+# order, leaving out the completed ones, which are most of the table and
+# never read in that order. activity_users (user_id, activity_id) is
+# indexed by migration 014.
+#
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so this
+# migration runs in autocommit mode.
+transactional = False
+
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activities_open_due_date_idx
+            ON activities (due_date, activity_id)
+            WHERE NOT completed;
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activities_open_due_date_idx;
+        """,
+    ],
+]
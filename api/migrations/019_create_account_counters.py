@@ -0,0 +1,309 @@
+# Denormalized counters on accounts, read by the account routes at no
+# cost beyond the row itself:
+#
+# - contact_count: contacts of the account;
+# - open_opportunity_count, open_pipeline_amount: opportunities of the
+#   account in a stage that is not closed, and the sum of their amounts;
+# - last_activity_date: the latest due date of a completed activity on
+#   one of the account's opportunities.
+#
+# They are kept exact by statement-level triggers with transition tables,
+# so that a bulk write or import of any size updates each account once.
+# The counts are applied as increments ("n = n + delta"), and new
+# completed activities move last_activity_date forward with greatest(),
+# both of which stay exact when concurrent transactions change the same
+# account. Only when a completed activity goes away (or an opportunity
+# moves to another account) is last_activity_date recomputed.
+# queries.account_counters recomputes everything in batches, should they
+# ever drift (for instance after writes with triggers disabled).
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        ALTER TABLE accounts
+            ADD COLUMN contact_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN open_opportunity_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN open_pipeline_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+            ADD COLUMN last_activity_date DATE;
+        """,
+        # "Down" SQL statement
+        """--sql
+        ALTER TABLE accounts
+            DROP COLUMN contact_count,
+            DROP COLUMN open_opportunity_count,
+            DROP COLUMN open_pipeline_amount,
+            DROP COLUMN last_activity_date;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TYPE account_counter_delta AS (
+            account_id INTEGER,
+            contact_count INTEGER,
+            open_opportunity_count INTEGER,
+            open_pipeline_amount NUMERIC
+        );
+
+        CREATE FUNCTION apply_account_counter_deltas(
+            deltas account_counter_delta[]
+        ) RETURNS VOID AS $$
+            UPDATE accounts a SET
+                contact_count = a.contact_count + d.contact_count,
+                open_opportunity_count =
+                    a.open_opportunity_count + d.open_opportunity_count,
+                open_pipeline_amount =
+                    a.open_pipeline_amount + d.open_pipeline_amount
+            FROM (
+                SELECT
+                    account_id,
+                    sum(contact_count) AS contact_count,
+                    sum(open_opportunity_count) AS open_opportunity_count,
+                    sum(open_pipeline_amount) AS open_pipeline_amount
+                FROM unnest(deltas)
+                WHERE account_id IS NOT NULL
+                GROUP BY account_id
+            ) d
+            WHERE a.account_id = d.account_id
+                AND (d.contact_count, d.open_opportunity_count,
+                    d.open_pipeline_amount) <> (0, 0, 0);
+        $$ LANGUAGE sql;
+
+        CREATE FUNCTION refresh_last_activity_date(account_ids INTEGER[])
+        RETURNS VOID AS $$
+            UPDATE accounts a SET last_activity_date = l.last_activity_date
+            FROM (
+                SELECT x.account_id, max(t.due_date) AS last_activity_date
+                FROM unnest(account_ids) x (account_id)
+                LEFT JOIN opportunities o ON o.account_id = x.account_id
+                LEFT JOIN activities t
+                    ON t.opportunity_id = o.opportunity_id AND t.completed
+                GROUP BY x.account_id
+            ) l
+            WHERE a.account_id = l.account_id
+                AND a.last_activity_date IS DISTINCT FROM l.last_activity_date;
+        $$ LANGUAGE sql;
+
+        CREATE FUNCTION contacts_account_counters() RETURNS TRIGGER AS $$
+        DECLARE
+            deltas account_counter_delta[] := '{}';
+        BEGIN
+            IF TG_OP <> 'DELETE' THEN
+                deltas := deltas || ARRAY(
+                    SELECT (account_id, 1, 0, 0)::account_counter_delta
+                    FROM new_rows
+                );
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                deltas := deltas || ARRAY(
+                    SELECT (account_id, -1, 0, 0)::account_counter_delta
+                    FROM old_rows
+                );
+            END IF;
+            PERFORM apply_account_counter_deltas(deltas);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION opportunities_account_counters() RETURNS TRIGGER AS $$
+        DECLARE
+            deltas account_counter_delta[] := '{}';
+        BEGIN
+            IF TG_OP <> 'DELETE' THEN
+                deltas := deltas || ARRAY(
+                    SELECT (o.account_id, 0, 1, coalesce(o.amount, 0))
+                        ::account_counter_delta
+                    FROM new_rows o
+                    JOIN stages s ON s.stage_id = o.stage_id
+                    WHERE NOT s.is_closed
+                );
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                deltas := deltas || ARRAY(
+                    SELECT (o.account_id, 0, -1, -coalesce(o.amount, 0))
+                        ::account_counter_delta
+                    FROM old_rows o
+                    JOIN stages s ON s.stage_id = o.stage_id
+                    WHERE NOT s.is_closed
+                );
+            END IF;
+            PERFORM apply_account_counter_deltas(deltas);
+            -- Activities follow their opportunity to its new account.
+            IF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_last_activity_date(ARRAY(
+                    SELECT unnest(ARRAY[o.account_id, n.account_id])
+                    FROM old_rows o
+                    JOIN new_rows n ON n.opportunity_id = o.opportunity_id
+                    WHERE n.account_id <> o.account_id
+                ));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Completed activities that appear (inserted, or updated into
+        -- place) can only move last_activity_date forward; ones that go
+        -- away send their accounts to refresh_last_activity_date.
+        CREATE FUNCTION activities_account_counters() RETURNS TRIGGER AS $$
+        DECLARE
+            removed INTEGER[] := '{}';
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                removed := ARRAY(
+                    SELECT opportunity_id FROM old_rows
+                    WHERE completed AND due_date IS NOT NULL
+                );
+            ELSIF TG_OP = 'UPDATE' THEN
+                removed := ARRAY(
+                    SELECT o.opportunity_id
+                    FROM old_rows o
+                    JOIN new_rows n ON n.activity_id = o.activity_id
+                    WHERE o.completed AND o.due_date IS NOT NULL
+                        AND (o.completed, o.due_date, o.opportunity_id)
+                            IS DISTINCT FROM
+                            (n.completed, n.due_date, n.opportunity_id)
+                );
+            END IF;
+            IF cardinality(removed) > 0 THEN
+                PERFORM refresh_last_activity_date(ARRAY(
+                    SELECT DISTINCT account_id FROM opportunities
+                    WHERE opportunity_id IN (SELECT unnest(removed))
+                ));
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                UPDATE accounts a
+                SET last_activity_date = greatest(a.last_activity_date, d.due_date)
+                FROM (
+                    SELECT o.account_id, max(n.due_date) AS due_date
+                    FROM new_rows n
+                    JOIN opportunities o ON o.opportunity_id = n.opportunity_id
+                    WHERE n.completed
+                    GROUP BY o.account_id
+                ) d
+                WHERE a.account_id = d.account_id
+                    AND a.last_activity_date IS DISTINCT FROM
+                        greatest(a.last_activity_date, d.due_date);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION stages_account_counters() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM apply_account_counter_deltas(ARRAY(
+                SELECT (
+                    o.account_id,
+                    0,
+                    CASE WHEN n.is_closed THEN -1 ELSE 1 END,
+                    CASE WHEN n.is_closed THEN -1 ELSE 1 END
+                        * coalesce(o.amount, 0)
+                )::account_counter_delta
+                FROM old_rows p
+                JOIN new_rows n ON n.stage_id = p.stage_id
+                JOIN opportunities o ON o.stage_id = n.stage_id
+                WHERE n.is_closed <> p.is_closed
+            ));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP FUNCTION stages_account_counters();
+        DROP FUNCTION activities_account_counters();
+        DROP FUNCTION opportunities_account_counters();
+        DROP FUNCTION contacts_account_counters();
+        DROP FUNCTION refresh_last_activity_date(INTEGER[]);
+        DROP FUNCTION apply_account_counter_deltas(account_counter_delta[]);
+        DROP TYPE account_counter_delta;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TRIGGER contacts_account_counters_insert
+            AFTER INSERT ON contacts REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION contacts_account_counters();
+        CREATE TRIGGER contacts_account_counters_update
+            AFTER UPDATE ON contacts
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION contacts_account_counters();
+        CREATE TRIGGER contacts_account_counters_delete
+            AFTER DELETE ON contacts REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION contacts_account_counters();
+
+        CREATE TRIGGER opportunities_account_counters_insert
+            AFTER INSERT ON opportunities REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION opportunities_account_counters();
+        CREATE TRIGGER opportunities_account_counters_update
+            AFTER UPDATE ON opportunities
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION opportunities_account_counters();
+        CREATE TRIGGER opportunities_account_counters_delete
+            AFTER DELETE ON opportunities REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION opportunities_account_counters();
+
+        CREATE TRIGGER activities_account_counters_insert
+            AFTER INSERT ON activities REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION activities_account_counters();
+        CREATE TRIGGER activities_account_counters_update
+            AFTER UPDATE ON activities
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION activities_account_counters();
+        CREATE TRIGGER activities_account_counters_delete
+            AFTER DELETE ON activities REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION activities_account_counters();
+
+        CREATE TRIGGER stages_account_counters_update
+            AFTER UPDATE ON stages
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION stages_account_counters();
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TRIGGER stages_account_counters_update ON stages;
+        DROP TRIGGER activities_account_counters_delete ON activities;
+        DROP TRIGGER activities_account_counters_update ON activities;
+        DROP TRIGGER activities_account_counters_insert ON activities;
+        DROP TRIGGER opportunities_account_counters_delete ON opportunities;
+        DROP TRIGGER opportunities_account_counters_update ON opportunities;
+        DROP TRIGGER opportunities_account_counters_insert ON opportunities;
+        DROP TRIGGER contacts_account_counters_delete ON contacts;
+        DROP TRIGGER contacts_account_counters_update ON contacts;
+        DROP TRIGGER contacts_account_counters_insert ON contacts;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        LOCK TABLE contacts, opportunities, activities IN SHARE MODE;
+        UPDATE accounts a SET
+            contact_count = (
+                SELECT count(*) FROM contacts c WHERE c.account_id = a.account_id
+            ),
+            open_opportunity_count = o.count,
+            open_pipeline_amount = o.amount,
+            last_activity_date = (
+                SELECT max(t.due_date)
+                FROM opportunities p
+                JOIN activities t ON t.opportunity_id = p.opportunity_id
+                WHERE p.account_id = a.account_id AND t.completed
+            )
+        FROM (
+            SELECT
+                a.account_id,
+                count(o.opportunity_id) AS count,
+                coalesce(sum(o.amount), 0) AS amount
+            FROM accounts a
+            LEFT JOIN opportunities o ON o.account_id = a.account_id
+                AND o.stage_id IN (SELECT stage_id FROM stages WHERE NOT is_closed)
+            GROUP BY a.account_id
+        ) o
+        WHERE o.account_id = a.account_id;
+        """,
+        # "Down" SQL statement
+        """--sql
+        SELECT 1;
+        """,
+    ],
+]
@@ -0,0 +1,31 @@
+# Transactional outbox behind GET /api/changes (see queries.outbox). Every
+# write made through the *Queries classes adds one row per changed record
+# in its own transaction, so a change is in the feed if and only if it
+# committed.
+#
+# seq numbers the changes in the order they were written, but
+# transactions commit in a different order: a change with a lower seq can
+# become visible after one with a higher seq. xid records the writing
+# transaction so that the feed can be read in an order that never goes
+# back: by (xid, seq), up to the oldest transaction still running.
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TABLE change_outbox (
+            seq BIGSERIAL PRIMARY KEY,
+            xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+            table_name VARCHAR(63) NOT NULL,
+            operation VARCHAR(6) NOT NULL
+                CHECK (operation IN ('insert', 'update', 'delete')),
+            key JSONB NOT NULL,
+            changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        CREATE INDEX change_outbox_xid_seq_idx ON change_outbox (xid, seq);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TABLE change_outbox;
+        """,
+    ],
+]
@@ -0,0 +1,241 @@
+# Timestamps and tombstones for GET /api/sync (see queries.sync_queries).
+#
+# Every synced table gets created_at and updated_at. updated_at is set to
+# now(), the start of the writing transaction, by a row trigger whenever
+# an UPDATE actually changes the row, whichever code path it comes from
+# (including the counter triggers of migration 019). Deletes, cascades
+# included, leave one row per deleted record in tombstones, keyed the way
+# the change feed keys them: the primary key value, or an object of the
+# key columns for the association tables. Existing rows are stamped with
+# the time of this migration.
+#
+# The (updated_at, primary key) indexes the sync reads from are built
+# concurrently by migration 022.
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TABLE tombstones (
+            tombstone_id BIGSERIAL PRIMARY KEY,
+            table_name VARCHAR(63) NOT NULL,
+            key JSONB NOT NULL,
+            deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        CREATE INDEX tombstones_table_name_deleted_at_idx
+            ON tombstones (table_name, deleted_at, tombstone_id);
+
+        CREATE FUNCTION set_updated_at() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$;
+
+        -- Arguments: the primary key columns of the table.
+        CREATE FUNCTION record_tombstones() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            EXECUTE format(
+                'INSERT INTO tombstones (table_name, key) SELECT %L, %s FROM old_rows',
+                TG_TABLE_NAME,
+                CASE WHEN TG_NARGS = 1
+                    THEN format('to_jsonb(%I)', TG_ARGV[0])
+                    ELSE format(
+                        'jsonb_build_object(%L, %I, %L, %I)',
+                        TG_ARGV[0], TG_ARGV[0], TG_ARGV[1], TG_ARGV[1]
+                    )
+                END
+            );
+            RETURN NULL;
+        END;
+        $$;
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP FUNCTION record_tombstones();
+        DROP FUNCTION set_updated_at();
+        DROP TABLE tombstones;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        ALTER TABLE countries
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE users
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE accounts
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE contacts
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE stages
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE forecast_categories
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE opportunities
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE opportunity_contacts
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE opportunity_owners
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE activity_types
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE activities
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE activity_users
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE activity_contacts
+            ADD COLUMN created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        """,
+        # "Down" SQL statement
+        """--sql
+        ALTER TABLE countries DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE users DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE accounts DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE contacts DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE stages DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE forecast_categories DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE opportunities DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE opportunity_contacts DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE opportunity_owners DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE activity_types DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE activities DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE activity_users DROP COLUMN created_at, DROP COLUMN updated_at;
+        ALTER TABLE activity_contacts DROP COLUMN created_at, DROP COLUMN updated_at;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TRIGGER countries_updated_at BEFORE UPDATE ON countries
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER users_updated_at BEFORE UPDATE ON users
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER accounts_updated_at BEFORE UPDATE ON accounts
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER contacts_updated_at BEFORE UPDATE ON contacts
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER stages_updated_at BEFORE UPDATE ON stages
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER forecast_categories_updated_at BEFORE UPDATE ON forecast_categories
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER opportunities_updated_at BEFORE UPDATE ON opportunities
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER opportunity_contacts_updated_at BEFORE UPDATE ON opportunity_contacts
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER opportunity_owners_updated_at BEFORE UPDATE ON opportunity_owners
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER activity_types_updated_at BEFORE UPDATE ON activity_types
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER activities_updated_at BEFORE UPDATE ON activities
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER activity_users_updated_at BEFORE UPDATE ON activity_users
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        CREATE TRIGGER activity_contacts_updated_at BEFORE UPDATE ON activity_contacts
+            FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+            EXECUTE FUNCTION set_updated_at();
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TRIGGER countries_updated_at ON countries;
+        DROP TRIGGER users_updated_at ON users;
+        DROP TRIGGER accounts_updated_at ON accounts;
+        DROP TRIGGER contacts_updated_at ON contacts;
+        DROP TRIGGER stages_updated_at ON stages;
+        DROP TRIGGER forecast_categories_updated_at ON forecast_categories;
+        DROP TRIGGER opportunities_updated_at ON opportunities;
+        DROP TRIGGER opportunity_contacts_updated_at ON opportunity_contacts;
+        DROP TRIGGER opportunity_owners_updated_at ON opportunity_owners;
+        DROP TRIGGER activity_types_updated_at ON activity_types;
+        DROP TRIGGER activities_updated_at ON activities;
+        DROP TRIGGER activity_users_updated_at ON activity_users;
+        DROP TRIGGER activity_contacts_updated_at ON activity_contacts;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TRIGGER countries_tombstones AFTER DELETE ON countries
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('country_id');
+        CREATE TRIGGER users_tombstones AFTER DELETE ON users
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('user_id');
+        CREATE TRIGGER accounts_tombstones AFTER DELETE ON accounts
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('account_id');
+        CREATE TRIGGER contacts_tombstones AFTER DELETE ON contacts
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('contact_id');
+        CREATE TRIGGER stages_tombstones AFTER DELETE ON stages
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('stage_id');
+        CREATE TRIGGER forecast_categories_tombstones AFTER DELETE ON forecast_categories
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('forecast_category_id');
+        CREATE TRIGGER opportunities_tombstones AFTER DELETE ON opportunities
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('opportunity_id');
+        CREATE TRIGGER opportunity_contacts_tombstones AFTER DELETE ON opportunity_contacts
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('opportunity_id', 'contact_id');
+        CREATE TRIGGER opportunity_owners_tombstones AFTER DELETE ON opportunity_owners
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('opportunity_id', 'user_id');
+        CREATE TRIGGER activity_types_tombstones AFTER DELETE ON activity_types
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('activity_type_id');
+        CREATE TRIGGER activities_tombstones AFTER DELETE ON activities
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('activity_id');
+        CREATE TRIGGER activity_users_tombstones AFTER DELETE ON activity_users
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('activity_id', 'user_id');
+        CREATE TRIGGER activity_contacts_tombstones AFTER DELETE ON activity_contacts
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones('activity_id', 'contact_id');
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TRIGGER countries_tombstones ON countries;
+        DROP TRIGGER users_tombstones ON users;
+        DROP TRIGGER accounts_tombstones ON accounts;
+        DROP TRIGGER contacts_tombstones ON contacts;
+        DROP TRIGGER stages_tombstones ON stages;
+        DROP TRIGGER forecast_categories_tombstones ON forecast_categories;
+        DROP TRIGGER opportunities_tombstones ON opportunities;
+        DROP TRIGGER opportunity_contacts_tombstones ON opportunity_contacts;
+        DROP TRIGGER opportunity_owners_tombstones ON opportunity_owners;
+        DROP TRIGGER activity_types_tombstones ON activity_types;
+        DROP TRIGGER activities_tombstones ON activities;
+        DROP TRIGGER activity_users_tombstones ON activity_users;
+        DROP TRIGGER activity_contacts_tombstones ON activity_contacts;
+        """,
+    ],
+]
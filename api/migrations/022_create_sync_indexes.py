@@ -0,0 +1,154 @@
+# Indexes for GET /api/sync (see migration 021 and queries.sync_queries):
+# the rows of each table changed in a time window, in (updated_at,
+# primary key) order, so that a sync page is read in order from the index
+# and can stop after LIMIT rows.
+#
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so this
+# migration runs in autocommit mode with one statement per step.
+transactional = False
+
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS countries_updated_at_idx
+            ON countries (updated_at, country_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS countries_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS users_updated_at_idx
+            ON users (updated_at, user_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS users_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_updated_at_idx
+            ON accounts (updated_at, account_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS accounts_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_updated_at_idx
+            ON contacts (updated_at, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS contacts_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS stages_updated_at_idx
+            ON stages (updated_at, stage_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS stages_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS forecast_categories_updated_at_idx
+            ON forecast_categories (updated_at, forecast_category_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS forecast_categories_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunities_updated_at_idx
+            ON opportunities (updated_at, opportunity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunities_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunity_contacts_updated_at_idx
+            ON opportunity_contacts (updated_at, opportunity_id, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunity_contacts_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS opportunity_owners_updated_at_idx
+            ON opportunity_owners (updated_at, opportunity_id, user_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS opportunity_owners_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activity_types_updated_at_idx
+            ON activity_types (updated_at, activity_type_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activity_types_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activities_updated_at_idx
+            ON activities (updated_at, activity_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activities_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activity_users_updated_at_idx
+            ON activity_users (updated_at, activity_id, user_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activity_users_updated_at_idx;
+        """,
+    ],
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS activity_contacts_updated_at_idx
+            ON activity_contacts (updated_at, activity_id, contact_id);
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP INDEX CONCURRENTLY IF EXISTS activity_contacts_updated_at_idx;
+        """,
+    ],
+]
@@ -0,0 +1,40 @@
+# Background jobs run by `python -m jobs` (see queries.job_queries).
+#
+# A worker claims a queued job with FOR UPDATE SKIP LOCKED, so that any
+# number of workers can poll the table without handing out a job twice,
+# and marks it running with a lease (locked_until) in the same short
+# transaction. The job itself runs outside any transaction; the worker
+# renews the lease while it runs, and a job whose lease ran out (its
+# worker died) is queued again. Failed jobs are retried at run_at, with
+# exponential backoff, until max_attempts is reached.
+steps = [
+    [
+        # "Up" SQL statement
+        """--sql
+        CREATE TABLE jobs (
+            job_id BIGSERIAL PRIMARY KEY,
+            kind VARCHAR(50) NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{}',
+            status VARCHAR(10) NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 5 CHECK (max_attempts > 0),
+            run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            locked_until TIMESTAMPTZ,
+            result JSONB,
+            last_error TEXT,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            started_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ
+        );
+        CREATE INDEX jobs_queued_run_at_idx ON jobs (run_at, job_id)
+            WHERE status = 'queued';
+        CREATE INDEX jobs_running_locked_until_idx ON jobs (locked_until)
+            WHERE status = 'running';
+        """,
+        # "Down" SQL statement
+        """--sql
+        DROP TABLE jobs;
+        """,
+    ],
+]
@@ -36,6 +36,10 @@ class MigrationStep(BaseModel):
 
 class MigrationFile(MigrationRecord):
     steps: list[MigrationStep]
+    # Migrations that set `transactional = False` run in autocommit
+    # mode, e.g. for CREATE INDEX CONCURRENTLY. Keep to one statement
+    # per step in those files.
+    transactional: bool = True
 
 
 # Updated import_module logic and added comments for directory adjustments
@@ -54,6 +58,7 @@ async def read_migrations(dir: str) -> list[MigrationFile]:
                     name=str(file.stem),
                     digest=hash.digest(),
                     steps=[MigrationStep(up=s[0], down=s[1]) for s in m.steps],
+                    transactional=getattr(m, "transactional", True),
                 )
             )
     return migrations
@@ -99,7 +104,9 @@ async def up(db_url, to=LATEST, dir=os.path.dirname(__file__)):
             raise RuntimeError(message)
         elif record and migration == record:
             continue
-        async with await AsyncConnection.connect(db_url) as conn:
+        async with await AsyncConnection.connect(
+            db_url, autocommit=not migration.transactional
+        ) as conn:
             async with conn.cursor() as db:
                 for step in migration.steps:
                     await db.execute(step.up)
@@ -124,7 +131,9 @@ async def down(db_url, to=ZERO, dir=os.path.dirname(__file__)):
         if migration != record:
             message = f"Incompatible migration history at {migration.name}"
             raise RuntimeError(message)
-        async with await AsyncConnection.connect(db_url) as conn:
+        async with await AsyncConnection.connect(
+            db_url, autocommit=not migration.transactional
+        ) as conn:
             async with conn.cursor() as db:
                 for step in reversed(migration.steps):
                     await db.execute(step.down)
@@ -24,10 +24,12 @@ into dictionaries.
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
+from datetime import date
 
 
 class AccountBase(BaseModel):
+    parent_account_id: Optional[int] = None
     account_name: str
     website: Optional[str] = None
     type: Optional[str] = None
@@ -62,6 +64,94 @@ class AccountCreate(AccountBase):
 
 class Account(AccountBase):
     account_id: int
+    # Kept up to date by triggers (migration 019); not writable.
+    contact_count: int = 0
+    open_opportunity_count: int = 0
+    open_pipeline_amount: float = 0
+    last_activity_date: Optional[date] = None
+
+    # Returned by GET /api/accounts/ when no fields= is given. Leaves out
+    # the website, description, phone and street address columns.
+    summary_fields: ClassVar[tuple[str, ...]] = (
+        "account_id",
+        "account_name",
+        "type",
+        "billing_city",
+        "billing_state",
+        "billing_country_id",
+        "account_owner_id",
+        "contact_count",
+        "open_opportunity_count",
+        "open_pipeline_amount",
+        "last_activity_date",
+    )
+
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = (
+        "account_id",
+        "parent_account_id",
+        "account_name",
+        "type",
+        "billing_city",
+        "billing_state",
+        "billing_country_id",
+        "shipping_country_id",
+        "account_owner_id",
+        "contact_count",
+        "open_opportunity_count",
+        "open_pipeline_amount",
+        "last_activity_date",
+    )
+    sort_fields: ClassVar[tuple[str, ...]] = (
+        "account_id",
+        "account_name",
+        "type",
+        "billing_city",
+        "billing_state",
+    )
 
     class Config:
         from_attributes = True
+
+
+class AccountUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    account_id: int
+    parent_account_id: Optional[int] = None
+    account_name: Optional[str] = None
+    website: Optional[str] = None
+    type: Optional[str] = None
+    description: Optional[str] = None
+    primary_phone: Optional[str] = None
+    secondary_phone: Optional[str] = None
+    billing_street_1: Optional[str] = None
+    billing_street_2: Optional[str] = None
+    billing_city: Optional[str] = None
+    billing_state: Optional[str] = None
+    billing_zipcode: Optional[str] = None
+    billing_country_id: Optional[int] = None
+    shipping_street_1: Optional[str] = None
+    shipping_street_2: Optional[str] = None
+    shipping_city: Optional[str] = None
+    shipping_state: Optional[str] = None
+    shipping_zipcode: Optional[str] = None
+    shipping_country_id: Optional[int] = None
+    account_owner_id: Optional[int] = None
+
+
+class AccountRollup(BaseModel):
+    """
+    Totals over an account and all its subsidiaries, at any depth (see
+    migration 017). Opportunities in closed stages are not open pipeline.
+    """
+
+    account_id: int
+    account_count: int
+    contact_count: int
+    open_opportunity_count: int
+    open_pipeline_amount: float
@@ -0,0 +1,24 @@
+from models.account import Account
+from models.activity import Activity
+from models.contact import Contact
+from models.opportunity import Opportunity
+from models.user import User
+
+
+class OpportunityDetail(Opportunity):
+    """An opportunity with its owners, contacts and activities."""
+
+    owners: list[User]
+    contacts: list[Contact]
+    activities: list[Activity]
+
+
+class AccountFull(Account):
+    """
+    The account page in one document: the account, its contacts, and its
+    opportunities with everything attached to them. Built by Postgres in
+    a single query (see AccountQueries.get_full).
+    """
+
+    contacts: list[Contact]
+    opportunities: list[OpportunityDetail]
@@ -24,8 +24,10 @@ into dictionaries.
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import date
+from enum import Enum
+from models.page import Page
 
 
 class ActivityBase(BaseModel):
@@ -50,5 +52,69 @@ class ActivityCreate(ActivityBase):
 class Activity(ActivityBase):
     activity_id: int
 
+    # Returned by GET /api/activities/ when no fields= is given. Leaves out
+    # description.
+    summary_fields: ClassVar[tuple[str, ...]] = (
+        "activity_id",
+        "activity_type_id",
+        "opportunity_id",
+        "due_date",
+        "completed",
+    )
+
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = (
+        "activity_id",
+        "activity_type_id",
+        "opportunity_id",
+        "due_date",
+        "completed",
+    )
+    sort_fields: ClassVar[tuple[str, ...]] = (
+        "activity_id",
+        "due_date",
+    )
+
     class Config:
         from_attributes = True
+
+
+class ActivityUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    activity_id: int
+    activity_type_id: Optional[int] = None
+    opportunity_id: Optional[int] = None
+    description: Optional[str] = None
+    due_date: Optional[date] = None
+    completed: Optional[bool] = None
+
+
+class ActivityStatus(str, Enum):
+    """
+    overdue and upcoming are the open activities due before and from
+    today; activities without a due date are in neither.
+    """
+
+    overdue = "overdue"
+    upcoming = "upcoming"
+    completed = "completed"
+
+
+class ActivityCounts(BaseModel):
+    overdue: int
+    upcoming: int
+    completed: int
+
+
+class ActivityQueue(Page[Activity]):
+    """
+    One page of a user's activities with one status, and the number of
+    the user's activities with each status.
+    """
+
+    counts: ActivityCounts
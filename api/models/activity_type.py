@@ -48,3 +48,14 @@ class ActivityType(ActivityTypeBase):
 
     class Config:
         from_attributes = True
+
+
+class ActivityTypeUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    activity_type_id: int
+    type_name: Optional[str] = None
+    description: Optional[str] = None
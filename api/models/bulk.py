@@ -0,0 +1,35 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+# The most items a bulk request (or a delete job) may carry.
+MAX_BULK_SIZE = 10000
+
+
+class BulkMode(str, Enum):
+    """
+    all_or_nothing applies every item in one transaction and fails the
+    whole request on the first error. best_effort applies what it can
+    and reports the failed items by their index in the request body.
+    """
+
+    all_or_nothing = "all_or_nothing"
+    best_effort = "best_effort"
+
+
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel, Generic[T]):
+    items: List[T]
+    errors: List[BulkError] = []
+
+
+class BulkDeleteResult(BaseModel, Generic[T]):
+    deleted: List[T]
+    missing: List[T] = []
+    errors: List[BulkError] = []
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """
+    row numbers are 1-based and count data records only (the CSV
+    header line is not a row). Rows listed in errors were not imported.
+    """
+
+    received: int
+    imported: int
+    errors: List[ImportRowError]
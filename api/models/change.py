@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Literal, Union
+from datetime import datetime
+
+
+class Change(BaseModel):
+    """
+    One row written through the API. key is the primary key value, or
+    for the association tables an object of the key columns.
+    """
+
+    seq: int
+    table: str
+    operation: Literal["insert", "update", "delete"]
+    key: Union[int, dict]
+    changed_at: datetime
+
+
+class ChangeFeed(BaseModel):
+    """
+    The changes after the one given as ?after=, in the order they can be
+    consumed. Pass next_after back as ?after= to read on; it is the seq
+    of the last change here, or after itself when there are none yet.
+    """
+
+    items: list[Change]
+    next_after: int
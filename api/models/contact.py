@@ -24,7 +24,7 @@ into dictionaries.
 """
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import ClassVar, Optional
 
 
 class ContactBase(BaseModel):
@@ -58,5 +58,61 @@ class ContactCreate(ContactBase):
 class Contact(ContactBase):
     contact_id: int
 
+    # Returned by GET /api/contacts/ when no fields= is given. Leaves out
+    # the secondary phone and site address columns.
+    summary_fields: ClassVar[tuple[str, ...]] = (
+        "contact_id",
+        "account_id",
+        "first_name",
+        "last_name",
+        "title",
+        "email",
+        "primary_phone",
+    )
+
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = (
+        "contact_id",
+        "account_id",
+        "first_name",
+        "last_name",
+        "title",
+        "email",
+        "site_city",
+        "site_state",
+        "site_country_id",
+    )
+    sort_fields: ClassVar[tuple[str, ...]] = (
+        "contact_id",
+        "first_name",
+        "last_name",
+        "title",
+        "email",
+    )
+
     class Config:
         from_attributes = True
+
+
+class ContactUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    contact_id: int
+    account_id: Optional[int] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    title: Optional[str] = None
+    email: Optional[EmailStr] = None
+    primary_phone: Optional[str] = None
+    secondary_phone: Optional[str] = None
+    site_name: Optional[str] = None
+    site_street_1: Optional[str] = None
+    site_street_2: Optional[str] = None
+    site_city: Optional[str] = None
+    site_state: Optional[str] = None
+    site_zipcode: Optional[str] = None
+    site_country_id: Optional[int] = None
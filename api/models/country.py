@@ -24,6 +24,7 @@ into dictionaries.
 """
 
 from pydantic import BaseModel
+from typing import Optional
 
 
 class CountryBase(BaseModel):
@@ -47,3 +48,14 @@ class Country(CountryBase):
 
     class Config:
         from_attributes = True
+
+
+class CountryUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    country_id: int
+    country_name: Optional[str] = None
+    country_code: Optional[str] = None
@@ -48,3 +48,14 @@ class ForecastCategory(ForecastCategoryBase):
 
     class Config:
         from_attributes = True
+
+
+class ForecastCategoryUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    forecast_category_id: int
+    category_name: Optional[str] = None
+    description: Optional[str] = None
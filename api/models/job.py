@@ -0,0 +1,83 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, Union
+from datetime import datetime
+from enum import Enum
+from models.bulk import MAX_BULK_SIZE
+from utils.imports import ImportFormat
+
+
+class JobKind(str, Enum):
+    import_rows = "import"
+    delete = "delete"
+    refresh_pipeline = "refresh_pipeline"
+    repair_account_counters = "repair_account_counters"
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class ImportJob(BaseModel):
+    """content is the file, as POST /api/{table}/import would take it."""
+
+    table: Literal["accounts", "contacts", "opportunities"]
+    format: ImportFormat = ImportFormat.csv
+    content: str
+    all_or_nothing: bool = False
+
+
+class DeleteJob(BaseModel):
+    """
+    Deletes the rows with every row that depends on them, subsidiary
+    accounts included (see queries.cascade), in one transaction.
+    """
+
+    table: Literal["accounts", "contacts", "opportunities", "activities"]
+    keys: list[int] = Field(max_length=MAX_BULK_SIZE)
+
+
+class RepairJob(BaseModel):
+    batch_size: Optional[int] = Field(None, gt=0)
+
+
+class EmptyJob(BaseModel):
+    pass
+
+
+# The payload each kind of job takes, checked when it is queued.
+JOB_PAYLOADS: dict[JobKind, type[BaseModel]] = {
+    JobKind.import_rows: ImportJob,
+    JobKind.delete: DeleteJob,
+    JobKind.refresh_pipeline: EmptyJob,
+    JobKind.repair_account_counters: RepairJob,
+}
+
+
+class JobCreate(BaseModel):
+    kind: JobKind
+    payload: dict = {}
+    max_attempts: int = Field(5, ge=1, le=20)
+
+
+class Job(BaseModel):
+    """
+    Poll GET /api/jobs/{job_id} until status is succeeded or failed.
+    result is what the job returned (an ImportReport for imports);
+    last_error is the error of the latest failed attempt, and run_at the
+    time of the next one while the job is queued for a retry.
+    """
+
+    job_id: int
+    kind: JobKind
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Union[dict, list, None] = None
+    last_error: Optional[str] = None
@@ -24,7 +24,7 @@ into dictionaries.
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import date
 
 
@@ -52,5 +52,50 @@ class OpportunityCreate(OpportunityBase):
 class Opportunity(OpportunityBase):
     opportunity_id: int
 
+    # Returned by GET /api/opportunities/ when no fields= is given. Leaves
+    # out description.
+    summary_fields: ClassVar[tuple[str, ...]] = (
+        "opportunity_id",
+        "account_id",
+        "opportunity_name",
+        "stage_id",
+        "forecast_category_id",
+        "amount",
+        "close_date",
+    )
+
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = (
+        "opportunity_id",
+        "account_id",
+        "opportunity_name",
+        "stage_id",
+        "forecast_category_id",
+        "amount",
+        "close_date",
+    )
+    sort_fields: ClassVar[tuple[str, ...]] = (
+        "opportunity_id",
+        "opportunity_name",
+        "amount",
+        "close_date",
+    )
+
     class Config:
         from_attributes = True
+
+
+class OpportunityUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    opportunity_id: int
+    opportunity_name: Optional[str] = None
+    stage_id: Optional[int] = None
+    forecast_category_id: Optional[int] = None
+    amount: Optional[float] = None
+    close_date: Optional[date] = None
+    description: Optional[str] = None
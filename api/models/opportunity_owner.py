@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from pydantic import BaseModel
 
 
@@ -5,5 +7,10 @@ class OpportunityOwner(BaseModel):
     opportunity_id: int
     user_id: int
 
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = ("opportunity_id", "user_id")
+    sort_fields: ClassVar[tuple[str, ...]] = ("opportunity_id", "user_id")
+
     class Config:
         from_attributes = True
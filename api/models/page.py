@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    One page of a list endpoint. next_cursor is None on the last
+    page; otherwise pass it back as ?cursor= to fetch the next one.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+
+class PipelineTotal(BaseModel):
+    """
+    Totals over the opportunities of one stage and forecast category
+    that close in one month (close_month is its first day, or None for
+    opportunities without a close date).
+    """
+
+    stage_id: int
+    stage_name: str
+    forecast_category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    close_month: Optional[date] = None
+    opportunity_count: int
+    total_amount: float
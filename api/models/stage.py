@@ -30,6 +30,8 @@ from typing import Optional
 class StageBase(BaseModel):
     stage_name: str
     description: Optional[str] = None
+    # Won and lost stages; their opportunities are not open pipeline.
+    is_closed: bool = False
 
 
 class StageCreate(StageBase):
@@ -48,3 +50,15 @@ class Stage(StageBase):
 
     class Config:
         from_attributes = True
+
+
+class StageUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    stage_id: int
+    stage_name: Optional[str] = None
+    description: Optional[str] = None
+    is_closed: Optional[bool] = None
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Union
+from datetime import datetime
+
+
+class SyncUpsert(BaseModel):
+    """A row created or changed in the window, with its updated_at."""
+
+    table: str
+    row: dict
+
+
+class SyncDelete(BaseModel):
+    table: str
+    key: Union[int, dict]
+    deleted_at: datetime
+
+
+class SyncPage(BaseModel):
+    """
+    One page of GET /api/sync. Apply its deletes before its upserts, then
+    pass next_token back as ?since=: while has_more it continues this
+    sync, afterwards it picks up the changes made since.
+    """
+
+    upserts: list[SyncUpsert]
+    deletes: list[SyncDelete]
+    next_token: str
+    has_more: bool
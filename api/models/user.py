@@ -24,7 +24,7 @@ into dictionaries.
 """
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import ClassVar, Optional
 
 
 class UserBase(BaseModel):
@@ -41,5 +41,35 @@ class UserCreate(UserBase):
 class User(UserBase):
     user_id: int
 
+    # Columns accepted by filter= and sort= on the list route (see
+    # utils.filters).
+    filter_fields: ClassVar[tuple[str, ...]] = (
+        "user_id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+    )
+    sort_fields: ClassVar[tuple[str, ...]] = (
+        "user_id",
+        "username",
+        "first_name",
+        "last_name",
+    )
+
     class Config:
         from_attributes = True
+
+
+class UserUpdate(BaseModel):
+    """
+    Used by PATCH /bulk. The primary key selects the row and only the
+    fields present in the request body are updated.
+    """
+
+    user_id: int
+    username: Optional[str] = None
+    email: Optional[EmailStr] = None
+    hashed_password: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from models.account import Account
+from models.activity import Activity
+from models.opportunity import Opportunity
+from models.user import User
+
+
+class DashboardCounts(BaseModel):
+    accounts: int
+    open_opportunities: int
+    open_pipeline_amount: float
+    overdue: int
+    upcoming: int
+    completed: int
+
+
+class UserDashboard(BaseModel):
+    """
+    A user's home screen: the user, counts over everything they own or
+    are assigned, and the first few of their open opportunities (by close
+    date), open activities (by due date) and accounts (by name). The
+    lists carry the summary fields of their list routes.
+    """
+
+    user: User
+    counts: DashboardCounts
+    opportunities: list[Opportunity]
+    activities: list[Activity]
+    accounts: list[Account]
@@ -0,0 +1,113 @@
+import psycopg
+from queries.pool import pool
+
+# Repair job for the account counters of migration 019. The triggers keep
+# them exact; this recomputes them from scratch, a batch of accounts at a
+# time, and rewrites only the accounts whose counters were off. Each
+# batch is its own short transaction: it first locks the accounts of the
+# batch, so that no trigger changes them under it, and only then counts,
+# so that the count sees every write that committed before the lock.
+#
+#   python -m queries.account_counters [--batch-size N]
+
+REPAIR_BATCH_SIZE = 1000
+
+LOCK_BATCH = """--sql
+    SELECT account_id FROM accounts
+    WHERE account_id > %s
+    ORDER BY account_id
+    LIMIT %s
+    FOR UPDATE;
+    """
+
+REPAIR = """--sql
+    UPDATE accounts a SET
+        contact_count = e.contact_count,
+        open_opportunity_count = e.open_opportunity_count,
+        open_pipeline_amount = e.open_pipeline_amount,
+        last_activity_date = e.last_activity_date
+    FROM (
+        SELECT
+            a.account_id,
+            (
+                SELECT count(*) FROM contacts c WHERE c.account_id = a.account_id
+            ) AS contact_count,
+            o.open_opportunity_count,
+            o.open_pipeline_amount,
+            (
+                SELECT max(t.due_date)
+                FROM opportunities p
+                JOIN activities t ON t.opportunity_id = p.opportunity_id
+                WHERE p.account_id = a.account_id AND t.completed
+            ) AS last_activity_date
+        FROM accounts a
+        CROSS JOIN LATERAL (
+            SELECT
+                count(*) AS open_opportunity_count,
+                coalesce(sum(p.amount), 0) AS open_pipeline_amount
+            FROM opportunities p
+            JOIN stages s ON s.stage_id = p.stage_id
+            WHERE p.account_id = a.account_id AND NOT s.is_closed
+        ) o
+        WHERE a.account_id = ANY(%s)
+    ) e
+    WHERE a.account_id = e.account_id
+        AND (
+            a.contact_count,
+            a.open_opportunity_count,
+            a.open_pipeline_amount,
+            a.last_activity_date
+        ) IS DISTINCT FROM (
+            e.contact_count,
+            e.open_opportunity_count,
+            e.open_pipeline_amount,
+            e.last_activity_date
+        );
+    """
+
+
+async def repair_account_counters(batch_size: int = REPAIR_BATCH_SIZE) -> int:
+    """Recomputes every account's counters; returns how many were off."""
+    after = 0
+    repaired = 0
+    while True:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(LOCK_BATCH, (after, batch_size))
+                batch = [account_id for account_id, in await cur.fetchall()]
+                if not batch:
+                    return repaired
+                await cur.execute(REPAIR, (batch,))
+                repaired += cur.rowcount
+        after = batch[-1]
+
+
+def run():
+    import argparse
+    import asyncio
+
+    from queries.pool import close_pool, open_pool
+
+    parser = argparse.ArgumentParser(
+        prog="python -m queries.account_counters",
+        description="Recompute the denormalized counters on accounts.",
+    )
+    parser.add_argument("--batch-size", type=int, default=REPAIR_BATCH_SIZE)
+    args = parser.parse_args()
+
+    async def repair():
+        await open_pool()
+        try:
+            repaired = await repair_account_counters(args.batch_size)
+        except psycopg.Error as e:
+            print(f"Error repairing account counters: {e}")
+            raise SystemExit(1)
+        finally:
+            await close_pool()
+        print(f"Repaired the counters of {repaired} accounts.")
+
+    asyncio.run(repair())
+
+
+if __name__ == "__main__":
+    run()
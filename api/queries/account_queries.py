@@ -1,255 +1,174 @@
-import os
 import psycopg
-from typing import Optional, List
+from psycopg import sql
 from psycopg.rows import class_row
-from psycopg_pool import ConnectionPool
-from models.account import Account, AccountCreate
+from typing import Optional
+from models.account import Account, AccountCreate, AccountRollup
+from models.activity import Activity
+from models.contact import Contact
+from models.opportunity import Opportunity
+from models.user import User
+from queries.pool import pool
+from queries.relations import BelongsTo, HasMany
+from queries.repository import Repository
+from queries.statements import json_list, json_object
+from utils.pagination import DEFAULT_PAGE_SIZE
 from utils.exceptions import (
     AccountDatabaseError,
     AccountDoesNotExist,
     AccountCreationError,
-    DatabaseURLException,
 )
 
-# Initialize Connection Pool
-database_url = os.environ.get("DATABASE_URL")
-if database_url is None:
-    raise DatabaseURLException(
-        "You forgot to define DATABASE_URL in your environment.",
+
+def _contacts(source: str) -> sql.Composed:
+    """The contacts c of source as a JSON array."""
+    return json_list(
+        json_object("c", list(Contact.model_fields)),
+        sql.SQL(source),
+        sql.SQL("c.contact_id"),
     )
 
-pool = ConnectionPool(database_url)
 
+# The document of GET /api/accounts/{account_id}/full (models.account_full),
+# built and serialized by Postgres.
+FULL_ACCOUNT = sql.SQL(
+    """--sql
+    SELECT {account}::text
+    FROM accounts a
+    WHERE a.account_id = %s;
+    """
+).format(
+    account=json_object(
+        "a",
+        list(Account.model_fields),
+        contacts=_contacts("contacts c WHERE c.account_id = a.account_id"),
+        opportunities=json_list(
+            json_object(
+                "o",
+                list(Opportunity.model_fields),
+                owners=json_list(
+                    json_object("u", list(User.model_fields)),
+                    sql.SQL(
+                        "opportunity_owners oo JOIN users u USING (user_id) "
+                        "WHERE oo.opportunity_id = o.opportunity_id"
+                    ),
+                    sql.SQL("u.user_id"),
+                ),
+                contacts=_contacts(
+                    "opportunity_contacts oc JOIN contacts c USING (contact_id) "
+                    "WHERE oc.opportunity_id = o.opportunity_id"
+                ),
+                activities=json_list(
+                    json_object("t", list(Activity.model_fields)),
+                    sql.SQL("activities t WHERE t.opportunity_id = o.opportunity_id"),
+                    sql.SQL("t.activity_id"),
+                ),
+            ),
+            sql.SQL("opportunities o WHERE o.account_id = a.account_id"),
+            sql.SQL("o.opportunity_id"),
+        ),
+    )
+)
 
-class AccountQueries:
-    def get_all_accounts(self) -> List[Account]:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(Account)) as cur:
-                    cur.execute(
-                        """--sql
-                        SELECT * FROM accounts;
-                        """
-                    )
-                    accounts = cur.fetchall()
-                    return accounts
-        except psycopg.Error as e:
-            print(f"Error retrieving all accounts: {e}")
-            raise AccountDatabaseError("Error retrieving all accounts")
 
-    def get_account(self, account_id: int) -> Account:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(Account)) as cur:
-                    cur.execute(
-                        """--sql
-                        SELECT * FROM accounts
-                        WHERE account_id = %s;
-                        """,
-                        (account_id,),
-                    )
-                    account = cur.fetchone()
-                    if account is None:
-                        raise AccountDoesNotExist(
-                            f"No account with id {account_id}.",
-                        )
-                    return account
-        except psycopg.Error as e:
-            print(f"Error retrieving account with id {account_id}: {e}")
-            raise AccountDatabaseError(
-                f"Error retrieving account with id {account_id}",
-            )
+# The accounts under an account at any depth, itself included, read from
+# the closure table of migration 017.
+SUBTREE = sql.SQL(
+    "account_id IN (SELECT descendant_id FROM account_closure WHERE ancestor_id = %s)"
+)
 
-    def create_account(self, account: AccountCreate) -> Account:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(Account)) as cur:
-                    cur.execute(
-                        """--sql
-                        INSERT INTO accounts (
-                            account_name,
-                            website,
-                            type,
-                            description,
-                            primary_phone,
-                            secondary_phone,
-                            billing_street_1,
-                            billing_street_2,
-                            billing_city,
-                            billing_state,
-                            billing_zipcode,
-                            billing_country_id,
-                            shipping_street_1,
-                            shipping_street_2,
-                            shipping_city,
-                            shipping_state,
-                            shipping_zipcode,
-                            shipping_country_id,
-                            account_owner_id
-                        )
-                        VALUES (
-                            %(account_name)s,
-                            %(website)s,
-                            %(type)s,
-                            %(description)s,
-                            %(primary_phone)s,
-                            %(secondary_phone)s,
-                            %(billing_street_1)s,
-                            %(billing_street_2)s,
-                            %(billing_city)s,
-                            %(billing_state)s,
-                            %(billing_zipcode)s,
-                            %(billing_country_id)s,
-                            %(shipping_street_1)s,
-                            %(shipping_street_2)s,
-                            %(shipping_city)s,
-                            %(shipping_state)s,
-                            %(shipping_zipcode)s,
-                            %(shipping_country_id)s,
-                            %(account_owner_id)s
-                        )
-                        RETURNING *;
-                        """,
-                        account.dict(),
-                    )
-                    new_account = cur.fetchone()
-                    if new_account is None:
-                        raise AccountCreationError("Error creating account")
-                    return new_account
+# Sums the counters of migration 019 over the subtree.
+ROLLUP = """--sql
+    SELECT
+        %(account_id)s AS account_id,
+        count(*) AS account_count,
+        coalesce(sum(a.contact_count), 0) AS contact_count,
+        coalesce(sum(a.open_opportunity_count), 0) AS open_opportunity_count,
+        coalesce(sum(a.open_pipeline_amount), 0) AS open_pipeline_amount
+    FROM account_closure c
+    JOIN accounts a ON a.account_id = c.descendant_id
+    WHERE c.ancestor_id = %(account_id)s;
+    """
 
-        except psycopg.Error as e:
-            print(f"Error creating account: {e}")
-            raise AccountDatabaseError("Error creating account")
 
-    def delete_account(self, account_id: int) -> bool:
+class AccountQueries(Repository):
+    table = "accounts"
+    pk = ("account_id",)
+    name = "account"
+    model = Account
+    create_model = AccountCreate
+    database_error = AccountDatabaseError
+    does_not_exist = AccountDoesNotExist
+    creation_error = AccountCreationError
+    relations = {
+        "parent": BelongsTo("parent_account_id", "accounts"),
+        "subsidiaries": HasMany("accounts", "parent_account_id"),
+        "owner": BelongsTo("account_owner_id", "users"),
+        "billing_country": BelongsTo("billing_country_id", "countries"),
+        "shipping_country": BelongsTo("shipping_country_id", "countries"),
+        "contacts": HasMany("contacts", "account_id"),
+        "opportunities": HasMany("opportunities", "account_id"),
+    }
+
+    async def get_full(self, account_id: int) -> bytes:
+        """
+        The account with its contacts and opportunities, and each
+        opportunity's owners, contacts and activities, as JSON ready to
+        send. One query and one pool checkout, however many rows it
+        spans.
+        """
         try:
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """--sql
-                        DELETE FROM accounts
-                        WHERE account_id = %s;
-                        """,
-                        (account_id,),
-                    )
-                    return cur.rowcount > 0
+            async with pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(FULL_ACCOUNT, (account_id,))
+                    row = await cur.fetchone()
         except psycopg.Error as e:
-            print(f"Error deleting account with id {account_id}: {e}")
+            print(f"Error retrieving account with id {account_id}: {e}")
             raise AccountDatabaseError(
-                f"Error deleting account with id {account_id}",
+                f"Error retrieving account with id {account_id}",
             )
+        if row is None:
+            raise AccountDoesNotExist(f"No account with id {account_id}.")
+        return row[0].encode()
 
-    def edit_account(
+    async def get_subtree(
         self,
         account_id: int,
-        account_name: Optional[str] = None,
-        website: Optional[str] = None,
-        type: Optional[str] = None,
-        description: Optional[str] = None,
-        primary_phone: Optional[str] = None,
-        secondary_phone: Optional[str] = None,
-        billing_street_1: Optional[str] = None,
-        billing_street_2: Optional[str] = None,
-        billing_city: Optional[str] = None,
-        billing_state: Optional[str] = None,
-        billing_zipcode: Optional[str] = None,
-        billing_country_id: Optional[int] = None,
-        shipping_street_1: Optional[str] = None,
-        shipping_street_2: Optional[str] = None,
-        shipping_city: Optional[str] = None,
-        shipping_state: Optional[str] = None,
-        shipping_zipcode: Optional[str] = None,
-        shipping_country_id: Optional[int] = None,
-        account_owner_id: Optional[int] = None,
-    ) -> Account:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(Account)) as cur:
-                    update_fields = []
-                    update_values = []
-
-                    if account_name:
-                        update_fields.append("account_name = %s")
-                        update_values.append(account_name)
-                    if website:
-                        update_fields.append("website = %s")
-                        update_values.append(website)
-                    if type:
-                        update_fields.append("type = %s")
-                        update_values.append(type)
-                    if description:
-                        update_fields.append("description = %s")
-                        update_values.append(description)
-                    if primary_phone:
-                        update_fields.append("primary_phone = %s")
-                        update_values.append(primary_phone)
-                    if secondary_phone:
-                        update_fields.append("secondary_phone = %s")
-                        update_values.append(secondary_phone)
-                    if billing_street_1:
-                        update_fields.append("billing_street_1 = %s")
-                        update_values.append(billing_street_1)
-                    if billing_street_2:
-                        update_fields.append("billing_street_2 = %s")
-                        update_values.append(billing_street_2)
-                    if billing_city:
-                        update_fields.append("billing_city = %s")
-                        update_values.append(billing_city)
-                    if billing_state:
-                        update_fields.append("billing_state = %s")
-                        update_values.append(billing_state)
-                    if billing_zipcode:
-                        update_fields.append("billing_zipcode = %s")
-                        update_values.append(billing_zipcode)
-                    if billing_country_id:
-                        update_fields.append("billing_country_id = %s")
-                        update_values.append(billing_country_id)
-                    if shipping_street_1:
-                        update_fields.append("shipping_street_1 = %s")
-                        update_values.append(shipping_street_1)
-                    if shipping_street_2:
-                        update_fields.append("shipping_street_2 = %s")
-                        update_values.append(shipping_street_2)
-                    if shipping_city:
-                        update_fields.append("shipping_city = %s")
-                        update_values.append(shipping_city)
-                    if shipping_state:
-                        update_fields.append("shipping_state = %s")
-                        update_values.append(shipping_state)
-                    if shipping_zipcode:
-                        update_fields.append("shipping_zipcode = %s")
-                        update_values.append(shipping_zipcode)
-                    if shipping_country_id:
-                        update_fields.append("shipping_country_id = %s")
-                        update_values.append(shipping_country_id)
-                    if account_owner_id:
-                        update_fields.append("account_owner_id = %s")
-                        update_values.append(account_owner_id)
-
-                    if not update_fields:
-                        raise ValueError("No fields provided for update.")
-
-                    update_values.append(account_id)
-                    sql = f"""--sql
-                        UPDATE accounts
-                        SET {', '.join(update_fields)}
-                        WHERE account_id = %s
-                        RETURNING *;
-                    """
-                    cur.execute(sql, update_values)
-
-                    updated_account = cur.fetchone()
-                    if not updated_account:
-                        raise AccountDoesNotExist(
-                            f"Account with id {account_id} does not exist."
-                        )
-                    return updated_account
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        filter: Optional[str] = None,
+        sort: Optional[str] = None,
+        include: Optional[str] = None,
+    ) -> dict:
+        """
+        A page of the account and its subsidiaries at any depth, as
+        get_all() returns it.
+        """
+        page = await self.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            include=include,
+            within=(SUBTREE, [account_id]),
+        )
+        if not page["items"]:
+            # Raises AccountDoesNotExist unless the filter left nothing.
+            await self.get(account_id, fields="account_id")
+        return page
 
+    async def get_rollup(self, account_id: int) -> AccountRollup:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(AccountRollup)) as cur:
+                    await cur.execute(ROLLUP, {"account_id": account_id})
+                    rollup = await cur.fetchone()
         except psycopg.Error as e:
-            print(e)
+            print(f"Error rolling up account with id {account_id}: {e}")
             raise AccountDatabaseError(
-                f"Could not update account {account_id}",
+                f"Error rolling up account with id {account_id}",
             )
-        except ValueError as e:
-            print(e)
-            raise AccountDatabaseError("No fields provided for update.")
+        if rollup.account_count == 0:
+            raise AccountDoesNotExist(f"No account with id {account_id}.")
+        return rollup
@@ -0,0 +1,241 @@
+import psycopg
+from typing import Sequence, Union
+from psycopg import sql
+from psycopg.rows import class_row
+from pydantic import BaseModel
+from models.bulk import (
+    MAX_BULK_SIZE,
+    BulkDeleteResult,
+    BulkError,
+    BulkMode,
+    BulkResult,
+)
+from queries import outbox, statements
+from queries.invalidation import publish
+from queries.pool import pool
+from utils.exceptions import BulkOperationError
+
+# Shared implementation of the POST/PATCH/DELETE /bulk endpoints.
+# queries.repository wraps these with each table's model and error types.
+
+# Errors caused by the submitted data rather than by the database. In
+# best_effort mode they are reported per item instead of failing the call.
+ITEM_ERRORS = (psycopg.IntegrityError, psycopg.DataError)
+
+Key = Union[int, dict]
+
+
+def _error_detail(e: psycopg.Error) -> str:
+    return e.diag.message_primary or str(e)
+
+
+def _check_size(items: Sequence) -> None:
+    if len(items) > MAX_BULK_SIZE:
+        raise BulkOperationError(
+            f"At most {MAX_BULK_SIZE} items can be sent in one bulk request."
+        )
+
+
+def _key(pk: Sequence[str], row: BaseModel) -> Key:
+    if len(pk) == 1:
+        return getattr(row, pk[0])
+    return {column: getattr(row, column) for column in pk}
+
+
+async def _execute_many(cur, query: sql.Composable, params_seq: list) -> list:
+    """
+    Runs query once per parameter set in a single pipelined batch and
+    returns the first row each execution returned (None if it returned
+    no row), in parameter order.
+    """
+    await cur.executemany(query, params_seq, returning=True)
+    rows = []
+    while True:
+        rows.append(await cur.fetchone())
+        if not cur.nextset():
+            break
+    return rows
+
+
+async def _apply(
+    conn, cur, query: sql.Composable, params_seq: list, mode: BulkMode
+) -> tuple[list, list[BulkError]]:
+    """
+    Must be called inside a transaction. Tries the whole batch at once;
+    in best_effort mode a failed batch is retried item by item, each in
+    its own savepoint, so that one bad item does not sink the others.
+    """
+    if mode == BulkMode.all_or_nothing:
+        try:
+            return await _execute_many(cur, query, params_seq), []
+        except ITEM_ERRORS as e:
+            raise BulkOperationError(_error_detail(e))
+
+    try:
+        async with conn.transaction():
+            return await _execute_many(cur, query, params_seq), []
+    except ITEM_ERRORS:
+        pass
+
+    rows, errors = [], []
+    for index, params in enumerate(params_seq):
+        try:
+            async with conn.transaction():
+                await cur.execute(query, params)
+                rows.append(await cur.fetchone())
+        except ITEM_ERRORS as e:
+            rows.append(None)
+            errors.append(BulkError(index=index, detail=_error_detail(e)))
+    return rows, errors
+
+
+async def bulk_insert(
+    table: str,
+    model: type[BaseModel],
+    pk: Sequence[str],
+    columns: Sequence[str],
+    records: list[dict],
+    mode: BulkMode,
+) -> BulkResult:
+    _check_size(records)
+    if not records:
+        return BulkResult(items=[])
+    query = statements.insert(table, tuple(columns))
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor(row_factory=class_row(model)) as cur:
+                rows, errors = await _apply(conn, cur, query, records, mode)
+            # New rows are not in any keyed cache; only whole-table views
+            # (lists, lookups) need to see them.
+            if len(errors) < len(records):
+                await publish(conn, table)
+                await outbox.record(
+                    conn,
+                    table,
+                    "insert",
+                    [_key(pk, row) for row in rows if row is not None],
+                )
+    return BulkResult(items=[row for row in rows if row is not None], errors=errors)
+
+
+async def bulk_update(
+    table: str,
+    model: type[BaseModel],
+    pk: str,
+    records: list[dict],
+    mode: BulkMode,
+) -> BulkResult:
+    """
+    Each record holds the primary key plus only the columns to change.
+    Records changing the same set of columns share one UPDATE statement
+    (see queries.statements) and are sent to the server as one
+    executemany batch.
+    """
+    _check_size(records)
+    groups: dict[tuple[str, ...], list[int]] = {}
+    errors = []
+    for index, record in enumerate(records):
+        columns = tuple(sorted(column for column in record if column != pk))
+        if not columns:
+            errors.append(
+                BulkError(index=index, detail="No fields provided for update.")
+            )
+            continue
+        groups.setdefault(columns, []).append(index)
+    if errors and mode == BulkMode.all_or_nothing:
+        raise BulkOperationError(f"Item {errors[0].index}: {errors[0].detail}")
+
+    results = [None] * len(records)
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor(row_factory=class_row(model)) as cur:
+                for columns, indices in groups.items():
+                    query = statements.update(table, (pk,), columns)
+                    rows, group_errors = await _apply(
+                        conn, cur, query, [records[i] for i in indices], mode
+                    )
+                    for index, row in zip(indices, rows):
+                        results[index] = row
+                    errors.extend(
+                        BulkError(index=indices[e.index], detail=e.detail)
+                        for e in group_errors
+                    )
+
+                failed = {e.index for e in errors}
+                for index, row in enumerate(results):
+                    if row is None and index not in failed:
+                        detail = f"No row with {pk} {records[index][pk]}."
+                        if mode == BulkMode.all_or_nothing:
+                            raise BulkOperationError(f"Item {index}: {detail}")
+                        errors.append(BulkError(index=index, detail=detail))
+
+            changed = [getattr(row, pk) for row in results if row is not None]
+            if changed:
+                await publish(conn, table, changed)
+                await outbox.record(conn, table, "update", changed)
+
+    errors.sort(key=lambda e: e.index)
+    return BulkResult(items=[row for row in results if row is not None], errors=errors)
+
+
+async def bulk_delete(
+    table: str,
+    pk: Sequence[str],
+    keys: list[Key],
+    mode: BulkMode,
+) -> BulkDeleteResult:
+    """
+    keys are primary key values for single-column keys, or dicts of the
+    key columns for the association tables. Deletes all keys with one
+    statement (see statements.key_in).
+    """
+    _check_size(keys)
+    if not keys:
+        return BulkDeleteResult(deleted=[])
+    composite = len(pk) > 1
+    key_tuples = [tuple(key[c] for c in pk) if composite else (key,) for key in keys]
+    query = sql.SQL("DELETE FROM {table} WHERE {match} RETURNING {columns}").format(
+        table=sql.Identifier(table),
+        match=statements.key_in(pk),
+        columns=sql.SQL(", ").join(map(sql.Identifier, pk)),
+    )
+
+    def params(batch: list[tuple]) -> list[list]:
+        return statements.key_params(pk, batch)
+
+    def unwrap(values: tuple) -> Key:
+        return dict(zip(pk, values)) if composite else values[0]
+
+    deleted, errors = [], []
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor() as cur:
+                try:
+                    async with conn.transaction():
+                        await cur.execute(query, params(key_tuples))
+                        deleted = await cur.fetchall()
+                except ITEM_ERRORS as e:
+                    if mode == BulkMode.all_or_nothing:
+                        raise BulkOperationError(_error_detail(e))
+                    for index, key in enumerate(key_tuples):
+                        try:
+                            async with conn.transaction():
+                                await cur.execute(query, params([key]))
+                                deleted.extend(await cur.fetchall())
+                        except ITEM_ERRORS as e:
+                            errors.append(
+                                BulkError(index=index, detail=_error_detail(e))
+                            )
+            if deleted:
+                await publish(conn, table, [unwrap(values) for values in deleted])
+                await outbox.record(
+                    conn, table, "delete", [unwrap(values) for values in deleted]
+                )
+
+    done = set(deleted) | {key_tuples[e.index] for e in errors}
+
+    return BulkDeleteResult(
+        deleted=[unwrap(values) for values in deleted],
+        missing=[unwrap(values) for values in key_tuples if values not in done],
+        errors=errors,
+    )
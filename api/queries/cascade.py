@@ -0,0 +1,126 @@
+from psycopg import sql
+from queries import outbox
+from queries.invalidation import publish
+from queries.pool import pool
+from queries.report_queries import schedule_pipeline_refresh
+
+# Deletes with everything that depends on the deleted rows, for delete
+# jobs (see jobs.handlers). The foreign keys of the schema do not
+# cascade, so the dependent rows are deleted here, in one transaction:
+#
+# - an account takes its subsidiaries (its whole subtree in
+#   account_closure), and their contacts and opportunities;
+# - an opportunity takes its activities;
+# - contacts, opportunities and activities take their association rows.
+#
+# The rows to delete are first collected and locked, parents first, so
+# that no dependent can be added under them before they are gone. Every
+# delete is published and recorded in the change feed like any other.
+
+# The rows of each table to delete, given the ids collected so far (and
+# the ids requested, which are already in them).
+COLLECT = {
+    "accounts": """--sql
+        SELECT account_id FROM accounts
+        WHERE account_id = ANY(%(accounts)s) OR account_id IN (
+            SELECT descendant_id FROM account_closure
+            WHERE ancestor_id = ANY(%(accounts)s)
+        )
+        FOR UPDATE;
+        """,
+    "contacts": """--sql
+        SELECT contact_id FROM contacts
+        WHERE contact_id = ANY(%(contacts)s) OR account_id = ANY(%(accounts)s)
+        FOR UPDATE;
+        """,
+    "opportunities": """--sql
+        SELECT opportunity_id FROM opportunities
+        WHERE opportunity_id = ANY(%(opportunities)s)
+            OR account_id = ANY(%(accounts)s)
+        FOR UPDATE;
+        """,
+    "activities": """--sql
+        SELECT activity_id FROM activities
+        WHERE activity_id = ANY(%(activities)s)
+            OR opportunity_id = ANY(%(opportunities)s)
+        FOR UPDATE;
+        """,
+}
+
+# The tables deleted from, dependents first, with their primary key and
+# the columns that hold the ids of a collected table.
+CASCADE = (
+    (
+        "activity_users",
+        ("activity_id", "user_id"),
+        {"activity_id": "activities"},
+    ),
+    (
+        "activity_contacts",
+        ("activity_id", "contact_id"),
+        {"activity_id": "activities", "contact_id": "contacts"},
+    ),
+    (
+        "opportunity_owners",
+        ("opportunity_id", "user_id"),
+        {"opportunity_id": "opportunities"},
+    ),
+    (
+        "opportunity_contacts",
+        ("opportunity_id", "contact_id"),
+        {"opportunity_id": "opportunities", "contact_id": "contacts"},
+    ),
+    ("activities", ("activity_id",), {"activity_id": "activities"}),
+    ("opportunities", ("opportunity_id",), {"opportunity_id": "opportunities"}),
+    ("contacts", ("contact_id",), {"contact_id": "contacts"}),
+    ("accounts", ("account_id",), {"account_id": "accounts"}),
+)
+
+
+def _delete(table: str, pk: tuple[str, ...], columns: dict[str, str]) -> sql.Composed:
+    return sql.SQL("DELETE FROM {table} WHERE {match} RETURNING {pk};").format(
+        table=sql.Identifier(table),
+        match=sql.SQL(" OR ").join(
+            sql.SQL("{} = ANY({})").format(
+                sql.Identifier(column), sql.Placeholder(collected)
+            )
+            for column, collected in columns.items()
+        ),
+        pk=sql.SQL(", ").join(map(sql.Identifier, pk)),
+    )
+
+
+async def delete_cascading(table: str, keys: list[int]) -> dict:
+    """
+    Deletes the rows of table (accounts, contacts, opportunities or
+    activities) with the given keys and every row that depends on them.
+    Returns the number of rows deleted from each table, and the keys
+    that matched no row.
+    """
+    ids = {collected: [] for collected in COLLECT}
+    ids[table] = list(keys)
+    deleted = {}
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor() as cur:
+                for collected, query in COLLECT.items():
+                    await cur.execute(query, ids)
+                    ids[collected] = [row[0] for row in await cur.fetchall()]
+                for target, pk, columns in CASCADE:
+                    await cur.execute(_delete(target, pk, columns), ids)
+                    rows = await cur.fetchall()
+                    if not rows:
+                        continue
+                    rows = [
+                        row[0] if len(pk) == 1 else dict(zip(pk, row)) for row in rows
+                    ]
+                    await publish(conn, target, rows)
+                    await outbox.record(conn, target, "delete", rows)
+                    deleted[target] = len(rows)
+    if "opportunities" in deleted:
+        schedule_pipeline_refresh()
+    found = set(ids[table])
+    return {
+        "deleted": deleted,
+        "missing": [key for key in keys if key not in found],
+    }
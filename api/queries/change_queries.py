@@ -0,0 +1,68 @@
+import psycopg
+from psycopg.rows import dict_row
+from queries.pool import pool
+from utils.exceptions import ChangeDatabaseError, InvalidCursorError
+from utils.pagination import DEFAULT_PAGE_SIZE
+
+# Read side of the change feed (migration 020, queries.outbox). Changes
+# are served by (xid, seq) and only from transactions older than the
+# oldest one still running, so that nothing can later commit before a
+# change that was already served. A consumer remembers the seq of the
+# last change it read and passes it back as after.
+
+FEED = """--sql
+    SELECT seq, table_name AS "table", operation, key, changed_at
+    FROM change_outbox
+    WHERE (xid, seq) > (%(xid)s::xid8, %(after)s)
+        AND xid < pg_snapshot_xmin(pg_current_snapshot())
+    ORDER BY xid, seq
+    LIMIT %(limit)s;
+    """
+
+LATEST = """--sql
+    SELECT seq
+    FROM change_outbox
+    WHERE xid < pg_snapshot_xmin(pg_current_snapshot())
+    ORDER BY xid DESC, seq DESC
+    LIMIT 1;
+    """
+
+
+class ChangeQueries:
+    async def get_changes(self, after: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    xid = "0"
+                    if after:
+                        await cur.execute(
+                            "SELECT xid::text FROM change_outbox WHERE seq = %s;",
+                            (after,),
+                        )
+                        row = await cur.fetchone()
+                        if row is None:
+                            raise InvalidCursorError(f"No change with seq {after}.")
+                        xid = row["xid"]
+                    await cur.execute(
+                        FEED, {"xid": xid, "after": after, "limit": limit}
+                    )
+                    items = await cur.fetchall()
+        except psycopg.Error as e:
+            print(f"Error retrieving changes: {e}")
+            raise ChangeDatabaseError("Error retrieving changes")
+        return {
+            "items": items,
+            "next_after": items[-1]["seq"] if items else after,
+        }
+
+    async def get_latest(self) -> int:
+        """The seq to read on from to get only changes yet to come."""
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(LATEST)
+                    row = await cur.fetchone()
+        except psycopg.Error as e:
+            print(f"Error retrieving the latest change: {e}")
+            raise ChangeDatabaseError("Error retrieving the latest change")
+        return row[0] if row else 0
@@ -0,0 +1,321 @@
+import asyncio
+import os
+import psycopg
+from typing import AsyncIterator, Optional
+from queries import outbox
+from queries.change_queries import ChangeQueries
+from queries.invalidation import listen_to
+from queries.pool import pool
+from utils.exceptions import (
+    ChangeDatabaseError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import MAX_PAGE_SIZE
+
+# Push side of the change feed, behind GET /api/changes/stream. Each
+# worker runs one reader that follows the feed, woken by the outbox
+# notifications heard on the shared invalidation listener, and hands
+# every change to the subscribers that want it. A subscriber that
+# reconnects, or falls behind, catches up by reading the feed from its
+# position, like any other consumer. The position is the seq of the last
+# change it was sent, or further on when the feed has moved past changes
+# it does not want; keepalives carry it as the event id, so that a
+# reconnecting client does not read those changes again.
+
+STREAM_TABLES = ("accounts", "opportunities", "activities")
+
+# Assignment rows are passed on as an update of the assigned entity, so
+# that a subscriber following a user hears of what is assigned to them.
+ASSIGNMENTS = {
+    "opportunity_owners": ("opportunities", "opportunity_id"),
+    "activity_users": ("activities", "activity_id"),
+}
+
+# The users each streamed entity belongs to, for ?owner_id=. Owners are
+# looked up when the change is read; deleted rows have none left and go
+# to every subscriber of their table.
+OWNERS = {
+    "accounts": """--sql
+        SELECT account_id, account_owner_id FROM accounts
+        WHERE account_id = ANY(%s) AND account_owner_id IS NOT NULL;
+        """,
+    "opportunities": """--sql
+        SELECT opportunity_id, user_id FROM opportunity_owners
+        WHERE opportunity_id = ANY(%s);
+        """,
+    "activities": """--sql
+        SELECT activity_id, user_id FROM activity_users
+        WHERE activity_id = ANY(%s);
+        """,
+}
+
+# Transactions that hold the feed back (see queries.change_queries) do
+# not all record changes, so nothing may wake the reader when they end;
+# it also looks on its own this often.
+POLL_INTERVAL = float(os.environ.get("CHANGE_STREAM_POLL_INTERVAL", "5"))
+
+# Seconds without changes after which a subscriber is sent a keepalive.
+KEEPALIVE = 15
+
+# Changes a subscriber may fall behind by before it has to catch up from
+# the feed, and changes it wants that it may catch up on before it is
+# told to reload instead.
+QUEUE_SIZE = 1000
+MAX_CATCH_UP = 5000
+
+
+def parse_tables(tables: Optional[str]) -> tuple[str, ...]:
+    if not tables:
+        return STREAM_TABLES
+    names = tuple(filter(None, tables.split(",")))
+    unknown = [name for name in names if name not in STREAM_TABLES]
+    if unknown:
+        raise InvalidFilterError(
+            f"Cannot stream {', '.join(unknown)}; "
+            f"tables are {', '.join(STREAM_TABLES)}."
+        )
+    return names
+
+
+class Subscriber:
+    def __init__(self, tables: tuple[str, ...], owner_id: Optional[int]):
+        self.tables = tables
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        self.behind = False
+        # Set while the subscriber reads the feed on its own. Afterwards,
+        # position is the seq the reader has handed it every change up
+        # to; None until the first page the reader reads from then on.
+        self.catching_up = True
+        self.position: Optional[int] = None
+
+    def wants(self, change: dict, owners: Optional[set]) -> bool:
+        if change["table"] not in self.tables:
+            return False
+        return self.owner_id is None or owners is None or self.owner_id in owners
+
+    def offer(self, change: dict) -> None:
+        if not self.behind:
+            try:
+                self.queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self.behind = True
+
+    def drain(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.behind = False
+
+
+_subscribers: set[Subscriber] = set()
+_position: Optional[int] = None
+_wake: Optional[asyncio.Event] = None
+_lock: Optional[asyncio.Lock] = None
+_reader: Optional[asyncio.Task] = None
+
+
+def _notified(payload: Optional[str]) -> None:
+    if _wake is not None:
+        _wake.set()
+
+
+listen_to(outbox.CHANNEL, _notified)
+
+
+async def _owned(changes: list[dict]) -> list[tuple[dict, Optional[set]]]:
+    """
+    The streamed changes among the feed's, with the owners of each; None
+    for deleted rows.
+    """
+    streamed = []
+    for change in changes:
+        if change["table"] in ASSIGNMENTS:
+            table, column = ASSIGNMENTS[change["table"]]
+            key = change["key"]
+            change = {
+                **change,
+                "table": table,
+                "operation": "update",
+                "key": key[column],
+            }
+            streamed.append((change, {key["user_id"]}))
+        elif change["table"] in STREAM_TABLES:
+            streamed.append((change, None))
+
+    lookups = [
+        index
+        for index, (change, owners) in enumerate(streamed)
+        if owners is None and change["operation"] != "delete"
+    ]
+    if not lookups:
+        return streamed
+    keys: dict[str, set] = {}
+    for index in lookups:
+        change = streamed[index][0]
+        keys.setdefault(change["table"], set()).add(change["key"])
+    found: dict[tuple, set] = {}
+    try:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                for table, table_keys in keys.items():
+                    await cur.execute(OWNERS[table], (list(table_keys),))
+                    for key, owner in await cur.fetchall():
+                        found.setdefault((table, key), set()).add(owner)
+    except psycopg.Error as e:
+        print(f"Error looking up owners of changes: {e}")
+        raise ChangeDatabaseError("Error looking up owners of changes")
+    for index in lookups:
+        change = streamed[index][0]
+        streamed[index] = (change, found.get((change["table"], change["key"]), set()))
+    return streamed
+
+
+async def _read() -> None:
+    global _position
+    async with _lock:
+        if not _subscribers:
+            _position = None
+            return
+        if _position is None:
+            _position = await ChangeQueries().get_latest()
+            return
+        # Those still catching up may have read past where this read
+        # starts; their position is theirs to keep.
+        following = [s for s in _subscribers if not s.catching_up]
+        while True:
+            page = await ChangeQueries().get_changes(
+                after=_position, limit=MAX_PAGE_SIZE
+            )
+            for change, owners in await _owned(page["items"]):
+                for subscriber in _subscribers:
+                    if subscriber.wants(change, owners):
+                        subscriber.offer(change)
+            _position = page["next_after"]
+            for subscriber in following:
+                subscriber.position = _position
+            if len(page["items"]) < MAX_PAGE_SIZE:
+                return
+
+
+async def _run() -> None:
+    global _position
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        try:
+            await _read()
+        except InvalidCursorError:
+            # The change read up to is gone; everyone catches up on
+            # their own from the last change they were sent.
+            _position = None
+            for subscriber in _subscribers:
+                subscriber.behind = True
+        except ChangeDatabaseError:
+            pass
+        except Exception as e:
+            # A reader that stopped would leave every subscriber of this
+            # worker waiting for good; it tries again on the next wake.
+            print(f"Error following the change feed: {e!r}")
+
+
+async def _subscribe(subscriber: Subscriber) -> int:
+    """Adds the subscriber and returns the seq the reader is at."""
+    global _position, _wake, _lock, _reader
+    if _reader is None:
+        _wake = asyncio.Event()
+        _lock = asyncio.Lock()
+        _reader = asyncio.create_task(_run())
+    async with _lock:
+        if _position is None:
+            _position = await ChangeQueries().get_latest()
+        _subscribers.add(subscriber)
+        return _position
+
+
+async def _catch_up(subscriber: Subscriber, after: int) -> tuple[list[dict], int]:
+    """The changes the subscriber wants after the seq, and the seq read up to."""
+    changes = []
+    start = after
+    while True:
+        page = await ChangeQueries().get_changes(after=after, limit=MAX_PAGE_SIZE)
+        changes.extend(
+            change
+            for change, owners in await _owned(page["items"])
+            if subscriber.wants(change, owners)
+        )
+        if len(changes) > MAX_CATCH_UP:
+            raise InvalidCursorError(f"Too many changes since seq {start}.")
+        after = page["next_after"]
+        if len(page["items"]) < MAX_PAGE_SIZE:
+            return changes, after
+
+
+async def subscribe(
+    tables: tuple[str, ...],
+    owner_id: Optional[int] = None,
+    after: Optional[int] = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Follows the changes to tables after the given seq (from now on if
+    None), for rows of owner_id if given. The returned iterator yields
+    ("change", change) for each of them; ("reset", {"seq": seq}) when some
+    cannot be told, because after is unknown or too far back, and the
+    client should reload instead; and ("keepalive", {"seq": seq}) when
+    idle. seq is the position to resume from.
+    """
+    subscriber = Subscriber(tables, owner_id)
+    position = await _subscribe(subscriber)
+    return _follow(subscriber, position if after is None else after)
+
+
+async def _follow(
+    subscriber: Subscriber, after: int
+) -> AsyncIterator[tuple[str, dict]]:
+    try:
+        while True:
+            # Changes the reader hands over while catching up may be in
+            # the catch-up too.
+            sent = set()
+            subscriber.catching_up = True
+            try:
+                changes, position = await _catch_up(subscriber, after)
+                for change in changes:
+                    sent.add(change["seq"])
+                    yield "change", change
+                after = position
+            except InvalidCursorError:
+                after = await ChangeQueries().get_latest()
+                yield "reset", {"seq": after}
+            subscriber.catching_up = False
+            subscriber.position = None
+            while not subscriber.behind:
+                try:
+                    change = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # Everything the reader handed over has been sent.
+                    if subscriber.position is not None:
+                        after = subscriber.position
+                    yield "keepalive", {"seq": after}
+                    continue
+                if change["seq"] not in sent:
+                    after = change["seq"]
+                    yield "change", change
+            subscriber.drain()
+    finally:
+        _subscribers.discard(subscriber)
+
+
+async def stop_change_stream() -> None:
+    global _position, _wake, _lock, _reader
+    if _reader is not None:
+        _reader.cancel()
+        try:
+            await _reader
+        except asyncio.CancelledError:
+            pass
+    _subscribers.clear()
+    _position = _wake = _lock = _reader = None
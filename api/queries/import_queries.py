@@ -0,0 +1,351 @@
+import csv
+import psycopg
+from anyio import to_thread
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+from psycopg import sql
+from pydantic import BaseModel, ValidationError
+from models.account import AccountCreate
+from models.bulk_import import ImportReport, ImportRowError
+from models.contact import ContactCreate
+from models.opportunity import OpportunityCreate
+from queries import outbox
+from queries.invalidation import publish
+from queries.job_queries import record_success
+from queries.pool import pool
+from queries.report_queries import schedule_pipeline_refresh
+from utils.exceptions import (
+    BulkImportDatabaseError,
+    InvalidImportFileError,
+    JobLeaseExpired,
+)
+
+# Tables that accept bulk imports, their primary key, the model each row
+# is validated against, and the foreign keys checked set-wise before
+# merging.
+IMPORT_TARGETS = {
+    "accounts": {
+        "pk": ("account_id",),
+        "model": AccountCreate,
+        "references": {
+            "parent_account_id": ("accounts", "account_id"),
+            "billing_country_id": ("countries", "country_id"),
+            "shipping_country_id": ("countries", "country_id"),
+            "account_owner_id": ("users", "user_id"),
+        },
+    },
+    "contacts": {
+        "pk": ("contact_id",),
+        "model": ContactCreate,
+        "references": {
+            "account_id": ("accounts", "account_id"),
+            "site_country_id": ("countries", "country_id"),
+        },
+    },
+    "opportunities": {
+        "pk": ("opportunity_id",),
+        "model": OpportunityCreate,
+        "references": {
+            "account_id": ("accounts", "account_id"),
+            "stage_id": ("stages", "stage_id"),
+            "forecast_category_id": (
+                "forecast_categories",
+                "forecast_category_id",
+            ),
+        },
+    },
+}
+
+STAGING_TABLE = sql.Identifier("staged_rows")
+
+# Rows read and validated per trip to a worker thread. Parsing the file
+# and validating rows is CPU-bound, so it is kept off the event loop,
+# which only writes the validated rows to the COPY.
+IMPORT_CHUNK_SIZE = 1000
+
+
+def _validate(model: type[BaseModel], row: Union[dict, str]) -> BaseModel:
+    if isinstance(row, str):
+        return model.model_validate_json(row)
+    return model.model_validate(row)
+
+
+def _validation_messages(error: ValidationError) -> list[str]:
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
+
+
+def _validate_chunk(
+    model: type[BaseModel],
+    columns: list[str],
+    rows: Iterator[Union[dict, str]],
+    start: int,
+) -> tuple[list[tuple], dict[int, list[str]], int]:
+    """
+    Reads and validates up to IMPORT_CHUNK_SIZE rows, numbered from
+    start. Returns the COPY records of the valid ones, the errors of the
+    others and the number of rows read. Raises InvalidImportFileError if
+    the file cannot be read (not UTF-8, or not CSV).
+    """
+    records, errors = [], {}
+    read = 0
+    chunk = islice(rows, IMPORT_CHUNK_SIZE)
+    while True:
+        row_number = start + read
+        try:
+            row = next(chunk)
+        except StopIteration:
+            return records, errors, read
+        except (UnicodeDecodeError, csv.Error, ValueError) as e:
+            raise InvalidImportFileError(f"Cannot read row {row_number}: {e}")
+        read += 1
+        if isinstance(row, dict) and None in row:
+            # csv.DictReader puts the cells beyond the header under None.
+            errors[row_number] = [
+                f"{len(row[None])} more cells than the header has columns"
+            ]
+            continue
+        try:
+            record = _validate(model, row)
+        except ValidationError as e:
+            errors[row_number] = _validation_messages(e)
+            continue
+        records.append((row_number, *(getattr(record, c) for c in columns)))
+
+
+def _report(received: int, imported: int, errors: dict[int, list[str]]) -> ImportReport:
+    return ImportReport(
+        received=received,
+        imported=imported,
+        errors=[
+            ImportRowError(row=row_number, errors=messages)
+            for row_number, messages in sorted(errors.items())
+        ],
+    )
+
+
+class ImportQueries:
+    async def import_rows(
+        self,
+        table: str,
+        rows: Iterable[Union[dict, str]],
+        all_or_nothing: bool = False,
+        job: Optional[dict] = None,
+    ) -> ImportReport:
+        """
+        Validates each row with the table's Create model (in a worker
+        thread, IMPORT_CHUNK_SIZE rows at a time), COPYs the valid
+        ones into a temporary staging table, checks foreign keys and
+        column limits with one set-wise query, and merges the surviving
+        rows with a single INSERT ... SELECT, all in one transaction.
+
+        With all_or_nothing, any error leaves the target table untouched.
+
+        job is the claimed job running the import, if any. It is marked
+        succeeded in the import's transaction, so that an import is never
+        committed twice: if the job's lease ran out and it was taken up
+        again, this attempt rolls back and raises JobLeaseExpired.
+        """
+        target = IMPORT_TARGETS[table]
+        model = target["model"]
+        columns = list(model.model_fields)
+        errors: dict[int, list[str]] = {}
+        received = imported = 0
+        try:
+            async with pool.connection() as conn:
+                async with conn.transaction():
+                    async with conn.cursor() as cur:
+                        checks = await self._create_staging_table(cur, table, columns)
+                        copy_sql = sql.SQL(
+                            "COPY {} (row_number, {}) FROM STDIN"
+                        ).format(
+                            STAGING_TABLE,
+                            sql.SQL(", ").join(map(sql.Identifier, columns)),
+                        )
+                        rows = iter(rows)
+                        async with cur.copy(copy_sql) as copy:
+                            while True:
+                                records, invalid, read = await to_thread.run_sync(
+                                    _validate_chunk, model, columns, rows, received + 1
+                                )
+                                received += read
+                                errors.update(invalid)
+                                for record in records:
+                                    await copy.write_row(record)
+                                if read < IMPORT_CHUNK_SIZE:
+                                    break
+
+                        checks += self._reference_checks(target["references"])
+                        if checks:
+                            await cur.execute(
+                                sql.SQL(" UNION ALL ").join(checks)
+                                + sql.SQL(" ORDER BY 1;")
+                            )
+                            for row_number, message in await cur.fetchall():
+                                errors.setdefault(row_number, []).append(message)
+
+                        if errors and all_or_nothing:
+                            raise psycopg.Rollback()
+
+                        await cur.execute(
+                            sql.SQL(
+                                """--sql
+                                DELETE FROM {staging}
+                                WHERE row_number = ANY(%s);
+                                """
+                            ).format(staging=STAGING_TABLE),
+                            (list(errors),),
+                        )
+                        # The merged rows go to the change feed from the
+                        # same statement; its row count is theirs.
+                        await cur.execute(
+                            sql.SQL(
+                                """--sql
+                                WITH merged AS (
+                                    INSERT INTO {table} ({columns})
+                                    SELECT {columns} FROM {staging}
+                                    ORDER BY row_number
+                                    RETURNING {pk}
+                                )
+                                INSERT INTO change_outbox
+                                    (table_name, operation, key)
+                                SELECT {table_name}, 'insert', {key}
+                                FROM merged;
+                                """
+                            ).format(
+                                table=sql.Identifier(table),
+                                columns=sql.SQL(", ").join(
+                                    map(sql.Identifier, columns)
+                                ),
+                                staging=STAGING_TABLE,
+                                pk=sql.SQL(", ").join(
+                                    map(sql.Identifier, target["pk"])
+                                ),
+                                table_name=sql.Literal(table),
+                                key=outbox.key_json(target["pk"]),
+                            )
+                        )
+                        imported = cur.rowcount
+                        if imported:
+                            await publish(conn, table)
+                            await outbox.notify(conn)
+                        if job is not None:
+                            report = _report(received, imported, errors)
+                            if not await record_success(
+                                conn, job, report.model_dump(mode="json")
+                            ):
+                                raise JobLeaseExpired(
+                                    f"Job {job['job_id']} was taken over after "
+                                    "its lease ran out; its import is rolled back."
+                                )
+        except psycopg.Error as e:
+            print(f"Error importing {table}: {e}")
+            raise BulkImportDatabaseError(f"Error importing {table}")
+        if imported and table == "opportunities":
+            schedule_pipeline_refresh()
+
+        return _report(received, imported, errors)
+
+    async def _create_staging_table(
+        self, cur, table: str, columns: list[str]
+    ) -> list[sql.Composed]:
+        """
+        Creates the staging table with the target's column types but no
+        length or precision limits, so that an over-long value becomes a
+        per-row error instead of aborting the COPY. Returns the checks
+        that enforce those limits set-wise.
+        """
+        await cur.execute(
+            """--sql
+            SELECT
+                column_name,
+                data_type,
+                character_maximum_length,
+                numeric_precision,
+                numeric_scale
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+                AND table_name = %s
+                AND column_name = ANY(%s);
+            """,
+            (table, columns),
+        )
+        described = {row[0]: row[1:] for row in await cur.fetchall()}
+        definitions = [sql.SQL("row_number INTEGER PRIMARY KEY")]
+        checks = []
+        for column in columns:
+            data_type, max_length, precision, scale = described[column]
+            if data_type == "character varying":
+                data_type = "text"
+                if max_length is not None:
+                    checks.append(
+                        self._check(
+                            column,
+                            sql.SQL("length({}) > {}").format(
+                                sql.Identifier("s", column), max_length
+                            ),
+                            f"{column}: longer than {max_length} characters",
+                        )
+                    )
+            elif data_type == "numeric" and precision is not None:
+                checks.append(
+                    self._check(
+                        column,
+                        sql.SQL("abs({}) >= 10 ^ {}").format(
+                            sql.Identifier("s", column), precision - scale
+                        ),
+                        f"{column}: does not fit numeric({precision},{scale})",
+                    )
+                )
+            definitions.append(
+                sql.SQL("{} {}").format(sql.Identifier(column), sql.SQL(data_type))
+            )
+        await cur.execute(
+            sql.SQL("CREATE TEMPORARY TABLE {} ({}) ON COMMIT DROP;").format(
+                STAGING_TABLE, sql.SQL(", ").join(definitions)
+            )
+        )
+        return checks
+
+    def _reference_checks(self, references: dict) -> list[sql.Composed]:
+        checks = []
+        for column, (ref_table, ref_column) in references.items():
+            condition = sql.SQL(
+                "NOT EXISTS (SELECT 1 FROM {ref_table} r WHERE r.{ref_column} = {column})"
+            ).format(
+                ref_table=sql.Identifier(ref_table),
+                ref_column=sql.Identifier(ref_column),
+                column=sql.Identifier("s", column),
+            )
+            checks.append(
+                self._check(
+                    column,
+                    condition,
+                    f"{column}: no {ref_table} row with {ref_column} = ",
+                    append_value=True,
+                )
+            )
+        return checks
+
+    def _check(
+        self,
+        column: str,
+        condition: sql.Composable,
+        message: str,
+        append_value: bool = False,
+    ) -> sql.Composed:
+        text = sql.Literal(message)
+        if append_value:
+            text = sql.SQL("{} || {}").format(text, sql.Identifier("s", column))
+        return sql.SQL(
+            "SELECT s.row_number, {text} FROM {staging} s"
+            " WHERE {column} IS NOT NULL AND {condition}"
+        ).format(
+            text=text,
+            staging=STAGING_TABLE,
+            column=sql.Identifier("s", column),
+            condition=condition,
+        )
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import psycopg
+from typing import Callable, Optional, Union
+from psycopg import sql
+from queries.pool import POOL_TIMEOUT, database_url
+
+# Cross-worker cache invalidation. Every worker caches independently, so
+# a write on one worker has to reach the caches of all the others, in
+# every container. The *Queries write methods call publish() inside their
+# transaction, which queues a NOTIFY on CHANNEL that Postgres delivers
+# only if and when the write commits. Each worker runs listen() as a
+# background task on its own connection and passes every notification to
+# the handlers subscribed to that table.
+
+CHANNEL = "crm_invalidate"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more. Longer key lists
+# (large bulk writes) are replaced by a whole-table invalidation.
+MAX_PAYLOAD_SIZE = 7900
+
+RECONNECT_DELAY = float(os.environ.get("INVALIDATION_RECONNECT_DELAY", "1"))
+
+Key = Union[int, dict]
+
+# Handlers receive the primary keys of the changed rows, or None when the
+# whole table should be dropped.
+Handler = Callable[[Optional[list[Key]]], None]
+
+_handlers: dict[str, list[Handler]] = {}
+
+# Other channels the listener's connection LISTENs on, so that each worker
+# needs only the one connection. Their callback receives each payload, or
+# None whenever the connection is (re)established, since notifications
+# sent while it was down are lost. Register them before start_listener().
+ChannelCallback = Callable[[Optional[str]], None]
+
+_channels: dict[str, ChannelCallback] = {}
+
+
+def subscribe(table: str, handler: Handler) -> None:
+    _handlers.setdefault(table, []).append(handler)
+
+
+def listen_to(channel: str, callback: ChannelCallback) -> None:
+    _channels[channel] = callback
+
+
+def _dispatch(function: Callable, *args, channel: str) -> None:
+    """
+    Calls a handler or channel callback. A failing one is reported and
+    skipped: the listener serves every cache and channel of the worker,
+    and must outlive any of them.
+    """
+    try:
+        function(*args)
+    except Exception as e:
+        print(f"Error handling a notification on {channel}: {e!r}")
+
+
+def evict(table: str, keys: Optional[list[Key]] = None) -> None:
+    for handler in _handlers.get(table, ()):
+        _dispatch(handler, keys, channel=CHANNEL)
+
+
+def evict_all() -> None:
+    for table in _handlers:
+        evict(table)
+
+
+async def publish(
+    conn: psycopg.AsyncConnection,
+    table: str,
+    keys: Union[Key, list[Key], None] = None,
+) -> None:
+    """
+    Queues an invalidation of the given rows of table (all rows if keys is
+    None) in conn's current transaction. Every worker runs the same code
+    and so caches the same tables; writes to a table nobody caches are
+    not published, which keeps the extra statement off their path.
+    """
+    if table not in _handlers:
+        return
+    if keys is not None and not isinstance(keys, list):
+        keys = [keys]
+    payload = json.dumps({"table": table, "keys": keys})
+    if len(payload.encode()) > MAX_PAYLOAD_SIZE:
+        payload = json.dumps({"table": table, "keys": None})
+    await conn.execute("SELECT pg_notify(%s, %s);", (CHANNEL, payload))
+
+
+async def listen(ready: asyncio.Event) -> None:
+    """
+    Runs until cancelled. Sets ready once LISTEN is in place, so that the
+    caches can be loaded without missing a write that commits in between.
+    A dropped connection is retried; since notifications sent while it
+    was down are lost, every cache is flushed when it comes back.
+    """
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                database_url, autocommit=True
+            ) as conn:
+                for channel in (CHANNEL, *_channels):
+                    await conn.execute(
+                        sql.SQL("LISTEN {};").format(sql.Identifier(channel))
+                    )
+                evict_all()
+                for channel, callback in _channels.items():
+                    _dispatch(callback, None, channel=channel)
+                ready.set()
+                async for notify in conn.notifies():
+                    if notify.channel != CHANNEL:
+                        _dispatch(
+                            _channels[notify.channel],
+                            notify.payload,
+                            channel=notify.channel,
+                        )
+                        continue
+                    try:
+                        message = json.loads(notify.payload)
+                        table, keys = message["table"], message.get("keys")
+                    except (ValueError, KeyError, TypeError) as e:
+                        print(f"Ignoring invalidation {notify.payload!r}: {e}")
+                        continue
+                    evict(table, keys)
+        except psycopg.Error as e:
+            print(f"Invalidation listener disconnected: {e}")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+_listener: Optional[asyncio.Task] = None
+
+
+async def start_listener() -> None:
+    global _listener
+    ready = asyncio.Event()
+    _listener = asyncio.create_task(listen(ready))
+    try:
+        await asyncio.wait_for(ready.wait(), POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        await stop_listener()
+        raise
+
+
+async def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
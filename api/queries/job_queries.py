@@ -0,0 +1,206 @@
+import os
+import psycopg
+from typing import Optional
+from psycopg.rows import class_row, dict_row
+from psycopg.types.json import Jsonb
+from pydantic import ValidationError
+from models.job import JOB_PAYLOADS, Job, JobCreate
+from queries.pool import pool
+from utils.exceptions import InvalidJobError, JobDatabaseError, JobDoesNotExist
+
+# The job queue of migration 023: JobQueries queues and reports jobs for
+# the API; the functions below are the worker's side (see jobs). Queueing
+# a job notifies CHANNEL on commit, which wakes the idle workers; they
+# also poll every JOB_POLL_INTERVAL seconds, for retries coming due.
+
+CHANNEL = "crm_jobs"
+
+# Seconds a claimed job stays leased to its worker without a renewal.
+JOB_LEASE = float(os.environ.get("JOB_LEASE", "60"))
+
+# Retries wait JOB_RETRY_DELAY seconds, doubling with every failed
+# attempt up to JOB_MAX_RETRY_DELAY.
+JOB_RETRY_DELAY = float(os.environ.get("JOB_RETRY_DELAY", "10"))
+JOB_MAX_RETRY_DELAY = float(os.environ.get("JOB_MAX_RETRY_DELAY", "3600"))
+
+# Largest file POST /api/jobs/import accepts, in bytes. The file is kept
+# in the job's payload until the job has run.
+MAX_IMPORT_JOB_SIZE = int(os.environ.get("MAX_IMPORT_JOB_SIZE", str(20 * 2**20)))
+
+JOB_COLUMNS = """
+    job_id, kind, status, attempts, max_attempts, run_at, created_at,
+    started_at, finished_at, result, last_error
+    """
+
+ENQUEUE = f"""--sql
+    WITH queued AS (
+        INSERT INTO jobs (kind, payload, max_attempts)
+        VALUES (%(kind)s, %(payload)s, %(max_attempts)s)
+        RETURNING {JOB_COLUMNS}
+    ), notified AS (
+        SELECT pg_notify(%(channel)s, '')
+    )
+    SELECT queued.* FROM queued, notified;
+    """
+
+CLAIM = """--sql
+    UPDATE jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        started_at = now(),
+        locked_until = now() + %(lease)s * interval '1 second'
+    WHERE job_id = (
+        SELECT job_id
+        FROM jobs
+        WHERE status = 'queued' AND run_at <= now()
+        ORDER BY run_at, job_id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING job_id, kind, payload, attempts;
+    """
+
+# The conditions on status and attempts make sure that a worker whose
+# lease ran out cannot overwrite the job once it has been claimed again.
+RENEW = """--sql
+    UPDATE jobs
+    SET locked_until = now() + %(lease)s * interval '1 second'
+    WHERE job_id = %(job_id)s AND status = 'running' AND attempts = %(attempts)s;
+    """
+
+SUCCEED = """--sql
+    UPDATE jobs
+    SET status = 'succeeded',
+        result = %(result)s,
+        last_error = NULL,
+        locked_until = NULL,
+        finished_at = now()
+    WHERE job_id = %(job_id)s AND status = 'running' AND attempts = %(attempts)s;
+    """
+
+FAIL = """--sql
+    UPDATE jobs
+    SET status = CASE
+            WHEN %(retry)s AND attempts < max_attempts THEN 'queued'
+            ELSE 'failed'
+        END,
+        run_at = now() + least(
+            %(max_delay)s, %(delay)s * power(2, attempts - 1)
+        ) * interval '1 second',
+        last_error = %(error)s,
+        locked_until = NULL,
+        finished_at = CASE
+            WHEN %(retry)s AND attempts < max_attempts THEN NULL
+            ELSE now()
+        END
+    WHERE job_id = %(job_id)s AND status = 'running' AND attempts = %(attempts)s
+    RETURNING status;
+    """
+
+REQUEUE_EXPIRED = """--sql
+    UPDATE jobs
+    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        run_at = now(),
+        last_error = 'The worker running the job stopped.',
+        locked_until = NULL,
+        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE now() END
+    WHERE status = 'running' AND locked_until < now();
+    """
+
+
+class JobQueries:
+    async def create(self, job: JobCreate) -> Job:
+        try:
+            payload = JOB_PAYLOADS[job.kind].model_validate(job.payload)
+        except ValidationError as e:
+            raise InvalidJobError(f"Invalid {job.kind.value} payload: {e}")
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(Job)) as cur:
+                    await cur.execute(
+                        ENQUEUE,
+                        {
+                            "kind": job.kind.value,
+                            "payload": Jsonb(payload.model_dump(mode="json")),
+                            "max_attempts": job.max_attempts,
+                            "channel": CHANNEL,
+                        },
+                    )
+                    return await cur.fetchone()
+        except psycopg.Error as e:
+            print(f"Error queueing {job.kind.value} job: {e}")
+            raise JobDatabaseError(f"Error queueing {job.kind.value} job")
+
+    async def get(self, job_id: int) -> Job:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(Job)) as cur:
+                    await cur.execute(
+                        f"SELECT {JOB_COLUMNS} FROM jobs WHERE job_id = %s;",
+                        (job_id,),
+                    )
+                    job = await cur.fetchone()
+        except psycopg.Error as e:
+            print(f"Error retrieving job with id {job_id}: {e}")
+            raise JobDatabaseError(f"Error retrieving job with id {job_id}")
+        if job is None:
+            raise JobDoesNotExist(f"Job with id {job_id} does not exist.")
+        return job
+
+
+async def claim_job() -> Optional[dict]:
+    """The next job due, leased to this worker; None if there is none."""
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(CLAIM, {"lease": JOB_LEASE})
+            return await cur.fetchone()
+
+
+async def renew_lease(job: dict) -> None:
+    async with pool.connection() as conn:
+        await conn.execute(RENEW, {**job, "lease": JOB_LEASE})
+
+
+async def succeed_job(job: dict, result) -> None:
+    async with pool.connection() as conn:
+        await record_success(conn, job, result)
+
+
+async def record_success(conn, job: dict, result) -> bool:
+    """
+    Marks the job succeeded in conn's current transaction; False if this
+    attempt no longer holds it, because its lease ran out. A job whose
+    work is not safe to repeat records its success in the transaction
+    that does the work, and rolls it back on False.
+    """
+    async with conn.cursor() as cur:
+        await cur.execute(SUCCEED, {**job, "result": Jsonb(result)})
+        return cur.rowcount == 1
+
+
+async def fail_job(job: dict, error: str, retry: bool = True) -> Optional[str]:
+    """
+    Queues the job for another attempt (if retry and it has attempts
+    left) or marks it failed; returns the new status.
+    """
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                FAIL,
+                {
+                    **job,
+                    "error": error,
+                    "retry": retry,
+                    "delay": JOB_RETRY_DELAY,
+                    "max_delay": JOB_MAX_RETRY_DELAY,
+                },
+            )
+            row = await cur.fetchone()
+            return row[0] if row else None
+
+
+async def requeue_expired_jobs() -> int:
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(REQUEUE_EXPIRED)
+            return cur.rowcount
@@ -0,0 +1,62 @@
+import psycopg
+from typing import Literal, Sequence, Union
+from psycopg import sql
+from psycopg.types.json import Jsonb
+
+# Write side of the change feed (migration 020, queries.change_queries).
+# The *Queries write methods call record() inside their transaction with
+# the keys of the rows they changed, next to queries.invalidation.publish;
+# the rows only become visible to the feed if the write commits. Keys are
+# recorded as invalidation publishes them: the primary key value, or for
+# composite keys an object of the key columns.
+#
+# Each recording transaction also notifies CHANNEL on commit (Postgres
+# folds the repeats of one transaction into one), which wakes the
+# per-worker readers of queries.change_stream.
+
+CHANNEL = "crm_changes"
+
+Operation = Literal["insert", "update", "delete"]
+
+Key = Union[int, dict]
+
+RECORD = """--sql
+    WITH recorded AS (
+        INSERT INTO change_outbox (table_name, operation, key)
+        SELECT %s, %s, unnest(%s::jsonb[])
+    )
+    SELECT pg_notify(%s, '');
+    """
+
+NOTIFY = """--sql
+    SELECT pg_notify(%s, '');
+    """
+
+
+async def record(
+    conn: psycopg.AsyncConnection,
+    table: str,
+    operation: Operation,
+    keys: Sequence[Key],
+) -> None:
+    if keys:
+        await conn.execute(
+            RECORD, (table, operation, [Jsonb(key) for key in keys], CHANNEL)
+        )
+
+
+async def notify(conn: psycopg.AsyncConnection) -> None:
+    """For writers that add to change_outbox themselves."""
+    await conn.execute(NOTIFY, (CHANNEL,))
+
+
+def key_json(pk: Sequence[str]) -> sql.Composed:
+    """The SQL expression of a row's recorded key, for INSERT ... SELECT."""
+    if len(pk) == 1:
+        return sql.SQL("to_jsonb({})").format(sql.Identifier(pk[0]))
+    return sql.SQL("jsonb_build_object({})").format(
+        sql.SQL(", ").join(
+            sql.SQL("{}, {}").format(sql.Literal(column), sql.Identifier(column))
+            for column in pk
+        )
+    )
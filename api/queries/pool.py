@@ -0,0 +1,42 @@
+import os
+from psycopg_pool import AsyncConnectionPool
+from utils.exceptions import DatabaseURLException
+
+# Initialize Connection Pool
+database_url = os.environ.get("DATABASE_URL")
+if database_url is None:
+    raise DatabaseURLException(
+        "You forgot to define DATABASE_URL in your environment.",
+    )
+
+# One pool per worker process, shared by every *Queries class. The sizes
+# are per worker, so max_size * workers must stay below the Postgres
+# max_connections setting. A request holds one connection at a time,
+# except GET /api/users/{user_id}/dashboard, which runs its five queries
+# at once on five (queries.user_queries): max_size / 5 of them at the
+# same time use up the pool, and the requests after them wait for up to
+# POOL_TIMEOUT seconds. Raise DB_POOL_MAX_SIZE with the dashboard's use.
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+POOL_MAX_IDLE = float(os.environ.get("DB_POOL_MAX_IDLE", "600"))
+
+# The pool is opened (and its min_size connections warmed) by the
+# application lifespan in main.py, not at import time. Connections are
+# psycopg AsyncConnections, so queries never block the event loop.
+pool = AsyncConnectionPool(
+    database_url,
+    min_size=POOL_MIN_SIZE,
+    max_size=POOL_MAX_SIZE,
+    timeout=POOL_TIMEOUT,
+    max_idle=POOL_MAX_IDLE,
+    open=False,
+)
+
+
+async def open_pool() -> None:
+    await pool.open(wait=True, timeout=POOL_TIMEOUT)
+
+
+async def close_pool() -> None:
+    await pool.close()
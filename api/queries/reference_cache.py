@@ -0,0 +1,85 @@
+import asyncio
+from typing import Optional, Sequence
+from psycopg import sql
+from psycopg.rows import class_row
+from pydantic import BaseModel
+from models.page import Page
+from queries.invalidation import subscribe
+from queries.pool import pool
+from utils.pagination import decode_cursor, paginate
+
+# Small, rarely changing lookup tables (countries, stages, forecast
+# categories, activity types) are held in memory by each worker. Once a
+# table is loaded its GET routes never touch the database. The *Queries
+# write methods call invalidate() after they commit, and the next read
+# reloads the whole table with one query. Writes made by other workers
+# arrive through queries.invalidation.
+
+reference_caches: dict[str, "ReferenceCache"] = {}
+
+
+class ReferenceCache:
+    def __init__(self, table: str, pk: str, model: type[BaseModel]):
+        self.table = table
+        self.pk = pk
+        self.model = model
+        self._rows: Optional[dict[int, BaseModel]] = None
+        # Bumped by invalidate() so that a load which raced with a write
+        # does not store rows read before that write committed.
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        reference_caches[table] = self
+        # The tables are small enough that any change reloads all of it.
+        subscribe(table, lambda keys: self.invalidate())
+
+    async def rows(self) -> dict[int, BaseModel]:
+        rows = self._rows
+        if rows is None:
+            rows = await self.load()
+        return rows
+
+    async def load(self) -> dict[int, BaseModel]:
+        async with self._lock:
+            if self._rows is not None:
+                return self._rows
+            generation = self._generation
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(self.model)) as cur:
+                    await cur.execute(
+                        sql.SQL("SELECT * FROM {table} ORDER BY {pk};").format(
+                            table=sql.Identifier(self.table),
+                            pk=sql.Identifier(self.pk),
+                        )
+                    )
+                    rows = {getattr(row, self.pk): row for row in await cur.fetchall()}
+            if generation == self._generation:
+                self._rows = rows
+            return rows
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._rows = None
+
+    async def get(self, key: int) -> Optional[BaseModel]:
+        return (await self.rows()).get(key)
+
+    async def get_many(self, keys: Sequence[int]) -> list[BaseModel]:
+        rows = await self.rows()
+        return [rows[key] for key in sorted(set(keys)) if key in rows]
+
+    async def page(
+        self, limit: int, cursor: Optional[str], keys: Optional[set[int]] = None
+    ) -> Page:
+        """A page of all rows, or of the rows with the given keys."""
+        (after,) = decode_cursor(cursor, (0,))
+        rows = []
+        for key, row in (await self.rows()).items():
+            if key > after and (keys is None or key in keys):
+                rows.append(row)
+                if len(rows) > limit:
+                    break
+        return paginate(rows, limit, (self.pk,))
+
+
+async def load_reference_caches() -> None:
+    await asyncio.gather(*(cache.load() for cache in reference_caches.values()))
@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from psycopg.rows import dict_row
+from queries import statements
+
+# Relationships that the fast-path routes can expand with ?include=. Each
+# *Queries class declares its relations by name:
+#
+#   relations = {
+#       "account": BelongsTo("account_id", "accounts"),
+#       "owners": Through("opportunity_owners", "opportunity_id", "users"),
+#       "activities": HasMany("activities", "opportunity_id"),
+#   }
+#
+# Relations are loaded DataLoader style: once the page (or row) has been
+# read, every included relation collects the keys of all rows and loads
+# the related records with a single "= ANY(%s)" query, which is then
+# distributed over the rows. A request therefore costs one query per
+# included relation, however many rows it returns. Relations to the
+# reference tables are served from their ReferenceCache and cost none.
+#
+# Related records carry the columns of their table's response model.
+
+# Every Repository subclass, by table; filled in by queries.repository.
+repositories: dict[str, type] = {}
+
+
+class Relation(ABC):
+    # Columns of the source row the relation reads its keys from.
+    columns: tuple[str, ...] = ()
+
+    def __init__(self, table: str):
+        self.table = table
+
+    @property
+    def target(self) -> type:
+        return repositories[self.table]
+
+    def _columns(self) -> tuple[str, ...]:
+        return tuple(self.target.model.model_fields)
+
+    @abstractmethod
+    async def load(self, conn, rows: list[dict], name: str, pk: str) -> None:
+        """Sets row[name] on every row; pk is the source table's key."""
+
+
+class BelongsTo(Relation):
+    """The one record whose primary key is in column (None if null)."""
+
+    def __init__(self, column: str, table: str):
+        super().__init__(table)
+        self.column = column
+        self.columns = (column,)
+
+    async def load(self, conn, rows: list[dict], name: str, pk: str) -> None:
+        keys = sorted({row[self.column] for row in rows} - {None})
+        found = {}
+        if keys and hasattr(self.target, "cache"):
+            target_pk = self.target.pk[0]
+            found = {
+                getattr(record, target_pk): record.model_dump()
+                for record in await self.target.cache.get_many(keys)
+            }
+        elif keys:
+            target_pk = self.target.pk
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    statements.select_in(self.table, target_pk, self._columns()),
+                    statements.key_params(target_pk, [(key,) for key in keys]),
+                )
+                found = {
+                    record[target_pk[0]]: record for record in await cur.fetchall()
+                }
+        for row in rows:
+            row[name] = found.get(row[self.column])
+
+
+class HasMany(Relation):
+    """The records of table whose column holds the source row's key."""
+
+    def __init__(self, table: str, column: str):
+        super().__init__(table)
+        self.column = column
+
+    async def load(self, conn, rows: list[dict], name: str, pk: str) -> None:
+        groups: dict[int, list[dict]] = {}
+        if rows:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    statements.select_by(
+                        self.table, self.column, self.target.pk, self._columns()
+                    ),
+                    ([row[pk] for row in rows],),
+                )
+                for record in await cur.fetchall():
+                    groups.setdefault(record[self.column], []).append(record)
+        for row in rows:
+            row[name] = groups.get(row[pk], [])
+
+
+class Through(Relation):
+    """
+    The records of table linked to the source row by the association
+    table link, whose column holds the source row's key and which shares
+    the name of table's primary key.
+    """
+
+    def __init__(self, link: str, column: str, table: str):
+        super().__init__(table)
+        self.link = link
+        self.column = column
+
+    async def load(self, conn, rows: list[dict], name: str, pk: str) -> None:
+        groups: dict[int, list[dict]] = {}
+        if rows:
+            columns = self._columns()
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    statements.select_through(
+                        self.link, self.column, self.table, self.target.pk, columns
+                    ),
+                    ([row[pk] for row in rows],),
+                )
+                for key, *values in await cur.fetchall():
+                    groups.setdefault(key, []).append(dict(zip(columns, values)))
+        for row in rows:
+            row[name] = groups.get(row[pk], [])
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import psycopg
+from datetime import date
+from typing import Optional
+from psycopg import sql
+from psycopg.rows import class_row
+from models.report import PipelineTotal
+from queries.pool import pool
+from utils.exceptions import ReportDatabaseError
+
+# Reports served from materialized views (see migrations), so that they
+# answer in milliseconds whatever the size of the tables behind them.
+#
+# pipeline_summary is refreshed CONCURRENTLY, which keeps it readable
+# while it is rebuilt, on a debounce: the first write to opportunities
+# (or to the stage and forecast category names it shows) schedules a
+# refresh PIPELINE_REFRESH_DELAY seconds later, and every write until
+# then is folded into it. A write made while the refresh runs schedules
+# another one. Workers that write at the same time take turns through an
+# advisory lock; one that finds it held tries again after the delay,
+# since the refresh in progress may have started before its write. A
+# refresh still pending when a process stops is run straight away by
+# stop_pipeline_refresh(), before the pool closes.
+
+PIPELINE_REFRESH_DELAY = float(os.environ.get("PIPELINE_REFRESH_DELAY", "2"))
+
+# pg_try_advisory_xact_lock key, shared by every worker.
+PIPELINE_REFRESH_LOCK = 7_201_700
+
+_pipeline_stale = False
+_pipeline_refresh: Optional[asyncio.Task] = None
+
+
+def schedule_pipeline_refresh() -> None:
+    """Marks pipeline_summary stale; it is refreshed after the delay."""
+    global _pipeline_stale, _pipeline_refresh
+    _pipeline_stale = True
+    if _pipeline_refresh is None or _pipeline_refresh.done():
+        _pipeline_refresh = asyncio.create_task(_refresh_pipeline_later())
+
+
+async def _refresh_pipeline_later() -> None:
+    global _pipeline_stale
+    while _pipeline_stale:
+        await asyncio.sleep(PIPELINE_REFRESH_DELAY)
+        _pipeline_stale = False
+        try:
+            refreshed = await refresh_pipeline()
+        except psycopg.Error as e:
+            print(f"Error refreshing pipeline_summary: {e}")
+            refreshed = False
+        _pipeline_stale = _pipeline_stale or not refreshed
+
+
+async def refresh_pipeline(wait: bool = False) -> bool:
+    """
+    Refreshes pipeline_summary unless another worker is already doing so;
+    returns whether it did. With wait, waits for that worker's refresh to
+    end and then refreshes anyway, since it may have started before the
+    caller's writes committed.
+    """
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            if wait:
+                await cur.execute(
+                    "SELECT pg_advisory_xact_lock(%s);", (PIPELINE_REFRESH_LOCK,)
+                )
+                locked = True
+            else:
+                await cur.execute(
+                    "SELECT pg_try_advisory_xact_lock(%s);", (PIPELINE_REFRESH_LOCK,)
+                )
+                (locked,) = await cur.fetchone()
+            if locked:
+                await cur.execute(
+                    "REFRESH MATERIALIZED VIEW CONCURRENTLY pipeline_summary;"
+                )
+            return locked
+
+
+async def stop_pipeline_refresh() -> None:
+    """
+    Runs a pending refresh now instead of after the delay. Processes call
+    it before they close the pool, so that their last writes reach the
+    report; a short-lived one (the import CLI) would otherwise exit
+    before the delay is up.
+    """
+    global _pipeline_stale, _pipeline_refresh
+    if _pipeline_refresh is not None and not _pipeline_refresh.done():
+        # Either waiting out the delay or in the middle of a refresh, which
+        # cancelling rolls back; both leave the view stale.
+        _pipeline_refresh.cancel()
+        try:
+            await _pipeline_refresh
+        except asyncio.CancelledError:
+            pass
+        _pipeline_stale = True
+    _pipeline_refresh = None
+    if _pipeline_stale:
+        _pipeline_stale = False
+        try:
+            await refresh_pipeline(wait=True)
+        except psycopg.Error as e:
+            print(f"Error refreshing pipeline_summary: {e}")
+
+
+class ReportQueries:
+    async def get_pipeline(
+        self,
+        stage_id: Optional[int] = None,
+        forecast_category_id: Optional[int] = None,
+        close_from: Optional[date] = None,
+        close_to: Optional[date] = None,
+    ) -> list[PipelineTotal]:
+        """
+        The pipeline totals, optionally for one stage or forecast category
+        and for the months from close_from to close_to (inclusive; any day
+        of a month stands for the whole month).
+        """
+        conditions = [sql.SQL("TRUE")]
+        params = []
+        if stage_id is not None:
+            conditions.append(sql.SQL("stage_id = %s"))
+            params.append(stage_id)
+        if forecast_category_id is not None:
+            conditions.append(sql.SQL("forecast_category_id = %s"))
+            params.append(forecast_category_id)
+        if close_from is not None:
+            conditions.append(sql.SQL("close_month >= date_trunc('month', %s::date)"))
+            params.append(close_from)
+        if close_to is not None:
+            conditions.append(sql.SQL("close_month <= %s"))
+            params.append(close_to)
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(PipelineTotal)) as cur:
+                    await cur.execute(
+                        sql.SQL(
+                            """--sql
+                            SELECT *
+                            FROM pipeline_summary
+                            WHERE {where}
+                            ORDER BY close_month, stage_id, forecast_category_id;
+                            """
+                        ).format(where=sql.SQL(" AND ").join(conditions)),
+                        params,
+                    )
+                    return await cur.fetchall()
+        except psycopg.Error as e:
+            print(f"Error retrieving the pipeline report: {e}")
+            raise ReportDatabaseError("Error retrieving the pipeline report")
@@ -0,0 +1,446 @@
+import psycopg
+from typing import AsyncIterator, ClassVar, Optional, Sequence, Union
+from psycopg import sql
+from psycopg.errors import CheckViolation, UniqueViolation
+from psycopg.rows import class_row, dict_row
+from pydantic import BaseModel
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from queries import statements
+from queries.bulk import MAX_BULK_SIZE, bulk_insert, bulk_update, bulk_delete
+from queries import outbox
+from queries.invalidation import publish
+from queries.pool import pool
+from queries.reference_cache import ReferenceCache
+from queries.relations import Relation, repositories
+from utils.exceptions import (
+    InvalidChangeError,
+    InvalidFieldsError,
+    InvalidFilterError,
+)
+from utils.fields import column_list, resolve_fields
+from utils.filters import ListQuery
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate_rows
+from utils.streaming import EXPORT_ITERSIZE
+
+# Declarative base of the *Queries classes. A subclass names its table,
+# primary key, models and error types, and inherits the same CRUD, list,
+# export and bulk methods as every other table. The SQL is compiled when
+# the subclass is defined (see queries.statements); only UPDATE and
+# projected SELECT statements vary per call, and those are cached by
+# their set of columns.
+#
+#   class StageQueries(CachedRepository):
+#       table = "stages"
+#       pk = ("stage_id",)
+#       ...
+#
+# Single-column keys are passed as one value, composite ones (the
+# association tables) as one value per key column, in pk order. The
+# read methods take include=, the names of relations (see
+# queries.relations) to attach to each row.
+
+# POST /lookup takes as many keys as the bulk routes.
+MAX_LOOKUP_SIZE = MAX_BULK_SIZE
+
+
+class Repository:
+    table: ClassVar[str]
+    pk: ClassVar[tuple[str, ...]]
+    # Singular, for messages: "opportunity contact".
+    name: ClassVar[str]
+    model: ClassVar[type[BaseModel]]
+    # The request body of POST / and POST /bulk; its fields are the
+    # inserted columns unless insert_columns says otherwise.
+    create_model: ClassVar[type[BaseModel]]
+    insert_columns: ClassVar[tuple[str, ...]] = ()
+    database_error: ClassVar[type[Exception]]
+    does_not_exist: ClassVar[type[Exception]]
+    # Defaults to database_error.
+    creation_error: ClassVar[Optional[type[Exception]]] = None
+    relations: ClassVar[dict[str, Relation]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "table" not in cls.__dict__:
+            return
+        cls.plural = cls.table.replace("_", " ")
+        cls.insert_columns = cls.insert_columns or tuple(cls.create_model.model_fields)
+        cls.creation_error = cls.creation_error or cls.database_error
+        cls.summary_fields = getattr(cls.model, "summary_fields", None)
+        cls._insert = statements.insert(cls.table, cls.insert_columns)
+        cls._delete = statements.delete(cls.table, cls.pk)
+        cls._export = statements.export(cls.table, cls.pk)
+        repositories[cls.table] = cls
+
+    def record(self, item: BaseModel) -> dict:
+        """The row to insert for one create_model item."""
+        return item.model_dump()
+
+    def _changed(self) -> None:
+        """Called after every write, whether or not it committed."""
+
+    def _describe(self, key: tuple) -> str:
+        if len(self.pk) == 1:
+            return f"id {key[0]}"
+        return " and ".join(f"{column} {value}" for column, value in zip(self.pk, key))
+
+    def _published(self, key: tuple) -> Union[int, dict]:
+        return key[0] if len(self.pk) == 1 else dict(zip(self.pk, key))
+
+    def _parse_ids(self, ids: str) -> list[tuple]:
+        """
+        The keys in the raw ids= parameter: "1,2,3", or for composite keys
+        pairs such as "4:7,4:9" in pk order.
+        """
+        keys = []
+        for item in filter(None, ids.split(",")):
+            values = item.split(":")
+            try:
+                if len(values) != len(self.pk):
+                    raise ValueError
+                keys.append(tuple(int(value) for value in values))
+            except ValueError:
+                form = ":".join(self.pk)
+                raise InvalidFilterError(f"{item!r} is not a key of the form {form}.")
+        return keys
+
+    def _includes(self, include: Optional[str]) -> tuple[str, ...]:
+        """The relation names in the raw include= parameter."""
+        names = tuple(
+            dict.fromkeys(name.strip() for name in (include or "").split(","))
+        )
+        names = tuple(name for name in names if name)
+        unknown = [name for name in names if name not in self.relations]
+        if unknown:
+            raise InvalidFieldsError(
+                f"Cannot include {', '.join(unknown)}. "
+                f"Choose from: {', '.join(self.relations)}."
+            )
+        return names
+
+    def _with_keys(
+        self, columns: tuple[str, ...], includes: tuple[str, ...]
+    ) -> tuple[str, ...]:
+        """columns plus the columns the included relations read keys from."""
+        needed = (c for name in includes for c in self.relations[name].columns)
+        return tuple(dict.fromkeys((*columns, *needed)))
+
+    async def _expand(self, conn, rows: list[dict], includes: tuple[str, ...]) -> None:
+        for name in includes:
+            await self.relations[name].load(conn, rows, name, self.pk[0])
+
+    def _key_tuples(self, keys: Sequence[Union[int, BaseModel]]) -> list[tuple]:
+        if len(self.pk) == 1:
+            return [(key,) for key in keys]
+        return [tuple(getattr(key, column) for column in self.pk) for key in keys]
+
+    async def get_all(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        filter: Optional[str] = None,
+        sort: Optional[str] = None,
+        ids: Optional[str] = None,
+        include: Optional[str] = None,
+        within: Optional[tuple[sql.Composable, Sequence]] = None,
+    ) -> dict:
+        """
+        Returns the page as plain dicts for the fast path (utils.fast_json);
+        the rows are not validated against the model. fields, filter and
+        sort are the raw query parameters (see utils.fields and
+        utils.filters); ids limits the list to the given keys. within is
+        a further condition and its parameters, for routes that list part
+        of the table.
+        """
+        query = ListQuery(self.model, self.pk, filter, sort, cursor)
+        includes = self._includes(include)
+        columns = self._with_keys(
+            resolve_fields(self.model, self.pk, fields, self.summary_fields), includes
+        )
+        where, params = query.where, list(query.params)
+        if ids:
+            where = sql.SQL("{} AND {}").format(where, statements.key_in(self.pk))
+            params += statements.key_params(self.pk, self._parse_ids(ids))
+        if within:
+            where = sql.SQL("{} AND {}").format(where, within[0])
+            params += within[1]
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(
+                        sql.SQL(
+                            """--sql
+                            SELECT {columns} FROM {table}
+                            WHERE {where}
+                            ORDER BY {order_by}
+                            LIMIT %s;
+                            """
+                        ).format(
+                            columns=column_list(query.select(columns)),
+                            table=sql.Identifier(self.table),
+                            where=where,
+                            order_by=query.order_by,
+                        ),
+                        (*params, limit + 1),
+                    )
+                    rows = await cur.fetchall()
+                page = paginate_rows(rows, limit, query.key, query.cursor_prefix)
+                await self._expand(conn, page["items"], includes)
+                return page
+        except psycopg.Error as e:
+            print(f"Error retrieving all {self.plural}: {e}")
+            raise self.database_error(f"Error retrieving all {self.plural}")
+
+    async def export(self) -> AsyncIterator[dict]:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(
+                    name=f"export_{self.table}", row_factory=dict_row
+                ) as cur:
+                    cur.itersize = EXPORT_ITERSIZE
+                    await cur.execute(self._export)
+                    async for row in cur:
+                        yield row
+        except psycopg.Error as e:
+            print(f"Error exporting {self.plural}: {e}")
+            raise self.database_error(f"Error exporting {self.plural}")
+
+    async def get(
+        self, *key, fields: Optional[str] = None, include: Optional[str] = None
+    ) -> dict:
+        includes = self._includes(include)
+        columns = self._with_keys(resolve_fields(self.model, self.pk, fields), includes)
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(
+                        statements.select(self.table, self.pk, columns),
+                        dict(zip(self.pk, key)),
+                    )
+                    row = await cur.fetchone()
+                    if row is None:
+                        raise self.does_not_exist(
+                            f"No {self.name} with {self._describe(key)}."
+                        )
+                await self._expand(conn, [row], includes)
+                return row
+        except psycopg.Error as e:
+            print(f"Error retrieving {self.name} with {self._describe(key)}: {e}")
+            raise self.database_error(
+                f"Error retrieving {self.name} with {self._describe(key)}"
+            )
+
+    async def get_many(
+        self,
+        keys: Sequence[Union[int, BaseModel]],
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        The rows with the given keys, in key order, with one query; keys
+        that do not exist are left out. keys are primary key values, or
+        for composite keys models holding the key columns.
+        """
+        if len(keys) > MAX_LOOKUP_SIZE:
+            raise InvalidFilterError(
+                f"At most {MAX_LOOKUP_SIZE} keys can be looked up at once."
+            )
+        includes = self._includes(include)
+        columns = self._with_keys(resolve_fields(self.model, self.pk, fields), includes)
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(
+                        statements.select_in(self.table, self.pk, columns),
+                        statements.key_params(self.pk, self._key_tuples(keys)),
+                    )
+                    rows = await cur.fetchall()
+                await self._expand(conn, rows, includes)
+                return rows
+        except psycopg.Error as e:
+            print(f"Error looking up {self.plural}: {e}")
+            raise self.database_error(f"Error looking up {self.plural}")
+
+    async def create(self, item: BaseModel) -> BaseModel:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(self.model)) as cur:
+                    await cur.execute(self._insert, self.record(item))
+                    row = await cur.fetchone()
+                    if row is None:
+                        raise self.creation_error(f"Error creating {self.name}")
+                    key = tuple(getattr(row, column) for column in self.pk)
+                    await publish(conn, self.table, self._published(key))
+                    await outbox.record(
+                        conn, self.table, "insert", [self._published(key)]
+                    )
+                    return row
+        except UniqueViolation as e:
+            raise self.creation_error(
+                e.diag.message_detail or f"{self.name.capitalize()} already exists."
+            )
+        except psycopg.Error as e:
+            print(f"Error creating {self.name}: {e}")
+            raise self.database_error(f"Error creating {self.name}")
+        finally:
+            self._changed()
+
+    async def delete(self, *key) -> bool:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(self._delete, dict(zip(self.pk, key)))
+                    deleted = cur.rowcount > 0
+                    if deleted:
+                        await publish(conn, self.table, self._published(key))
+                        await outbox.record(
+                            conn, self.table, "delete", [self._published(key)]
+                        )
+                    return deleted
+        except psycopg.Error as e:
+            print(f"Error deleting {self.name} with {self._describe(key)}: {e}")
+            raise self.database_error(
+                f"Error deleting {self.name} with {self._describe(key)}"
+            )
+        finally:
+            self._changed()
+
+    async def edit(self, *key, **changes) -> BaseModel:
+        """
+        Sets the columns passed as keyword arguments; None means leave the
+        column unchanged.
+        """
+        changes = {
+            column: value for column, value in changes.items() if value is not None
+        }
+        if not changes:
+            raise self.database_error("No fields provided for update.")
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=class_row(self.model)) as cur:
+                    await cur.execute(
+                        statements.update(self.table, self.pk, tuple(sorted(changes))),
+                        {**changes, **dict(zip(self.pk, key))},
+                    )
+                    row = await cur.fetchone()
+                    if row is None:
+                        raise self.does_not_exist(
+                            f"{self.name.capitalize()} with "
+                            f"{self._describe(key)} does not exist."
+                        )
+                    await publish(conn, self.table, self._published(key))
+                    await outbox.record(
+                        conn, self.table, "update", [self._published(key)]
+                    )
+                    return row
+        except CheckViolation as e:
+            raise InvalidChangeError(e.diag.message_primary)
+        except psycopg.Error as e:
+            print(e)
+            raise self.database_error(
+                f"Could not update {self.name} {self._describe(key)}"
+            )
+        finally:
+            self._changed()
+
+    async def create_many(self, items: list[BaseModel], mode: BulkMode) -> BulkResult:
+        try:
+            return await bulk_insert(
+                self.table,
+                self.model,
+                self.pk,
+                self.insert_columns,
+                [self.record(item) for item in items],
+                mode,
+            )
+        except psycopg.Error as e:
+            print(f"Error bulk creating {self.plural}: {e}")
+            raise self.database_error(f"Error bulk creating {self.plural}")
+        finally:
+            self._changed()
+
+    async def edit_many(self, items: list[BaseModel], mode: BulkMode) -> BulkResult:
+        try:
+            return await bulk_update(
+                self.table,
+                self.model,
+                self.pk[0],
+                [item.model_dump(exclude_unset=True) for item in items],
+                mode,
+            )
+        except psycopg.Error as e:
+            print(f"Error bulk updating {self.plural}: {e}")
+            raise self.database_error(f"Error bulk updating {self.plural}")
+        finally:
+            self._changed()
+
+    async def delete_many(
+        self, keys: Sequence[Union[int, BaseModel]], mode: BulkMode
+    ) -> BulkDeleteResult:
+        """
+        keys are primary key values, or for composite keys models holding
+        the key columns.
+        """
+        if len(self.pk) > 1:
+            keys = [key.model_dump() for key in keys]
+        try:
+            return await bulk_delete(self.table, self.pk, list(keys), mode)
+        except psycopg.Error as e:
+            print(f"Error bulk deleting {self.plural}: {e}")
+            raise self.database_error(f"Error bulk deleting {self.plural}")
+        finally:
+            self._changed()
+
+
+class CachedRepository(Repository):
+    """
+    A Repository whose reads are served by a ReferenceCache; every write
+    drops the cache of this worker as soon as it is done, and other
+    workers hear of it through queries.invalidation.
+    """
+
+    cache: ClassVar[ReferenceCache]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "table" in cls.__dict__:
+            cls.cache = ReferenceCache(cls.table, cls.pk[0], cls.model)
+
+    def _changed(self) -> None:
+        self.cache.invalidate()
+
+    async def get_all(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        ids: Optional[str] = None,
+    ) -> Page:
+        keys = {key for key, in self._parse_ids(ids)} if ids else None
+        try:
+            return await self.cache.page(limit, cursor, keys)
+        except psycopg.Error as e:
+            print(f"Error retrieving all {self.plural}: {e}")
+            raise self.database_error(f"Error retrieving all {self.plural}")
+
+    async def get(self, key: int) -> BaseModel:
+        try:
+            row = await self.cache.get(key)
+        except psycopg.Error as e:
+            print(f"Error retrieving {self.name} with id {key}: {e}")
+            raise self.database_error(f"Error retrieving {self.name} with id {key}")
+        if row is None:
+            raise self.does_not_exist(f"No {self.name} with id {key}.")
+        return row
+
+    async def get_many(self, keys: Sequence[int]) -> list[BaseModel]:
+        if len(keys) > MAX_LOOKUP_SIZE:
+            raise InvalidFilterError(
+                f"At most {MAX_LOOKUP_SIZE} keys can be looked up at once."
+            )
+        try:
+            return await self.cache.get_many(keys)
+        except psycopg.Error as e:
+            print(f"Error looking up {self.plural}: {e}")
+            raise self.database_error(f"Error looking up {self.plural}")
@@ -0,0 +1,175 @@
+from functools import cache, lru_cache
+from typing import Sequence
+from psycopg import sql
+from utils.fields import column_list
+
+# SQL shared by queries.repository and queries.bulk. Statements are built
+# as psycopg sql.Composed objects once per table (and per set of columns
+# where that varies) and then reused for every call, instead of being
+# assembled from strings on each request. Values are always bound as
+# named placeholders, %(column)s.
+
+# Distinct column sets seen by UPDATE and projected SELECT; in practice
+# a few per table, but they come from requests, so the caches are bounded.
+MAX_CACHED_STATEMENTS = 1024
+
+
+def match(pk: Sequence[str]) -> sql.Composed:
+    """pk_1 = %(pk_1)s AND pk_2 = %(pk_2)s ..."""
+    return sql.SQL(" AND ").join(
+        sql.SQL("{} = {}").format(sql.Identifier(column), sql.Placeholder(column))
+        for column in pk
+    )
+
+
+def key_in(pk: Sequence[str]) -> sql.Composed:
+    """
+    Matches any of a list of keys. Takes one array parameter per key
+    column (see key_params); composite keys are matched against unnest()
+    of the arrays.
+    """
+    if len(pk) == 1:
+        return sql.SQL("{} = ANY(%s)").format(sql.Identifier(pk[0]))
+    return sql.SQL("({columns}) IN (SELECT * FROM unnest({arrays}))").format(
+        columns=column_list(pk),
+        arrays=sql.SQL(", ").join(sql.SQL("%s::integer[]") for _ in pk),
+    )
+
+
+def key_params(pk: Sequence[str], keys: Sequence[tuple]) -> list[list]:
+    """The parameters of key_in() for a list of key tuples."""
+    return [[key[i] for key in keys] for i in range(len(pk))]
+
+
+@cache
+def insert(table: str, columns: tuple[str, ...]) -> sql.Composed:
+    return sql.SQL(
+        "INSERT INTO {table} ({columns}) VALUES ({values}) RETURNING *"
+    ).format(
+        table=sql.Identifier(table),
+        columns=column_list(columns),
+        values=sql.SQL(", ").join(map(sql.Placeholder, columns)),
+    )
+
+
+@lru_cache(maxsize=MAX_CACHED_STATEMENTS)
+def select(table: str, pk: tuple[str, ...], columns: tuple[str, ...]) -> sql.Composed:
+    return sql.SQL("SELECT {columns} FROM {table} WHERE {match}").format(
+        columns=column_list(columns),
+        table=sql.Identifier(table),
+        match=match(pk),
+    )
+
+
+@lru_cache(maxsize=MAX_CACHED_STATEMENTS)
+def select_in(
+    table: str, pk: tuple[str, ...], columns: tuple[str, ...]
+) -> sql.Composed:
+    return sql.SQL("SELECT {columns} FROM {table} WHERE {match} ORDER BY {pk}").format(
+        columns=column_list(columns),
+        table=sql.Identifier(table),
+        match=key_in(pk),
+        pk=column_list(pk),
+    )
+
+
+@cache
+def select_by(
+    table: str, column: str, pk: tuple[str, ...], columns: tuple[str, ...]
+) -> sql.Composed:
+    """The rows whose column is any of an array of values."""
+    return sql.SQL(
+        "SELECT {columns} FROM {table} WHERE {column} = ANY(%s) "
+        "ORDER BY {column}, {pk}"
+    ).format(
+        columns=column_list(columns),
+        table=sql.Identifier(table),
+        column=sql.Identifier(column),
+        pk=column_list(pk),
+    )
+
+
+@cache
+def select_through(
+    link: str, column: str, table: str, pk: tuple[str, ...], columns: tuple[str, ...]
+) -> sql.Composed:
+    """
+    The rows of table linked through link to any of an array of values of
+    link.column, each preceded by that value.
+    """
+    return sql.SQL(
+        "SELECT l.{column}, {columns} FROM {link} l JOIN {table} t USING ({pk}) "
+        "WHERE l.{column} = ANY(%s) ORDER BY l.{column}, {order}"
+    ).format(
+        column=sql.Identifier(column),
+        columns=sql.SQL(", ").join(
+            sql.SQL("t.{}").format(sql.Identifier(c)) for c in columns
+        ),
+        link=sql.Identifier(link),
+        table=sql.Identifier(table),
+        pk=column_list(pk),
+        order=sql.SQL(", ").join(sql.SQL("t.{}").format(sql.Identifier(c)) for c in pk),
+    )
+
+
+@lru_cache(maxsize=MAX_CACHED_STATEMENTS)
+def update(table: str, pk: tuple[str, ...], columns: tuple[str, ...]) -> sql.Composed:
+    """
+    columns are the columns to change; callers sort them so that the same
+    change always hits the same statement.
+    """
+    return sql.SQL("UPDATE {table} SET {assignments} WHERE {match} RETURNING *").format(
+        table=sql.Identifier(table),
+        assignments=sql.SQL(", ").join(
+            sql.SQL("{} = {}").format(sql.Identifier(column), sql.Placeholder(column))
+            for column in columns
+        ),
+        match=match(pk),
+    )
+
+
+@cache
+def delete(table: str, pk: tuple[str, ...]) -> sql.Composed:
+    return sql.SQL("DELETE FROM {table} WHERE {match}").format(
+        table=sql.Identifier(table), match=match(pk)
+    )
+
+
+@cache
+def export(table: str, pk: tuple[str, ...]) -> sql.Composed:
+    return sql.SQL("SELECT * FROM {table} ORDER BY {pk}").format(
+        table=sql.Identifier(table), pk=column_list(pk)
+    )
+
+
+def json_object(
+    alias: str, columns: Sequence[str], **nested: sql.Composable
+) -> sql.Composed:
+    """
+    json_build_object() of the given columns of the row alias, plus one
+    key per nested expression. Listing the columns keeps anything not on
+    the response model (users.hashed_password) out of the document.
+    """
+    pairs = [
+        (column, sql.SQL("{}.{}").format(sql.Identifier(alias), sql.Identifier(column)))
+        for column in columns
+    ]
+    pairs += nested.items()
+    return sql.SQL("json_build_object({})").format(
+        sql.SQL(", ").join(
+            sql.SQL("{}, {}").format(sql.Literal(key), value) for key, value in pairs
+        )
+    )
+
+
+def json_list(
+    item: sql.Composable, source: sql.Composable, order_by: sql.Composable
+) -> sql.Composed:
+    """
+    A scalar subquery aggregating item over source into a JSON array,
+    [] rather than NULL when source is empty.
+    """
+    return sql.SQL(
+        "COALESCE((SELECT json_agg({item} ORDER BY {order_by}) FROM {source}), "
+        "'[]'::json)"
+    ).format(item=item, order_by=order_by, source=source)
@@ -0,0 +1,194 @@
+import psycopg
+from datetime import datetime
+from typing import Optional
+from psycopg import sql
+from psycopg.rows import dict_row
+from queries.pool import pool
+from queries.relations import repositories
+from utils.exceptions import InvalidCursorError, SyncDatabaseError
+from utils.fields import column_list
+from utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, load_cursor
+
+# Delta sync (GET /api/sync, migrations 021 and 022). A sync token stands
+# for a time window [since, until): the page lists the rows of every
+# synced table with updated_at in the window, and the tombstones of the
+# rows deleted in it. until is set when a window is opened, to the start
+# of the oldest transaction still running, so that no write can later
+# commit into a window that was already read. Rows changed while a window
+# is being paged through fall into the next one.
+#
+# Tables are read one after the other, each one's deletions before its
+# upserts, so that a client applying a page's deletes before its upserts
+# ends up with a row that was deleted and re-created in the window.
+
+SYNC_TABLES = (
+    "countries",
+    "users",
+    "stages",
+    "forecast_categories",
+    "activity_types",
+    "accounts",
+    "contacts",
+    "opportunities",
+    "activities",
+    "opportunity_contacts",
+    "opportunity_owners",
+    "activity_users",
+    "activity_contacts",
+)
+
+PHASES = tuple((table, deletes) for table in SYNC_TABLES for deletes in (True, False))
+
+HORIZON = """--sql
+    SELECT least(now(), min(xact_start)) AS horizon
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+        AND backend_type = 'client backend'
+        AND pid <> pg_backend_pid();
+    """
+
+DELETES = """--sql
+    SELECT tombstone_id, key, deleted_at
+    FROM tombstones
+    WHERE table_name = %(table)s
+        AND deleted_at >= coalesce(%(since)s::timestamptz, '-infinity')
+        AND deleted_at < %(until)s
+        AND (deleted_at, tombstone_id) > (%(after_at)s::timestamptz, %(after_key)s)
+    ORDER BY deleted_at, tombstone_id
+    LIMIT %(limit)s;
+    """
+
+
+def _upserts(table: str, pk: tuple[str, ...], columns: tuple[str, ...]):
+    return sql.SQL(
+        """--sql
+        SELECT {columns}, updated_at
+        FROM {table}
+        WHERE updated_at >= coalesce(%(since)s::timestamptz, '-infinity')
+            AND updated_at < %(until)s
+            AND (updated_at, {pk}) > (%(after_at)s::timestamptz, {after_key})
+        ORDER BY updated_at, {pk}
+        LIMIT %(limit)s;
+        """
+    ).format(
+        columns=column_list(columns),
+        table=sql.Identifier(table),
+        pk=column_list(pk),
+        after_key=sql.SQL(", ").join(
+            sql.Placeholder(f"after_{column}") for column in pk
+        ),
+    )
+
+
+def _load_token(token: str) -> tuple:
+    """(since, until, phase, after) of a token; until is None for a new window."""
+    values = load_cursor(token)
+    try:
+        if len(values) == 1:
+            return datetime.fromisoformat(values[0]), None, 0, []
+        since, until, phase, *after = values
+        table, is_deletes = PHASES[phase]
+        width = 2 if is_deletes else 1 + len(repositories[table].pk)
+        if phase < 0 or len(after) not in (0, width):
+            raise ValueError
+        return (
+            since and datetime.fromisoformat(since),
+            datetime.fromisoformat(until),
+            phase,
+            after,
+        )
+    except (TypeError, ValueError, IndexError):
+        raise InvalidCursorError(f"Malformed sync token {token!r}.")
+
+
+class SyncQueries:
+    async def get_changes(
+        self, since: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        """
+        Up to limit upserts and deletes since the token (everything if
+        None). next_token continues the same window while has_more, and
+        once it is exhausted opens the next one.
+        """
+        start, until, phase, after = None, None, 0, []
+        if since:
+            start, until, phase, after = _load_token(since)
+        upserts, deletes = [], []
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    if until is None:
+                        await cur.execute(HORIZON)
+                        until = (await cur.fetchone())["horizon"]
+                    while phase < len(PHASES):
+                        table, is_deletes = PHASES[phase]
+                        remaining = limit - len(upserts) - len(deletes)
+                        if not remaining:
+                            break
+                        rows = await self._read(
+                            cur, table, is_deletes, start, until, after, remaining + 1
+                        )
+                        if is_deletes:
+                            deletes.extend(
+                                {"table": table, **row} for row in rows[:remaining]
+                            )
+                        else:
+                            upserts.extend(
+                                {"table": table, "row": row} for row in rows[:remaining]
+                            )
+                        if len(rows) > remaining:
+                            last = rows[remaining - 1]
+                            if is_deletes:
+                                after = [last["deleted_at"], last["tombstone_id"]]
+                            else:
+                                pk = repositories[table].pk
+                                after = [
+                                    last["updated_at"],
+                                    *(last[column] for column in pk),
+                                ]
+                            break
+                        phase, after = phase + 1, []
+        except psycopg.errors.DataError:
+            raise InvalidCursorError(f"Malformed sync token {since!r}.")
+        except psycopg.Error as e:
+            print(f"Error reading changes to sync: {e}")
+            raise SyncDatabaseError("Error reading changes to sync")
+        for delete in deletes:
+            del delete["tombstone_id"]
+        has_more = phase < len(PHASES)
+        return {
+            "upserts": upserts,
+            "deletes": deletes,
+            "next_token": encode_cursor(
+                [start, until, phase, *after] if has_more else [until]
+            ),
+            "has_more": has_more,
+        }
+
+    async def _read(
+        self,
+        cur,
+        table: str,
+        is_deletes: bool,
+        since: Optional[datetime],
+        until: datetime,
+        after: list,
+        limit: int,
+    ) -> list[dict]:
+        """A page of one phase; after is the last (timestamp, *key) read."""
+        params = {"table": table, "since": since, "until": until, "limit": limit}
+        if is_deletes:
+            query = DELETES
+            after_at, after_key = after or ["-infinity", 0]
+            params.update(after_at=after_at, after_key=after_key)
+        else:
+            repository = repositories[table]
+            query = _upserts(table, repository.pk, tuple(repository.model.model_fields))
+            values = after or ["-infinity", *([None] * len(repository.pk))]
+            params["after_at"] = values[0]
+            params.update(
+                (f"after_{column}", value)
+                for column, value in zip(repository.pk, values[1:])
+            )
+        await cur.execute(query, params)
+        return await cur.fetchall()
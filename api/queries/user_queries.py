@@ -1,169 +1,218 @@
-import os
+import asyncio
 import psycopg
-from typing import Optional, List
-from psycopg.rows import class_row
-from psycopg_pool import ConnectionPool
+from typing import Optional
+from psycopg import sql
+from psycopg.rows import dict_row
+from models.activity import ActivityStatus
 from models.user import User, UserCreate
+from queries.account_queries import AccountQueries
+from queries.activity_queries import ActivityQueries
+from queries.opportunity_queries import OpportunityQueries
+from queries.pool import pool
+from queries.relations import HasMany, Through
+from queries.repository import Repository
+from utils.pagination import DEFAULT_PAGE_SIZE
 from utils.exceptions import (
     UserDatabaseError,
     UserDoesNotExist,
     UserCreationError,
-    DatabaseURLException,
 )
 
-# Initialize Connection Pool
-database_url = os.environ.get("DATABASE_URL")
-if database_url is None:
-    raise DatabaseURLException(
-        "You forgot to define DATABASE_URL in your environment.",
+# The activity queues of GET /api/users/{user_id}/activities: the
+# condition on activities of each status, and the order it is listed in.
+# The open queues are read from the partial index of migration 018.
+ACTIVITY_QUEUES = {
+    ActivityStatus.overdue: (
+        sql.SQL("NOT completed AND due_date < CURRENT_DATE"),
+        "due_date",
+    ),
+    ActivityStatus.upcoming: (
+        sql.SQL("NOT completed AND due_date >= CURRENT_DATE"),
+        "due_date",
+    ),
+    ActivityStatus.completed: (sql.SQL("completed"), "-due_date"),
+}
+
+ASSIGNED = sql.SQL(
+    "activity_id IN (SELECT activity_id FROM activity_users WHERE user_id = %s)"
+)
+
+ACTIVITY_COUNT_COLUMNS = sql.SQL(", ").join(
+    sql.SQL("count(*) FILTER (WHERE {}) AS {}").format(
+        condition, sql.Identifier(status.value)
     )
+    for status, (condition, _) in ACTIVITY_QUEUES.items()
+)
 
-pool = ConnectionPool(database_url)
+ACTIVITY_COUNTS = sql.SQL(
+    """--sql
+    SELECT
+        EXISTS (SELECT 1 FROM users WHERE user_id = %(user_id)s) AS user_exists,
+        {counts}
+    FROM activity_users au
+    JOIN activities a ON a.activity_id = au.activity_id
+    WHERE au.user_id = %(user_id)s;
+    """
+).format(counts=ACTIVITY_COUNT_COLUMNS)
 
+# GET /api/users/{user_id}/dashboard (models.user_dashboard). Its lists
+# and counts are independent queries, run concurrently on connections of
+# their own so that the route takes as long as the slowest of them. That
+# is five pool connections per request (see queries.pool). If one query
+# fails, the others are cancelled so they give their connections back.
+DASHBOARD_LIST_SIZE = 10
 
-class UserQueries:
-    def get_all_users(self) -> List[User]:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(User)) as cur:
-                    cur.execute(
-                        """--sql
-                        SELECT * FROM users;
-                        """
-                    )
-                    users = cur.fetchall()
-                    return users
-        except psycopg.Error as e:
-            print(f"Error retrieving all users: {e}")
-            raise UserDatabaseError("Error retrieving all users")
 
-    def get_user(self, user_id: int) -> User:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(User)) as cur:
-                    cur.execute(
-                        """--sql
-                        SELECT * FROM users
-                        WHERE user_id = %s;
-                        """,
-                        (user_id,),
-                    )
-                    user = cur.fetchone()
-                    if user is None:
-                        raise UserDoesNotExist(f"No user with id {user_id}.")
-                    return user
-        except psycopg.Error as e:
-            print(f"Error retrieving user with id {user_id}: {e}")
-            raise UserDatabaseError(f"Error retrieving user with id {user_id}")
+async def _gather(*coroutines) -> list:
+    """asyncio.gather, but the first failure cancels the rest."""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-    def create_user(self, user: UserCreate) -> User:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(User)) as cur:
-                    cur.execute(
-                        """--sql
-                        INSERT INTO users (
-                            username,
-                            email,
-                            hashed_password,
-                            first_name,
-                            last_name
-                        )
-                        VALUES (
-                            %(username)s,
-                            %(email)s,
-                            %(hashed_password)s,
-                            %(first_name)s,
-                            %(last_name)s
-                        )
-                        RETURNING *;
-                        """,
-                        {
-                            "username": user.username,
-                            "email": user.email,
-                            "hashed_password": user.password,
-                            "first_name": user.first_name,
-                            "last_name": user.last_name,
-                        },
-                    )
-                    new_user = cur.fetchone()
-                    if new_user is None:
-                        raise UserCreationError("Error creating user")
-                    return new_user
 
-        except psycopg.Error as e:
-            print(f"Error creating user: {e}")
-            raise UserDatabaseError("Error creating user")
+OWNED_OPPORTUNITIES = sql.SQL(
+    "opportunity_id IN "
+    "(SELECT opportunity_id FROM opportunity_owners WHERE user_id = %s) "
+    "AND stage_id IN (SELECT stage_id FROM stages WHERE NOT is_closed)"
+)
+
+OWNED_ACCOUNTS = sql.SQL("account_owner_id = %s")
+
+DASHBOARD_COUNTS = sql.SQL(
+    """--sql
+    SELECT
+        (
+            SELECT count(*) FROM accounts WHERE account_owner_id = %(user_id)s
+        ) AS accounts,
+        o.open_opportunities,
+        o.open_pipeline_amount,
+        a.*
+    FROM (
+        SELECT
+            count(*) AS open_opportunities,
+            coalesce(sum(o.amount), 0) AS open_pipeline_amount
+        FROM opportunity_owners oo
+        JOIN opportunities o ON o.opportunity_id = oo.opportunity_id
+        JOIN stages s ON s.stage_id = o.stage_id
+        WHERE oo.user_id = %(user_id)s AND NOT s.is_closed
+    ) o, (
+        SELECT {counts}
+        FROM activity_users au
+        JOIN activities a ON a.activity_id = au.activity_id
+        WHERE au.user_id = %(user_id)s
+    ) a;
+    """
+).format(counts=ACTIVITY_COUNT_COLUMNS)
 
-    def delete_user(self, user_id: int) -> bool:
-        try:
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """--sql
-                        DELETE FROM users
-                        WHERE user_id = %s;
-                        """,
-                        (user_id,),
-                    )
-                    return cur.rowcount > 0
-        except psycopg.Error as e:
-            print(f"Error deleting user with id {user_id}: {e}")
-            raise UserDatabaseError(f"Error deleting user with id {user_id}")
 
-    def edit_user(
+class UserQueries(Repository):
+    table = "users"
+    pk = ("user_id",)
+    name = "user"
+    model = User
+    create_model = UserCreate
+    insert_columns = ("username", "email", "hashed_password", "first_name", "last_name")
+    database_error = UserDatabaseError
+    does_not_exist = UserDoesNotExist
+    creation_error = UserCreationError
+    relations = {
+        "accounts": HasMany("accounts", "account_owner_id"),
+        "opportunities": Through("opportunity_owners", "user_id", "opportunities"),
+        "activities": Through("activity_users", "user_id", "activities"),
+    }
+
+    def record(self, user: UserCreate) -> dict:
+        return {
+            "username": user.username,
+            "email": user.email,
+            "hashed_password": user.password,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        }
+
+    async def get_activities(
         self,
         user_id: int,
-        username: Optional[str] = None,
-        email: Optional[str] = None,
-        hashed_password: Optional[str] = None,
-        first_name: Optional[str] = None,
-        last_name: Optional[str] = None,
-    ) -> User:
+        status: ActivityStatus,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        filter: Optional[str] = None,
+        include: Optional[str] = None,
+    ) -> dict:
+        """
+        A page of the activities assigned to the user with the given
+        status, as ActivityQueries.get_all() returns it, plus the counts
+        of every status.
+        """
         try:
-            with pool.connection() as conn:
-                with conn.cursor(row_factory=class_row(User)) as cur:
-                    update_fields = []
-                    update_values = []
-
-                    if username:
-                        update_fields.append("username = %s")
-                        update_values.append(username)
-                    if email:
-                        update_fields.append("email = %s")
-                        update_values.append(email)
-                    if hashed_password:
-                        update_fields.append("hashed_password = %s")
-                        update_values.append(hashed_password)
-                    if first_name:
-                        update_fields.append("first_name = %s")
-                        update_values.append(first_name)
-                    if last_name:
-                        update_fields.append("last_name = %s")
-                        update_values.append(last_name)
-
-                    if not update_fields:
-                        raise ValueError("No fields provided for update.")
-
-                    update_values.append(user_id)
-                    sql = f"""--sql
-                        UPDATE users
-                        SET {', '.join(update_fields)}
-                        WHERE user_id = %s
-                        RETURNING *;
-                    """
-                    cur.execute(sql, update_values)
-
-                    updated_user = cur.fetchone()
-                    if not updated_user:
-                        raise UserDoesNotExist(
-                            f"User with id {user_id} does not exist."
-                        )
-                    return updated_user
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(ACTIVITY_COUNTS, {"user_id": user_id})
+                    counts = await cur.fetchone()
+        except psycopg.Error as e:
+            print(f"Error counting activities of user with id {user_id}: {e}")
+            raise UserDatabaseError(
+                f"Error counting activities of user with id {user_id}"
+            )
+        if not counts.pop("user_exists"):
+            raise UserDoesNotExist(f"No user with id {user_id}.")
+        condition, sort = ACTIVITY_QUEUES[status]
+        page = await ActivityQueries().get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            include=include,
+            within=(sql.SQL("{} AND {}").format(ASSIGNED, condition), [user_id]),
+        )
+        page["counts"] = counts
+        return page
 
+    async def get_dashboard(self, user_id: int) -> dict:
+        user, counts, opportunities, activities, accounts = await _gather(
+            self.get(user_id),
+            self._dashboard_counts(user_id),
+            OpportunityQueries().get_all(
+                limit=DASHBOARD_LIST_SIZE,
+                sort="close_date",
+                within=(OWNED_OPPORTUNITIES, [user_id]),
+            ),
+            ActivityQueries().get_all(
+                limit=DASHBOARD_LIST_SIZE,
+                sort="due_date",
+                within=(
+                    sql.SQL("{} AND NOT completed").format(ASSIGNED),
+                    [user_id],
+                ),
+            ),
+            AccountQueries().get_all(
+                limit=DASHBOARD_LIST_SIZE,
+                sort="account_name",
+                within=(OWNED_ACCOUNTS, [user_id]),
+            ),
+        )
+        return {
+            "user": user,
+            "counts": counts,
+            "opportunities": opportunities["items"],
+            "activities": activities["items"],
+            "accounts": accounts["items"],
+        }
+
+    async def _dashboard_counts(self, user_id: int) -> dict:
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(DASHBOARD_COUNTS, {"user_id": user_id})
+                    return await cur.fetchone()
         except psycopg.Error as e:
-            print(e)
-            raise UserDatabaseError(f"Could not update user {user_id}")
-        except ValueError as e:
-            print(e)
-            raise UserDatabaseError("No fields provided for update.")
+            print(f"Error counting the work of user with id {user_id}: {e}")
+            raise UserDatabaseError(
+                f"Error counting the work of user with id {user_id}"
+            )
@@ -1,4 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from queries.account_queries import (
     AccountQueries,
@@ -6,18 +15,58 @@ from queries.account_queries import (
     AccountDatabaseError,
     AccountCreationError,
 )
-from models.account import Account, AccountCreate
+from models.account import Account, AccountCreate, AccountRollup, AccountUpdate
+from models.account_full import AccountFull
+from models.bulk_import import ImportReport
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from queries.import_queries import ImportQueries
+from utils.exceptions import (
+    BulkImportDatabaseError,
+    BulkOperationError,
+    InvalidChangeError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    InvalidImportFileError,
+)
+from utils.fast_json import FastJSONResponse
+from utils.fields import sparse_model
+from utils.imports import ImportFormat, read_rows
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.streaming import ExportFormat, export_response
 
 router = APIRouter(tags=["Account"], prefix="/api/accounts")
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=Page[sparse_model(Account)],
+    response_class=FastJSONResponse,
+)
 async def get_all_accounts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
     queries: AccountQueries = Depends(),
-) -> list[Account]:
+) -> FastJSONResponse:
     try:
-        accounts = queries.get_all_accounts()
-        return accounts
+        accounts = await queries.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            ids=ids,
+            include=include,
+        )
+        return FastJSONResponse(accounts)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except AccountDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,11 +74,50 @@ async def get_all_accounts(
         )
 
 
-@router.get("/{account_id}")
-def get_account(account_id: int, queries: AccountQueries = Depends()) -> Account:
+@router.post(
+    "/lookup",
+    response_model=list[sparse_model(Account)],
+    response_class=FastJSONResponse,
+)
+async def lookup_accounts(
+    account_ids: list[int] = Body(),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: AccountQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        accounts = await queries.get_many(account_ids, fields=fields, include=include)
+        return FastJSONResponse(accounts)
+    except (InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AccountDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up accounts.")
+
+
+@router.get("/export")
+async def export_accounts(
+    format: ExportFormat = ExportFormat.ndjson,
+    queries: AccountQueries = Depends(),
+) -> StreamingResponse:
+    return export_response(queries.export(), format, "accounts")
+
+
+@router.get(
+    "/{account_id}",
+    response_model=sparse_model(Account),
+    response_class=FastJSONResponse,
+)
+async def get_account(
+    account_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: AccountQueries = Depends(),
+) -> FastJSONResponse:
     try:
-        account = queries.get_account(account_id)
-        return account
+        account = await queries.get(account_id, fields=fields, include=include)
+        return FastJSONResponse(account)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except AccountDoesNotExist:
         raise HTTPException(status_code=404, detail="Account not found")
     except AccountDatabaseError:
@@ -39,12 +127,82 @@ def get_account(account_id: int, queries: AccountQueries = Depends()) -> Account
         )
 
 
+@router.get("/{account_id}/full", response_model=AccountFull)
+async def get_account_full(
+    account_id: int,
+    queries: AccountQueries = Depends(),
+) -> Response:
+    try:
+        account = await queries.get_full(account_id)
+        return Response(content=account, media_type="application/json")
+    except AccountDoesNotExist:
+        raise HTTPException(status_code=404, detail="Account not found")
+    except AccountDatabaseError:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve account.",
+        )
+
+
+@router.get(
+    "/{account_id}/subtree",
+    response_model=Page[sparse_model(Account)],
+    response_class=FastJSONResponse,
+)
+async def get_account_subtree(
+    account_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: AccountQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        accounts = await queries.get_subtree(
+            account_id,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            include=include,
+        )
+        return FastJSONResponse(accounts)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AccountDoesNotExist:
+        raise HTTPException(status_code=404, detail="Account not found")
+    except AccountDatabaseError:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve accounts.",
+        )
+
+
+@router.get("/{account_id}/rollup")
+async def get_account_rollup(
+    account_id: int,
+    queries: AccountQueries = Depends(),
+) -> AccountRollup:
+    try:
+        return await queries.get_rollup(account_id)
+    except AccountDoesNotExist:
+        raise HTTPException(status_code=404, detail="Account not found")
+    except AccountDatabaseError:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to roll up account.",
+        )
+
+
 @router.post("/")
-def create_account(
+async def create_account(
     account: AccountCreate, queries: AccountQueries = Depends()
 ) -> Account:
     try:
-        new_account = queries.create_account(account)
+        new_account = await queries.create(account)
         return new_account
     except AccountCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -52,13 +210,72 @@ def create_account(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/import")
+async def import_accounts(
+    file: UploadFile,
+    format: ImportFormat = ImportFormat.csv,
+    all_or_nothing: bool = False,
+    queries: ImportQueries = Depends(),
+) -> ImportReport:
+    try:
+        return await queries.import_rows(
+            "accounts", read_rows(file.file, format), all_or_nothing
+        )
+    except InvalidImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BulkImportDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bulk")
+async def create_accounts(
+    accounts: list[AccountCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: AccountQueries = Depends(),
+) -> BulkResult[Account]:
+    try:
+        return await queries.create_many(accounts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AccountDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_accounts(
+    accounts: list[AccountUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: AccountQueries = Depends(),
+) -> BulkResult[Account]:
+    try:
+        return await queries.edit_many(accounts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AccountDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_accounts(
+    account_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: AccountQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(account_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AccountDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{account_id}")
-def delete_account(
+async def delete_account(
     account_id: int,
     queries: AccountQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_account(account_id)
+        success = await queries.delete(account_id)
         if not success:
             raise AccountDoesNotExist(
                 f"Account with id {account_id} does not exist.",
@@ -71,8 +288,9 @@ def delete_account(
 
 
 @router.put("/{account_id}")
-def update_account(
+async def update_account(
     account_id: int,
+    parent_account_id: Optional[int] = None,
     account_name: Optional[str] = None,
     website: Optional[str] = None,
     type: Optional[str] = None,
@@ -95,8 +313,9 @@ def update_account(
     queries: AccountQueries = Depends(),
 ) -> Account:
     try:
-        updated_account = queries.edit_account(
-            account_id=account_id,
+        updated_account = await queries.edit(
+            account_id,
+            parent_account_id=parent_account_id,
             account_name=account_name,
             website=website,
             type=type,
@@ -118,6 +337,8 @@ def update_account(
             account_owner_id=account_owner_id,
         )
         return updated_account
+    except InvalidChangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except AccountDoesNotExist:
         raise HTTPException(status_code=404, detail="Account not found.")
     except AccountDatabaseError:
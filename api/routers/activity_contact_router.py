@@ -1,33 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from queries.activity_contact_queries import (
     ActivityContactQueries,
     ActivityContactDoesNotExist,
     ActivityContactDatabaseError,
 )
 from models.activity_contact import ActivityContact
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["Activity Contact"], prefix="/api/activity-contacts")
 
 
 @router.get("/")
 async def get_all_activity_contacts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: ActivityContactQueries = Depends(),
-) -> list[ActivityContact]:
+) -> Page[ActivityContact]:
     try:
-        activity_contacts = queries.get_all_activity_contacts()
+        activity_contacts = await queries.get_all(
+            limit=limit, cursor=cursor, filter=filter, sort=sort, ids=ids
+        )
         return activity_contacts
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ActivityContactDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve activity contacts."
         )
 
 
+@router.post("/lookup")
+async def lookup_activity_contacts(
+    activity_contacts: list[ActivityContact],
+    queries: ActivityContactQueries = Depends(),
+) -> list[ActivityContact]:
+    try:
+        return await queries.get_many(activity_contacts)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityContactDatabaseError:
+        raise HTTPException(
+            status_code=500, detail="Failed to look up activity contacts."
+        )
+
+
 @router.get("/{activity_id}/{contact_id}")
-def get_activity_contact(
+async def get_activity_contact(
     activity_id: int, contact_id: int, queries: ActivityContactQueries = Depends()
 ) -> ActivityContact:
     try:
-        activity_contact = queries.get_activity_contact(
+        activity_contact = await queries.get(
             activity_id,
             contact_id,
         )
@@ -44,27 +77,54 @@ def get_activity_contact(
 
 
 @router.post("/")
-def create_activity_contact(
+async def create_activity_contact(
     activity_id: int, contact_id: int, queries: ActivityContactQueries = Depends()
 ) -> ActivityContact:
     try:
-        new_activity_contact = queries.create_activity_contact(
-            activity_id,
-            contact_id,
+        new_activity_contact = await queries.create(
+            ActivityContact(activity_id=activity_id, contact_id=contact_id)
         )
         return new_activity_contact
     except ActivityContactDatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_activity_contacts(
+    activity_contacts: list[ActivityContact],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityContactQueries = Depends(),
+) -> BulkResult[ActivityContact]:
+    try:
+        return await queries.create_many(activity_contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_activity_contacts(
+    activity_contacts: list[ActivityContact],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityContactQueries = Depends(),
+) -> BulkDeleteResult[ActivityContact]:
+    try:
+        return await queries.delete_many(activity_contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{activity_id}/{contact_id}")
-def delete_activity_contact(
+async def delete_activity_contact(
     activity_id: int,
     contact_id: int,
     queries: ActivityContactQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_activity_contact(activity_id, contact_id)
+        success = await queries.delete(activity_id, contact_id)
         if not success:
             raise ActivityContactDoesNotExist(
                 f"Activity contact with activity {activity_id} and contact {contact_id} does not exist."
@@ -83,13 +143,13 @@ def delete_activity_contact(
 
 
 @router.put("/{activity_id}/{contact_id}")
-def update_activity_contact(
+async def update_activity_contact(
     activity_id: int, contact_id: int, queries: ActivityContactQueries = Depends()
 ) -> ActivityContact:
     try:
-        updated_activity_contact = queries.edit_activity_contact(
-            activity_id=activity_id,
-            contact_id=contact_id,
+        updated_activity_contact = await queries.edit(
+            activity_id,
+            contact_id,
         )
         return updated_activity_contact
     except ActivityContactDoesNotExist:
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from queries.activity_queries import (
     ActivityQueries,
@@ -6,18 +7,51 @@ from queries.activity_queries import (
     ActivityDatabaseError,
     ActivityCreationError,
 )
-from models.activity import Activity, ActivityCreate
+from models.activity import Activity, ActivityCreate, ActivityUpdate
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+)
+from utils.fast_json import FastJSONResponse
+from utils.fields import sparse_model
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.streaming import ExportFormat, export_response
 
 router = APIRouter(tags=["Activity"], prefix="/api/activities")
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=Page[sparse_model(Activity)],
+    response_class=FastJSONResponse,
+)
 async def get_all_activities(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
     queries: ActivityQueries = Depends(),
-) -> list[Activity]:
+) -> FastJSONResponse:
     try:
-        activities = queries.get_all_activities()
-        return activities
+        activities = await queries.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            ids=ids,
+            include=include,
+        )
+        return FastJSONResponse(activities)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ActivityDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,11 +59,52 @@ async def get_all_activities(
         )
 
 
-@router.get("/{activity_id}")
-def get_activity(activity_id: int, queries: ActivityQueries = Depends()) -> Activity:
+@router.post(
+    "/lookup",
+    response_model=list[sparse_model(Activity)],
+    response_class=FastJSONResponse,
+)
+async def lookup_activities(
+    activity_ids: list[int] = Body(),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: ActivityQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        activities = await queries.get_many(
+            activity_ids, fields=fields, include=include
+        )
+        return FastJSONResponse(activities)
+    except (InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up activities.")
+
+
+@router.get("/export")
+async def export_activities(
+    format: ExportFormat = ExportFormat.ndjson,
+    queries: ActivityQueries = Depends(),
+) -> StreamingResponse:
+    return export_response(queries.export(), format, "activities")
+
+
+@router.get(
+    "/{activity_id}",
+    response_model=sparse_model(Activity),
+    response_class=FastJSONResponse,
+)
+async def get_activity(
+    activity_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: ActivityQueries = Depends(),
+) -> FastJSONResponse:
     try:
-        activity = queries.get_activity(activity_id)
-        return activity
+        activity = await queries.get(activity_id, fields=fields, include=include)
+        return FastJSONResponse(activity)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ActivityDoesNotExist:
         raise HTTPException(status_code=404, detail="Activity not found")
     except ActivityDatabaseError:
@@ -40,11 +115,11 @@ def get_activity(activity_id: int, queries: ActivityQueries = Depends()) -> Acti
 
 
 @router.post("/")
-def create_activity(
+async def create_activity(
     activity: ActivityCreate, queries: ActivityQueries = Depends()
 ) -> Activity:
     try:
-        new_activity = queries.create_activity(activity)
+        new_activity = await queries.create(activity)
         return new_activity
     except ActivityCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -52,13 +127,55 @@ def create_activity(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_activities(
+    activities: list[ActivityCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityQueries = Depends(),
+) -> BulkResult[Activity]:
+    try:
+        return await queries.create_many(activities, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_activities(
+    activities: list[ActivityUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityQueries = Depends(),
+) -> BulkResult[Activity]:
+    try:
+        return await queries.edit_many(activities, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_activities(
+    activity_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(activity_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{activity_id}")
-def delete_activity(
+async def delete_activity(
     activity_id: int,
     queries: ActivityQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_activity(activity_id)
+        success = await queries.delete(activity_id)
         if not success:
             raise ActivityDoesNotExist(
                 f"Activity with id {activity_id} does not exist."
@@ -71,7 +188,7 @@ def delete_activity(
 
 
 @router.put("/{activity_id}")
-def update_activity(
+async def update_activity(
     activity_id: int,
     activity_type_id: Optional[int] = None,
     opportunity_id: Optional[int] = None,
@@ -81,8 +198,8 @@ def update_activity(
     queries: ActivityQueries = Depends(),
 ) -> Activity:
     try:
-        updated_activity = queries.edit_activity(
-            activity_id=activity_id,
+        updated_activity = await queries.edit(
+            activity_id,
             activity_type_id=activity_type_id,
             opportunity_id=opportunity_id,
             description=description,
@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from typing import Optional
 from queries.activity_type_queries import (
     ActivityTypeQueries,
@@ -6,31 +14,63 @@ from queries.activity_type_queries import (
     ActivityTypeDatabaseError,
     ActivityTypeCreationError,
 )
-from models.activity_type import ActivityType, ActivityTypeCreate
+from models.activity_type import ActivityType, ActivityTypeCreate, ActivityTypeUpdate
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.etag import check_etag
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["Activity Type"], prefix="/api/activity-types")
 
 
 @router.get("/")
 async def get_all_activity_types(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: ActivityTypeQueries = Depends(),
-) -> list[ActivityType]:
+) -> Page[ActivityType]:
     try:
-        activity_types = queries.get_all_activity_types()
-        return activity_types
+        activity_types = await queries.get_all(limit=limit, cursor=cursor, ids=ids)
+        return check_etag(request, response, activity_types) or activity_types
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ActivityTypeDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve activity types."
         )
 
 
+@router.post("/lookup")
+async def lookup_activity_types(
+    activity_type_ids: list[int] = Body(),
+    queries: ActivityTypeQueries = Depends(),
+) -> list[ActivityType]:
+    try:
+        return await queries.get_many(activity_type_ids)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityTypeDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up activity types.")
+
+
 @router.get("/{activity_type_id}")
-def get_activity_type(
-    activity_type_id: int, queries: ActivityTypeQueries = Depends()
+async def get_activity_type(
+    activity_type_id: int,
+    request: Request,
+    response: Response,
+    queries: ActivityTypeQueries = Depends(),
 ) -> ActivityType:
     try:
-        activity_type = queries.get_activity_type(activity_type_id)
-        return activity_type
+        activity_type = await queries.get(activity_type_id)
+        return check_etag(request, response, activity_type) or activity_type
     except ActivityTypeDoesNotExist:
         raise HTTPException(status_code=404, detail="Activity type not found")
     except ActivityTypeDatabaseError:
@@ -41,11 +81,11 @@ def get_activity_type(
 
 
 @router.post("/")
-def create_activity_type(
+async def create_activity_type(
     activity_type: ActivityTypeCreate, queries: ActivityTypeQueries = Depends()
 ) -> ActivityType:
     try:
-        new_activity_type = queries.create_activity_type(activity_type)
+        new_activity_type = await queries.create(activity_type)
         return new_activity_type
     except ActivityTypeCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -53,13 +93,55 @@ def create_activity_type(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_activity_types(
+    activity_types: list[ActivityTypeCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityTypeQueries = Depends(),
+) -> BulkResult[ActivityType]:
+    try:
+        return await queries.create_many(activity_types, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityTypeDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_activity_types(
+    activity_types: list[ActivityTypeUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityTypeQueries = Depends(),
+) -> BulkResult[ActivityType]:
+    try:
+        return await queries.edit_many(activity_types, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityTypeDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_activity_types(
+    activity_type_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityTypeQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(activity_type_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityTypeDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{activity_type_id}")
-def delete_activity_type(
+async def delete_activity_type(
     activity_type_id: int,
     queries: ActivityTypeQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_activity_type(activity_type_id)
+        success = await queries.delete(activity_type_id)
         if not success:
             raise ActivityTypeDoesNotExist(
                 f"Activity type with id {activity_type_id} does not exist."
@@ -75,15 +157,15 @@ def delete_activity_type(
 
 
 @router.put("/{activity_type_id}")
-def update_activity_type(
+async def update_activity_type(
     activity_type_id: int,
     type_name: Optional[str] = None,
     description: Optional[str] = None,
     queries: ActivityTypeQueries = Depends(),
 ) -> ActivityType:
     try:
-        updated_activity_type = queries.edit_activity_type(
-            activity_type_id=activity_type_id,
+        updated_activity_type = await queries.edit(
+            activity_type_id,
             type_name=type_name,
             description=description,
         )
@@ -1,33 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from queries.activity_user_queries import (
     ActivityUserQueries,
     ActivityUserDoesNotExist,
     ActivityUserDatabaseError,
 )
 from models.activity_user import ActivityUser
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["Activity User"], prefix="/api/activity-users")
 
 
 @router.get("/")
 async def get_all_activity_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: ActivityUserQueries = Depends(),
-) -> list[ActivityUser]:
+) -> Page[ActivityUser]:
     try:
-        activity_users = queries.get_all_activity_users()
+        activity_users = await queries.get_all(
+            limit=limit, cursor=cursor, filter=filter, sort=sort, ids=ids
+        )
         return activity_users
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ActivityUserDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve activity users."
         )
 
 
+@router.post("/lookup")
+async def lookup_activity_users(
+    activity_users: list[ActivityUser],
+    queries: ActivityUserQueries = Depends(),
+) -> list[ActivityUser]:
+    try:
+        return await queries.get_many(activity_users)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityUserDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up activity users.")
+
+
 @router.get("/{activity_id}/{user_id}")
-def get_activity_user(
+async def get_activity_user(
     activity_id: int, user_id: int, queries: ActivityUserQueries = Depends()
 ) -> ActivityUser:
     try:
-        activity_user = queries.get_activity_user(activity_id, user_id)
+        activity_user = await queries.get(activity_id, user_id)
         return activity_user
     except ActivityUserDoesNotExist:
         raise HTTPException(status_code=404, detail="Activity user not found")
@@ -39,24 +70,54 @@ def get_activity_user(
 
 
 @router.post("/")
-def create_activity_user(
+async def create_activity_user(
     activity_id: int, user_id: int, queries: ActivityUserQueries = Depends()
 ) -> ActivityUser:
     try:
-        new_activity_user = queries.create_activity_user(activity_id, user_id)
+        new_activity_user = await queries.create(
+            ActivityUser(activity_id=activity_id, user_id=user_id)
+        )
         return new_activity_user
     except ActivityUserDatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_activity_users(
+    activity_users: list[ActivityUser],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityUserQueries = Depends(),
+) -> BulkResult[ActivityUser]:
+    try:
+        return await queries.create_many(activity_users, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityUserDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_activity_users(
+    activity_users: list[ActivityUser],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ActivityUserQueries = Depends(),
+) -> BulkDeleteResult[ActivityUser]:
+    try:
+        return await queries.delete_many(activity_users, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ActivityUserDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{activity_id}/{user_id}")
-def delete_activity_user(
+async def delete_activity_user(
     activity_id: int,
     user_id: int,
     queries: ActivityUserQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_activity_user(activity_id, user_id)
+        success = await queries.delete(activity_id, user_id)
         if not success:
             raise ActivityUserDoesNotExist(
                 f"Activity user with activity {activity_id} and user {user_id} does not exist."
@@ -72,13 +133,13 @@ def delete_activity_user(
 
 
 @router.put("/{activity_id}/{user_id}")
-def update_activity_user(
+async def update_activity_user(
     activity_id: int, user_id: int, queries: ActivityUserQueries = Depends()
 ) -> ActivityUser:
     try:
-        updated_activity_user = queries.edit_activity_user(
-            activity_id=activity_id,
-            user_id=user_id,
+        updated_activity_user = await queries.edit(
+            activity_id,
+            user_id,
         )
         return updated_activity_user
     except ActivityUserDoesNotExist:
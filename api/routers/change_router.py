@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from queries import change_stream
+from queries.change_queries import ChangeQueries
+from models.change import ChangeFeed
+from utils.exceptions import (
+    ChangeDatabaseError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.streaming import sse_response
+
+router = APIRouter(tags=["Change"], prefix="/api/changes")
+
+
+@router.get("/")
+async def get_changes(
+    after: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    queries: ChangeQueries = Depends(),
+) -> ChangeFeed:
+    try:
+        return await queries.get_changes(after=after, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ChangeDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to retrieve changes.")
+
+
+@router.get("/stream")
+async def stream_changes(
+    tables: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+) -> StreamingResponse:
+    try:
+        events = await change_stream.subscribe(
+            change_stream.parse_tables(tables), owner_id, last_event_id
+        )
+        return sse_response(events)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ChangeDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to stream changes.")
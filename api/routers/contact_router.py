@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from queries.contact_queries import (
     ContactQueries,
@@ -6,18 +7,56 @@ from queries.contact_queries import (
     ContactDatabaseError,
     ContactCreationError,
 )
-from models.contact import Contact, ContactCreate
+from models.contact import Contact, ContactCreate, ContactUpdate
+from models.bulk_import import ImportReport
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from queries.import_queries import ImportQueries
+from utils.exceptions import (
+    BulkImportDatabaseError,
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    InvalidImportFileError,
+)
+from utils.fast_json import FastJSONResponse
+from utils.fields import sparse_model
+from utils.imports import ImportFormat, read_rows
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.streaming import ExportFormat, export_response
 
 router = APIRouter(tags=["Contact"], prefix="/api/contacts")
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=Page[sparse_model(Contact)],
+    response_class=FastJSONResponse,
+)
 async def get_all_contacts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
     queries: ContactQueries = Depends(),
-) -> list[Contact]:
+) -> FastJSONResponse:
     try:
-        contacts = queries.get_all_contacts()
-        return contacts
+        contacts = await queries.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            ids=ids,
+            include=include,
+        )
+        return FastJSONResponse(contacts)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ContactDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,11 +64,50 @@ async def get_all_contacts(
         )
 
 
-@router.get("/{contact_id}")
-def get_contact(contact_id: int, queries: ContactQueries = Depends()) -> Contact:
+@router.post(
+    "/lookup",
+    response_model=list[sparse_model(Contact)],
+    response_class=FastJSONResponse,
+)
+async def lookup_contacts(
+    contact_ids: list[int] = Body(),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: ContactQueries = Depends(),
+) -> FastJSONResponse:
     try:
-        contact = queries.get_contact(contact_id)
-        return contact
+        contacts = await queries.get_many(contact_ids, fields=fields, include=include)
+        return FastJSONResponse(contacts)
+    except (InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ContactDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up contacts.")
+
+
+@router.get("/export")
+async def export_contacts(
+    format: ExportFormat = ExportFormat.ndjson,
+    queries: ContactQueries = Depends(),
+) -> StreamingResponse:
+    return export_response(queries.export(), format, "contacts")
+
+
+@router.get(
+    "/{contact_id}",
+    response_model=sparse_model(Contact),
+    response_class=FastJSONResponse,
+)
+async def get_contact(
+    contact_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: ContactQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        contact = await queries.get(contact_id, fields=fields, include=include)
+        return FastJSONResponse(contact)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ContactDoesNotExist:
         raise HTTPException(status_code=404, detail="Contact not found")
     except ContactDatabaseError:
@@ -40,11 +118,11 @@ def get_contact(contact_id: int, queries: ContactQueries = Depends()) -> Contact
 
 
 @router.post("/")
-def create_contact(
+async def create_contact(
     contact: ContactCreate, queries: ContactQueries = Depends()
 ) -> Contact:
     try:
-        new_contact = queries.create_contact(contact)
+        new_contact = await queries.create(contact)
         return new_contact
     except ContactCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -52,13 +130,72 @@ def create_contact(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/import")
+async def import_contacts(
+    file: UploadFile,
+    format: ImportFormat = ImportFormat.csv,
+    all_or_nothing: bool = False,
+    queries: ImportQueries = Depends(),
+) -> ImportReport:
+    try:
+        return await queries.import_rows(
+            "contacts", read_rows(file.file, format), all_or_nothing
+        )
+    except InvalidImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BulkImportDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bulk")
+async def create_contacts(
+    contacts: list[ContactCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ContactQueries = Depends(),
+) -> BulkResult[Contact]:
+    try:
+        return await queries.create_many(contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_contacts(
+    contacts: list[ContactUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ContactQueries = Depends(),
+) -> BulkResult[Contact]:
+    try:
+        return await queries.edit_many(contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_contacts(
+    contact_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ContactQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(contact_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{contact_id}")
-def delete_contact(
+async def delete_contact(
     contact_id: int,
     queries: ContactQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_contact(contact_id)
+        success = await queries.delete(contact_id)
         if not success:
             raise ContactDoesNotExist(
                 f"Contact with id {contact_id} does not exist.",
@@ -71,7 +208,7 @@ def delete_contact(
 
 
 @router.put("/{contact_id}")
-def update_contact(
+async def update_contact(
     contact_id: int,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
@@ -89,8 +226,8 @@ def update_contact(
     queries: ContactQueries = Depends(),
 ) -> Contact:
     try:
-        updated_contact = queries.edit_contact(
-            contact_id=contact_id,
+        updated_contact = await queries.edit(
+            contact_id,
             first_name=first_name,
             last_name=last_name,
             title=title,
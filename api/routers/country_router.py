@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from typing import Optional
 from queries.country_queries import (
     CountryQueries,
@@ -6,18 +14,34 @@ from queries.country_queries import (
     CountryDatabaseError,
     CountryCreationError,
 )
-from models.country import Country, CountryCreate
+from models.country import Country, CountryCreate, CountryUpdate
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.etag import check_etag
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["Country"], prefix="/api/countries")
 
 
 @router.get("/")
 async def get_all_countries(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: CountryQueries = Depends(),
-) -> list[Country]:
+) -> Page[Country]:
     try:
-        countries = queries.get_all_countries()
-        return countries
+        countries = await queries.get_all(limit=limit, cursor=cursor, ids=ids)
+        return check_etag(request, response, countries) or countries
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except CountryDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,11 +49,29 @@ async def get_all_countries(
         )
 
 
+@router.post("/lookup")
+async def lookup_countries(
+    country_ids: list[int] = Body(),
+    queries: CountryQueries = Depends(),
+) -> list[Country]:
+    try:
+        return await queries.get_many(country_ids)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CountryDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up countries.")
+
+
 @router.get("/{country_id}")
-def get_country(country_id: int, queries: CountryQueries = Depends()) -> Country:
+async def get_country(
+    country_id: int,
+    request: Request,
+    response: Response,
+    queries: CountryQueries = Depends(),
+) -> Country:
     try:
-        country = queries.get_country(country_id)
-        return country
+        country = await queries.get(country_id)
+        return check_etag(request, response, country) or country
     except CountryDoesNotExist:
         raise HTTPException(status_code=404, detail="Country not found")
     except CountryDatabaseError:
@@ -40,11 +82,11 @@ def get_country(country_id: int, queries: CountryQueries = Depends()) -> Country
 
 
 @router.post("/")
-def create_country(
+async def create_country(
     country: CountryCreate, queries: CountryQueries = Depends()
 ) -> Country:
     try:
-        new_country = queries.create_country(country)
+        new_country = await queries.create(country)
         return new_country
     except CountryCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -52,13 +94,55 @@ def create_country(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_countries(
+    countries: list[CountryCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: CountryQueries = Depends(),
+) -> BulkResult[Country]:
+    try:
+        return await queries.create_many(countries, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CountryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_countries(
+    countries: list[CountryUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: CountryQueries = Depends(),
+) -> BulkResult[Country]:
+    try:
+        return await queries.edit_many(countries, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CountryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_countries(
+    country_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: CountryQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(country_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CountryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{country_id}")
-def delete_country(
+async def delete_country(
     country_id: int,
     queries: CountryQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_country(country_id)
+        success = await queries.delete(country_id)
         if not success:
             raise CountryDoesNotExist(
                 f"Country with id {country_id} does not exist.",
@@ -71,15 +155,15 @@ def delete_country(
 
 
 @router.put("/{country_id}")
-def update_country(
+async def update_country(
     country_id: int,
     country_name: Optional[str] = None,
     country_code: Optional[str] = None,
     queries: CountryQueries = Depends(),
 ) -> Country:
     try:
-        updated_country = queries.edit_country(
-            country_id=country_id,
+        updated_country = await queries.edit(
+            country_id,
             country_name=country_name,
             country_code=country_code,
         )
@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from typing import Optional
 from queries.forecast_category_queries import (
     ForecastCategoryQueries,
@@ -6,7 +14,20 @@ from queries.forecast_category_queries import (
     ForecastCategoryDatabaseError,
     ForecastCategoryCreationError,
 )
-from models.forecast_category import ForecastCategory, ForecastCategoryCreate
+from models.forecast_category import (
+    ForecastCategory,
+    ForecastCategoryCreate,
+    ForecastCategoryUpdate,
+)
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.etag import check_etag
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     tags=["Forecast Category"],
@@ -16,24 +37,49 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all_forecast_categories(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: ForecastCategoryQueries = Depends(),
-) -> list[ForecastCategory]:
+) -> Page[ForecastCategory]:
     try:
-        forecast_categories = queries.get_all_forecast_categories()
-        return forecast_categories
+        forecast_categories = await queries.get_all(limit=limit, cursor=cursor, ids=ids)
+        return check_etag(request, response, forecast_categories) or forecast_categories
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ForecastCategoryDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve forecast categories."
         )
 
 
+@router.post("/lookup")
+async def lookup_forecast_categories(
+    forecast_category_ids: list[int] = Body(),
+    queries: ForecastCategoryQueries = Depends(),
+) -> list[ForecastCategory]:
+    try:
+        return await queries.get_many(forecast_category_ids)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ForecastCategoryDatabaseError:
+        raise HTTPException(
+            status_code=500, detail="Failed to look up forecast categories."
+        )
+
+
 @router.get("/{forecast_category_id}")
-def get_forecast_category(
-    forecast_category_id: int, queries: ForecastCategoryQueries = Depends()
+async def get_forecast_category(
+    forecast_category_id: int,
+    request: Request,
+    response: Response,
+    queries: ForecastCategoryQueries = Depends(),
 ) -> ForecastCategory:
     try:
-        forecast_category = queries.get_forecast_category(forecast_category_id)
-        return forecast_category
+        forecast_category = await queries.get(forecast_category_id)
+        return check_etag(request, response, forecast_category) or forecast_category
     except ForecastCategoryDoesNotExist:
         raise HTTPException(
             status_code=404,
@@ -46,12 +92,12 @@ def get_forecast_category(
 
 
 @router.post("/")
-def create_forecast_category(
+async def create_forecast_category(
     forecast_category: ForecastCategoryCreate,
     queries: ForecastCategoryQueries = Depends(),
 ) -> ForecastCategory:
     try:
-        new_forecast_category = queries.create_forecast_category(
+        new_forecast_category = await queries.create(
             forecast_category,
         )
         return new_forecast_category
@@ -61,13 +107,55 @@ def create_forecast_category(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_forecast_categories(
+    forecast_categories: list[ForecastCategoryCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ForecastCategoryQueries = Depends(),
+) -> BulkResult[ForecastCategory]:
+    try:
+        return await queries.create_many(forecast_categories, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ForecastCategoryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_forecast_categories(
+    forecast_categories: list[ForecastCategoryUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ForecastCategoryQueries = Depends(),
+) -> BulkResult[ForecastCategory]:
+    try:
+        return await queries.edit_many(forecast_categories, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ForecastCategoryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_forecast_categories(
+    forecast_category_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: ForecastCategoryQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(forecast_category_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ForecastCategoryDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{forecast_category_id}")
-def delete_forecast_category(
+async def delete_forecast_category(
     forecast_category_id: int,
     queries: ForecastCategoryQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_forecast_category(forecast_category_id)
+        success = await queries.delete(forecast_category_id)
         if not success:
             raise ForecastCategoryDoesNotExist(
                 f"Forecast category {forecast_category_id} does not exist."
@@ -86,15 +174,15 @@ def delete_forecast_category(
 
 
 @router.put("/{forecast_category_id}")
-def update_forecast_category(
+async def update_forecast_category(
     forecast_category_id: int,
     category_name: Optional[str] = None,
     description: Optional[str] = None,
     queries: ForecastCategoryQueries = Depends(),
 ) -> ForecastCategory:
     try:
-        updated_forecast_category = queries.edit_forecast_category(
-            forecast_category_id=forecast_category_id,
+        updated_forecast_category = await queries.edit(
+            forecast_category_id,
             category_name=category_name,
             description=description,
         )
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from queries.job_queries import MAX_IMPORT_JOB_SIZE, JobQueries
+from models.job import ImportJob, Job, JobCreate, JobKind
+from utils.exceptions import InvalidJobError, JobDatabaseError, JobDoesNotExist
+from utils.imports import ImportFormat
+
+router = APIRouter(tags=["Job"], prefix="/api/jobs")
+
+
+@router.post("/", status_code=202)
+async def create_job(job: JobCreate, queries: JobQueries = Depends()) -> Job:
+    try:
+        return await queries.create(job)
+    except InvalidJobError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# The file is stored in the job until it runs, so its size is capped at
+# MAX_IMPORT_JOB_SIZE bytes (20 MiB by default); larger files get a 413.
+@router.post("/import", status_code=202)
+async def create_import_job(
+    file: UploadFile,
+    table: str,
+    format: ImportFormat = ImportFormat.csv,
+    all_or_nothing: bool = False,
+    queries: JobQueries = Depends(),
+) -> Job:
+    data = await file.read(MAX_IMPORT_JOB_SIZE + 1)
+    if len(data) > MAX_IMPORT_JOB_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Import jobs take files of up to {MAX_IMPORT_JOB_SIZE} bytes.",
+        )
+    try:
+        content = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The file is not UTF-8.")
+    payload = ImportJob.model_construct(
+        table=table, format=format, content=content, all_or_nothing=all_or_nothing
+    )
+    try:
+        return await queries.create(
+            JobCreate(kind=JobKind.import_rows, payload=payload.model_dump())
+        )
+    except InvalidJobError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, queries: JobQueries = Depends()) -> Job:
+    try:
+        return await queries.get(job_id)
+    except JobDoesNotExist:
+        raise HTTPException(status_code=404, detail="Job not found")
+    except JobDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to retrieve job.")
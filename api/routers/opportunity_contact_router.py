@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from queries.opportunity_contact_queries import (
     OpportunityContactQueries,
     OpportunityContactDoesNotExist,
     OpportunityContactDatabaseError,
 )
 from models.opportunity_contact import OpportunityContact
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     tags=["Opportunity Contact"],
@@ -14,25 +23,47 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all_opportunity_contacts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: OpportunityContactQueries = Depends(),
-) -> list[OpportunityContact]:
+) -> Page[OpportunityContact]:
     try:
-        opportunity_contacts = queries.get_all_opportunity_contacts()
+        opportunity_contacts = await queries.get_all(
+            limit=limit, cursor=cursor, filter=filter, sort=sort, ids=ids
+        )
         return opportunity_contacts
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except OpportunityContactDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve opportunity contacts."
         )
 
 
+@router.post("/lookup")
+async def lookup_opportunity_contacts(
+    opportunity_contacts: list[OpportunityContact],
+    queries: OpportunityContactQueries = Depends(),
+) -> list[OpportunityContact]:
+    try:
+        return await queries.get_many(opportunity_contacts)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityContactDatabaseError:
+        raise HTTPException(
+            status_code=500, detail="Failed to look up opportunity contacts."
+        )
+
+
 @router.get("/{opportunity_id}/{contact_id}")
-def get_opportunity_contact(
+async def get_opportunity_contact(
     opportunity_id: int, contact_id: int, queries: OpportunityContactQueries = Depends()
 ) -> OpportunityContact:
     try:
-        opportunity_contact = queries.get_opportunity_contact(
-            opportunity_id, contact_id
-        )
+        opportunity_contact = await queries.get(opportunity_id, contact_id)
         return opportunity_contact
     except OpportunityContactDoesNotExist:
         raise HTTPException(
@@ -46,26 +77,54 @@ def get_opportunity_contact(
 
 
 @router.post("/")
-def create_opportunity_contact(
+async def create_opportunity_contact(
     opportunity_id: int, contact_id: int, queries: OpportunityContactQueries = Depends()
 ) -> OpportunityContact:
     try:
-        new_opportunity_contact = queries.create_opportunity_contact(
-            opportunity_id, contact_id
+        new_opportunity_contact = await queries.create(
+            OpportunityContact(opportunity_id=opportunity_id, contact_id=contact_id)
         )
         return new_opportunity_contact
     except OpportunityContactDatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_opportunity_contacts(
+    opportunity_contacts: list[OpportunityContact],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityContactQueries = Depends(),
+) -> BulkResult[OpportunityContact]:
+    try:
+        return await queries.create_many(opportunity_contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_opportunity_contacts(
+    opportunity_contacts: list[OpportunityContact],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityContactQueries = Depends(),
+) -> BulkDeleteResult[OpportunityContact]:
+    try:
+        return await queries.delete_many(opportunity_contacts, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityContactDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{opportunity_id}/{contact_id}")
-def delete_opportunity_contact(
+async def delete_opportunity_contact(
     opportunity_id: int,
     contact_id: int,
     queries: OpportunityContactQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_opportunity_contact(
+        success = await queries.delete(
             opportunity_id,
             contact_id,
         )
@@ -86,13 +145,13 @@ def delete_opportunity_contact(
 
 
 @router.put("/{opportunity_id}/{contact_id}")
-def update_opportunity_contact(
+async def update_opportunity_contact(
     opportunity_id: int, contact_id: int, queries: OpportunityContactQueries = Depends()
 ) -> OpportunityContact:
     try:
-        updated_opportunity_contact = queries.edit_opportunity_contact(
-            opportunity_id=opportunity_id,
-            contact_id=contact_id,
+        updated_opportunity_contact = await queries.edit(
+            opportunity_id,
+            contact_id,
         )
         return updated_opportunity_contact
     except OpportunityContactDoesNotExist:
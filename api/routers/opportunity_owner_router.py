@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from queries.opportunity_owner_queries import (
     OpportunityOwnerQueries,
     OpportunityOwnerDoesNotExist,
     OpportunityOwnerDatabaseError,
 )
 from models.opportunity_owner import OpportunityOwner
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     tags=["Opportunity Owner"],
@@ -14,23 +23,47 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all_opportunity_owners(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: OpportunityOwnerQueries = Depends(),
-) -> list[OpportunityOwner]:
+) -> Page[OpportunityOwner]:
     try:
-        opportunity_owners = queries.get_all_opportunity_owners()
+        opportunity_owners = await queries.get_all(
+            limit=limit, cursor=cursor, filter=filter, sort=sort, ids=ids
+        )
         return opportunity_owners
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except OpportunityOwnerDatabaseError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve opportunity owners."
         )
 
 
+@router.post("/lookup")
+async def lookup_opportunity_owners(
+    opportunity_owners: list[OpportunityOwner],
+    queries: OpportunityOwnerQueries = Depends(),
+) -> list[OpportunityOwner]:
+    try:
+        return await queries.get_many(opportunity_owners)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityOwnerDatabaseError:
+        raise HTTPException(
+            status_code=500, detail="Failed to look up opportunity owners."
+        )
+
+
 @router.get("/{opportunity_id}/{user_id}")
-def get_opportunity_owner(
+async def get_opportunity_owner(
     opportunity_id: int, user_id: int, queries: OpportunityOwnerQueries = Depends()
 ) -> OpportunityOwner:
     try:
-        opportunity_owner = queries.get_opportunity_owner(
+        opportunity_owner = await queries.get(
             opportunity_id,
             user_id,
         )
@@ -47,26 +80,54 @@ def get_opportunity_owner(
 
 
 @router.post("/")
-def create_opportunity_owner(
+async def create_opportunity_owner(
     opportunity_id: int, user_id: int, queries: OpportunityOwnerQueries = Depends()
 ) -> OpportunityOwner:
     try:
-        new_opportunity_owner = queries.create_opportunity_owner(
-            opportunity_id, user_id
+        new_opportunity_owner = await queries.create(
+            OpportunityOwner(opportunity_id=opportunity_id, user_id=user_id)
         )
         return new_opportunity_owner
     except OpportunityOwnerDatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_opportunity_owners(
+    opportunity_owners: list[OpportunityOwner],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityOwnerQueries = Depends(),
+) -> BulkResult[OpportunityOwner]:
+    try:
+        return await queries.create_many(opportunity_owners, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityOwnerDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_opportunity_owners(
+    opportunity_owners: list[OpportunityOwner],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityOwnerQueries = Depends(),
+) -> BulkDeleteResult[OpportunityOwner]:
+    try:
+        return await queries.delete_many(opportunity_owners, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityOwnerDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{opportunity_id}/{user_id}")
-def delete_opportunity_owner(
+async def delete_opportunity_owner(
     opportunity_id: int,
     user_id: int,
     queries: OpportunityOwnerQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_opportunity_owner(opportunity_id, user_id)
+        success = await queries.delete(opportunity_id, user_id)
         if not success:
             raise OpportunityOwnerDoesNotExist(
                 f"Opportunity owner with opportunity id {opportunity_id} and user id {user_id} does not exist."
@@ -85,13 +146,13 @@ def delete_opportunity_owner(
 
 
 @router.put("/{opportunity_id}/{user_id}")
-def update_opportunity_owner(
+async def update_opportunity_owner(
     opportunity_id: int, user_id: int, queries: OpportunityOwnerQueries = Depends()
 ) -> OpportunityOwner:
     try:
-        updated_opportunity_owner = queries.edit_opportunity_owner(
-            opportunity_id=opportunity_id,
-            user_id=user_id,
+        updated_opportunity_owner = await queries.edit(
+            opportunity_id,
+            user_id,
         )
         return updated_opportunity_owner
     except OpportunityOwnerDoesNotExist:
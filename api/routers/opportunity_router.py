@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from queries.opportunity_queries import (
     OpportunityQueries,
@@ -6,18 +7,56 @@ from queries.opportunity_queries import (
     OpportunityDatabaseError,
     OpportunityCreationError,
 )
-from models.opportunity import Opportunity, OpportunityCreate
+from models.opportunity import Opportunity, OpportunityCreate, OpportunityUpdate
+from models.bulk_import import ImportReport
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from queries.import_queries import ImportQueries
+from utils.exceptions import (
+    BulkImportDatabaseError,
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    InvalidImportFileError,
+)
+from utils.fast_json import FastJSONResponse
+from utils.fields import sparse_model
+from utils.imports import ImportFormat, read_rows
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.streaming import ExportFormat, export_response
 
 router = APIRouter(tags=["Opportunity"], prefix="/api/opportunities")
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=Page[sparse_model(Opportunity)],
+    response_class=FastJSONResponse,
+)
 async def get_all_opportunities(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
     queries: OpportunityQueries = Depends(),
-) -> list[Opportunity]:
+) -> FastJSONResponse:
     try:
-        opportunities = queries.get_all_opportunities()
-        return opportunities
+        opportunities = await queries.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            ids=ids,
+            include=include,
+        )
+        return FastJSONResponse(opportunities)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except OpportunityDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,13 +64,52 @@ async def get_all_opportunities(
         )
 
 
-@router.get("/{opportunity_id}")
-def get_opportunity(
-    opportunity_id: int, queries: OpportunityQueries = Depends()
-) -> Opportunity:
+@router.post(
+    "/lookup",
+    response_model=list[sparse_model(Opportunity)],
+    response_class=FastJSONResponse,
+)
+async def lookup_opportunities(
+    opportunity_ids: list[int] = Body(),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: OpportunityQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        opportunities = await queries.get_many(
+            opportunity_ids, fields=fields, include=include
+        )
+        return FastJSONResponse(opportunities)
+    except (InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up opportunities.")
+
+
+@router.get("/export")
+async def export_opportunities(
+    format: ExportFormat = ExportFormat.ndjson,
+    queries: OpportunityQueries = Depends(),
+) -> StreamingResponse:
+    return export_response(queries.export(), format, "opportunities")
+
+
+@router.get(
+    "/{opportunity_id}",
+    response_model=sparse_model(Opportunity),
+    response_class=FastJSONResponse,
+)
+async def get_opportunity(
+    opportunity_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: OpportunityQueries = Depends(),
+) -> FastJSONResponse:
     try:
-        opportunity = queries.get_opportunity(opportunity_id)
-        return opportunity
+        opportunity = await queries.get(opportunity_id, fields=fields, include=include)
+        return FastJSONResponse(opportunity)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except OpportunityDoesNotExist:
         raise HTTPException(status_code=404, detail="Opportunity not found")
     except OpportunityDatabaseError:
@@ -42,11 +120,11 @@ def get_opportunity(
 
 
 @router.post("/")
-def create_opportunity(
+async def create_opportunity(
     opportunity: OpportunityCreate, queries: OpportunityQueries = Depends()
 ) -> Opportunity:
     try:
-        new_opportunity = queries.create_opportunity(opportunity)
+        new_opportunity = await queries.create(opportunity)
         return new_opportunity
     except OpportunityCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -54,13 +132,72 @@ def create_opportunity(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/import")
+async def import_opportunities(
+    file: UploadFile,
+    format: ImportFormat = ImportFormat.csv,
+    all_or_nothing: bool = False,
+    queries: ImportQueries = Depends(),
+) -> ImportReport:
+    try:
+        return await queries.import_rows(
+            "opportunities", read_rows(file.file, format), all_or_nothing
+        )
+    except InvalidImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BulkImportDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bulk")
+async def create_opportunities(
+    opportunities: list[OpportunityCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityQueries = Depends(),
+) -> BulkResult[Opportunity]:
+    try:
+        return await queries.create_many(opportunities, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_opportunities(
+    opportunities: list[OpportunityUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityQueries = Depends(),
+) -> BulkResult[Opportunity]:
+    try:
+        return await queries.edit_many(opportunities, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_opportunities(
+    opportunity_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: OpportunityQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(opportunity_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpportunityDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{opportunity_id}")
-def delete_opportunity(
+async def delete_opportunity(
     opportunity_id: int,
     queries: OpportunityQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_opportunity(opportunity_id)
+        success = await queries.delete(opportunity_id)
         if not success:
             raise OpportunityDoesNotExist(
                 f"Opportunity with id {opportunity_id} does not exist."
@@ -76,7 +213,7 @@ def delete_opportunity(
 
 
 @router.put("/{opportunity_id}")
-def update_opportunity(
+async def update_opportunity(
     opportunity_id: int,
     opportunity_name: Optional[str] = None,
     stage_id: Optional[int] = None,
@@ -87,8 +224,8 @@ def update_opportunity(
     queries: OpportunityQueries = Depends(),
 ) -> Opportunity:
     try:
-        updated_opportunity = queries.edit_opportunity(
-            opportunity_id=opportunity_id,
+        updated_opportunity = await queries.edit(
+            opportunity_id,
             opportunity_name=opportunity_name,
             stage_id=stage_id,
             forecast_category_id=forecast_category_id,
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from datetime import date
+from queries.report_queries import ReportQueries
+from models.report import PipelineTotal
+from utils.exceptions import ReportDatabaseError
+
+router = APIRouter(tags=["Report"], prefix="/api/reports")
+
+
+@router.get("/pipeline")
+async def get_pipeline_report(
+    stage_id: Optional[int] = None,
+    forecast_category_id: Optional[int] = None,
+    close_from: Optional[date] = None,
+    close_to: Optional[date] = None,
+    queries: ReportQueries = Depends(),
+) -> list[PipelineTotal]:
+    try:
+        return await queries.get_pipeline(
+            stage_id=stage_id,
+            forecast_category_id=forecast_category_id,
+            close_from=close_from,
+            close_to=close_to,
+        )
+    except ReportDatabaseError:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve the pipeline report.",
+        )
@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from typing import Optional
 from queries.stage_queries import (
     StageQueries,
@@ -6,18 +14,34 @@ from queries.stage_queries import (
     StageDatabaseError,
     StageCreationError,
 )
-from models.stage import Stage, StageCreate
+from models.stage import Stage, StageCreate, StageUpdate
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFilterError,
+)
+from utils.etag import check_etag
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["Stage"], prefix="/api/stages")
 
 
 @router.get("/")
 async def get_all_stages(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
     queries: StageQueries = Depends(),
-) -> list[Stage]:
+) -> Page[Stage]:
     try:
-        stages = queries.get_all_stages()
-        return stages
+        stages = await queries.get_all(limit=limit, cursor=cursor, ids=ids)
+        return check_etag(request, response, stages) or stages
+    except (InvalidCursorError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except StageDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,11 +49,29 @@ async def get_all_stages(
         )
 
 
+@router.post("/lookup")
+async def lookup_stages(
+    stage_ids: list[int] = Body(),
+    queries: StageQueries = Depends(),
+) -> list[Stage]:
+    try:
+        return await queries.get_many(stage_ids)
+    except InvalidFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StageDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up stages.")
+
+
 @router.get("/{stage_id}")
-def get_stage(stage_id: int, queries: StageQueries = Depends()) -> Stage:
+async def get_stage(
+    stage_id: int,
+    request: Request,
+    response: Response,
+    queries: StageQueries = Depends(),
+) -> Stage:
     try:
-        stage = queries.get_stage(stage_id)
-        return stage
+        stage = await queries.get(stage_id)
+        return check_etag(request, response, stage) or stage
     except StageDoesNotExist:
         raise HTTPException(status_code=404, detail="Stage not found")
     except StageDatabaseError:
@@ -40,9 +82,9 @@ def get_stage(stage_id: int, queries: StageQueries = Depends()) -> Stage:
 
 
 @router.post("/")
-def create_stage(stage: StageCreate, queries: StageQueries = Depends()) -> Stage:
+async def create_stage(stage: StageCreate, queries: StageQueries = Depends()) -> Stage:
     try:
-        new_stage = queries.create_stage(stage)
+        new_stage = await queries.create(stage)
         return new_stage
     except StageCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -50,13 +92,55 @@ def create_stage(stage: StageCreate, queries: StageQueries = Depends()) -> Stage
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_stages(
+    stages: list[StageCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: StageQueries = Depends(),
+) -> BulkResult[Stage]:
+    try:
+        return await queries.create_many(stages, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StageDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_stages(
+    stages: list[StageUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: StageQueries = Depends(),
+) -> BulkResult[Stage]:
+    try:
+        return await queries.edit_many(stages, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StageDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_stages(
+    stage_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: StageQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(stage_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StageDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{stage_id}")
-def delete_stage(
+async def delete_stage(
     stage_id: int,
     queries: StageQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_stage(stage_id)
+        success = await queries.delete(stage_id)
         if not success:
             raise StageDoesNotExist(
                 f"Stage with id {stage_id} does not exist.",
@@ -69,17 +153,19 @@ def delete_stage(
 
 
 @router.put("/{stage_id}")
-def update_stage(
+async def update_stage(
     stage_id: int,
     stage_name: Optional[str] = None,
     description: Optional[str] = None,
+    is_closed: Optional[bool] = None,
     queries: StageQueries = Depends(),
 ) -> Stage:
     try:
-        updated_stage = queries.edit_stage(
-            stage_id=stage_id,
+        updated_stage = await queries.edit(
+            stage_id,
             stage_name=stage_name,
             description=description,
+            is_closed=is_closed,
         )
         return updated_stage
     except StageDoesNotExist:
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from queries.sync_queries import SyncQueries
+from models.sync import SyncPage
+from utils.exceptions import InvalidCursorError, SyncDatabaseError
+from utils.fast_json import FastJSONResponse
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter(tags=["Sync"], prefix="/api/sync")
+
+
+@router.get("/", response_model=SyncPage, response_class=FastJSONResponse)
+async def sync(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    queries: SyncQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        page = await queries.get_changes(since=since, limit=limit)
+        return FastJSONResponse(page)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SyncDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to sync.")
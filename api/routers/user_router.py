@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from typing import Optional
 from queries.user_queries import (
     UserQueries,
@@ -6,18 +6,55 @@ from queries.user_queries import (
     UserDatabaseError,
     UserCreationError,
 )
-from models.user import User, UserCreate
+from models.activity import ActivityQueue, ActivityStatus
+from models.user import User, UserCreate, UserUpdate
+from models.user_dashboard import UserDashboard
+from models.bulk import BulkDeleteResult, BulkMode, BulkResult
+from models.page import Page
+from utils.exceptions import (
+    AccountDatabaseError,
+    ActivityDatabaseError,
+    BulkOperationError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    OpportunityDatabaseError,
+)
+from utils.fast_json import FastJSONResponse
+from utils.fields import sparse_model
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["User"], prefix="/api/users")
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=Page[sparse_model(User)],
+    response_class=FastJSONResponse,
+)
 async def get_all_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
     queries: UserQueries = Depends(),
-) -> list[User]:
+) -> FastJSONResponse:
     try:
-        users = queries.get_all_users()
-        return users
+        users = await queries.get_all(
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            sort=sort,
+            ids=ids,
+            include=include,
+        )
+        return FastJSONResponse(users)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except UserDatabaseError:
         raise HTTPException(
             status_code=500,
@@ -25,21 +62,115 @@ async def get_all_users(
         )
 
 
-@router.get("/{user_id}")
-def get_user(user_id: int, queries: UserQueries = Depends()) -> User:
+@router.post(
+    "/lookup",
+    response_model=list[sparse_model(User)],
+    response_class=FastJSONResponse,
+)
+async def lookup_users(
+    user_ids: list[int] = Body(),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: UserQueries = Depends(),
+) -> FastJSONResponse:
     try:
-        user = queries.get_user(user_id)
-        return user
+        users = await queries.get_many(user_ids, fields=fields, include=include)
+        return FastJSONResponse(users)
+    except (InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserDatabaseError:
+        raise HTTPException(status_code=500, detail="Failed to look up users.")
+
+
+@router.get(
+    "/{user_id}",
+    response_model=sparse_model(User),
+    response_class=FastJSONResponse,
+)
+async def get_user(
+    user_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: UserQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        user = await queries.get(user_id, fields=fields, include=include)
+        return FastJSONResponse(user)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except UserDoesNotExist:
         raise HTTPException(status_code=404, detail="User not found")
     except UserDatabaseError:
         raise HTTPException(status_code=500, detail="Failed to retrieve user.")
 
 
+@router.get(
+    "/{user_id}/activities",
+    response_model=ActivityQueue,
+    response_class=FastJSONResponse,
+)
+async def get_user_activities(
+    user_id: int,
+    status: ActivityStatus = ActivityStatus.overdue,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filter: Optional[str] = None,
+    include: Optional[str] = None,
+    queries: UserQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        activities = await queries.get_activities(
+            user_id,
+            status,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            filter=filter,
+            include=include,
+        )
+        return FastJSONResponse(activities)
+    except (InvalidCursorError, InvalidFieldsError, InvalidFilterError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserDoesNotExist:
+        raise HTTPException(status_code=404, detail="User not found")
+    except (UserDatabaseError, ActivityDatabaseError):
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve activities.",
+        )
+
+
+@router.get(
+    "/{user_id}/dashboard",
+    response_model=UserDashboard,
+    response_class=FastJSONResponse,
+)
+async def get_user_dashboard(
+    user_id: int,
+    queries: UserQueries = Depends(),
+) -> FastJSONResponse:
+    try:
+        dashboard = await queries.get_dashboard(user_id)
+        return FastJSONResponse(dashboard)
+    except UserDoesNotExist:
+        raise HTTPException(status_code=404, detail="User not found")
+    except (
+        UserDatabaseError,
+        AccountDatabaseError,
+        ActivityDatabaseError,
+        OpportunityDatabaseError,
+    ):
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve dashboard.",
+        )
+
+
 @router.post("/")
-def create_user(user: UserCreate, queries: UserQueries = Depends()) -> User:
+async def create_user(user: UserCreate, queries: UserQueries = Depends()) -> User:
     try:
-        new_user = queries.create_user(user)
+        new_user = await queries.create(user)
         return new_user
     except UserCreationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,13 +178,55 @@ def create_user(user: UserCreate, queries: UserQueries = Depends()) -> User:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk")
+async def create_users(
+    users: list[UserCreate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: UserQueries = Depends(),
+) -> BulkResult[User]:
+    try:
+        return await queries.create_many(users, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/bulk")
+async def update_users(
+    users: list[UserUpdate],
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: UserQueries = Depends(),
+) -> BulkResult[User]:
+    try:
+        return await queries.edit_many(users, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def delete_users(
+    user_ids: list[int] = Body(),
+    mode: BulkMode = BulkMode.all_or_nothing,
+    queries: UserQueries = Depends(),
+) -> BulkDeleteResult[int]:
+    try:
+        return await queries.delete_many(user_ids, mode)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserDatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: int,
     queries: UserQueries = Depends(),
 ) -> dict:
     try:
-        success = queries.delete_user(user_id)
+        success = await queries.delete(user_id)
         if not success:
             raise UserDoesNotExist(f"User with id {user_id} does not exist.")
         return {"status": "User deleted successfully."}
@@ -64,7 +237,7 @@ def delete_user(
 
 
 @router.put("/{user_id}")
-def update_user(
+async def update_user(
     user_id: int,
     username: Optional[str] = None,
     email: Optional[str] = None,
@@ -74,8 +247,8 @@ def update_user(
     queries: UserQueries = Depends(),
 ) -> User:
     try:
-        updated_user = queries.edit_user(
-            user_id=user_id,
+        updated_user = await queries.edit(
+            user_id,
             username=username,
             email=email,
             hashed_password=hashed_password,
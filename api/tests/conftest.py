@@ -0,0 +1,152 @@
+import os
+
+import psycopg
+import pytest
+
+# Row counts for the seeded database. Large enough that the planner
+# prefers an index over a sequential scan whenever a usable one exists.
+SEED_SQL = """--sql
+INSERT INTO countries (country_name, country_code)
+SELECT 'Seed country ' || n, '~' || n FROM generate_series(1, 60) n;
+
+INSERT INTO users (username, email, hashed_password)
+SELECT 'seed_user_' || n, 'seed_user_' || n || '@example.com', 'x'
+FROM generate_series(1, 2000) n;
+
+INSERT INTO stages (stage_name)
+SELECT 'Seed stage ' || n FROM generate_series(1, 8) n;
+
+INSERT INTO activity_types (type_name)
+SELECT 'Seed type ' || n FROM generate_series(1, 6) n;
+
+INSERT INTO accounts (account_name, account_owner_id, billing_country_id)
+SELECT 'Seed account ' || n, u.ids[1 + n % 2000], c.ids[1 + n % 60]
+FROM generate_series(1, 20000) n,
+    (SELECT array_agg(user_id) ids FROM users
+        WHERE username LIKE 'seed_user_%') u,
+    (SELECT array_agg(country_id) ids FROM countries
+        WHERE country_name LIKE 'Seed country %') c;
+
+UPDATE accounts a SET parent_account_id = p.account_id
+FROM accounts p
+WHERE p.account_name = 'Seed account ' || (
+        substring(a.account_name FROM 14)::integer - 1
+    )
+    AND a.account_name LIKE 'Seed account %'
+    AND substring(a.account_name FROM 14)::integer % 10 <> 1;
+
+INSERT INTO contacts (account_id, first_name, last_name, email)
+SELECT a.ids[1 + n % 20000], 'Seed', 'Contact', 'seed_contact_' || n || '@example.com'
+FROM generate_series(1, 50000) n,
+    (SELECT array_agg(account_id) ids FROM accounts
+        WHERE account_name LIKE 'Seed account %') a;
+
+INSERT INTO opportunities (account_id, opportunity_name, stage_id, amount)
+SELECT a.ids[1 + n % 20000], 'Seed opportunity ' || n, s.ids[1 + n % 8], n
+FROM generate_series(1, 40000) n,
+    (SELECT array_agg(account_id) ids FROM accounts
+        WHERE account_name LIKE 'Seed account %') a,
+    (SELECT array_agg(stage_id) ids FROM stages
+        WHERE stage_name LIKE 'Seed stage %') s;
+
+INSERT INTO activities (
+    activity_type_id, opportunity_id, description, due_date, completed
+)
+SELECT
+    t.ids[1 + n % 6],
+    o.ids[1 + n % 40000],
+    'Seed activity',
+    CURRENT_DATE + (n % 120) - 60,
+    n % 3 = 0
+FROM generate_series(1, 80000) n,
+    (SELECT array_agg(activity_type_id) ids FROM activity_types
+        WHERE type_name LIKE 'Seed type %') t,
+    (SELECT array_agg(opportunity_id) ids FROM opportunities
+        WHERE opportunity_name LIKE 'Seed opportunity %') o;
+
+CREATE TEMPORARY TABLE seed_ids ON COMMIT DROP AS SELECT
+    (SELECT array_agg(user_id) FROM users
+        WHERE username LIKE 'seed_user_%') AS users,
+    (SELECT array_agg(contact_id) FROM contacts
+        WHERE email LIKE 'seed_contact_%') AS contacts;
+
+INSERT INTO opportunity_owners (opportunity_id, user_id)
+SELECT o.opportunity_id, s.users[1 + o.opportunity_id % 2000]
+FROM opportunities o, seed_ids s
+WHERE o.opportunity_name LIKE 'Seed opportunity %';
+
+INSERT INTO opportunity_contacts (opportunity_id, contact_id)
+SELECT o.opportunity_id, s.contacts[1 + o.opportunity_id % 50000]
+FROM opportunities o, seed_ids s
+WHERE o.opportunity_name LIKE 'Seed opportunity %';
+
+INSERT INTO activity_users (activity_id, user_id)
+SELECT a.activity_id, s.users[1 + a.activity_id % 2000]
+FROM activities a, seed_ids s
+WHERE a.description = 'Seed activity';
+
+INSERT INTO activity_contacts (activity_id, contact_id)
+SELECT a.activity_id, s.contacts[1 + a.activity_id % 50000]
+FROM activities a, seed_ids s
+WHERE a.description = 'Seed activity';
+
+INSERT INTO change_outbox (table_name, operation, key)
+SELECT 'contacts', 'update', to_jsonb(c.contact_id)
+FROM contacts c, seed_ids s
+WHERE c.contact_id = ANY(s.contacts);
+
+INSERT INTO tombstones (table_name, key)
+SELECT 'contacts', to_jsonb(-n) FROM generate_series(1, 20000) n;
+
+INSERT INTO jobs (kind, status, attempts, finished_at)
+SELECT 'refresh_pipeline', 'succeeded', 1, now() FROM generate_series(1, 20000);
+
+ANALYZE;
+"""
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    url = os.environ.get("DATABASE_URL")
+    if url is None:
+        pytest.skip("DATABASE_URL is not set")
+    return url
+
+
+@pytest.fixture(scope="module")
+def seeded_db(database_url):
+    """
+    A connection to a migrated database with SEED_SQL applied inside a
+    transaction that is rolled back at the end of the module, so the
+    tests never leave data behind. The transaction holds the locks of the
+    seeding (the account hierarchy's among them) until then, which would
+    block the tests of other modules that write on their own connections.
+    """
+    with psycopg.connect(database_url) as conn:
+        conn.execute(SEED_SQL)
+        yield conn
+        conn.rollback()
+
+
+@pytest.fixture(scope="module")
+def seed_ids(seeded_db):
+    """
+    The first seeded id of each entity, for parameterizing queries
+    without depending on rows that already existed in the database.
+    """
+    row = seeded_db.execute(
+        """--sql
+        SELECT
+            (SELECT min(account_id) FROM accounts
+                WHERE account_name LIKE 'Seed account %'),
+            (SELECT min(contact_id) FROM contacts
+                WHERE email LIKE 'seed_contact_%'),
+            (SELECT min(country_id) FROM countries
+                WHERE country_name LIKE 'Seed country %'),
+            (SELECT min(opportunity_id) FROM opportunities
+                WHERE opportunity_name LIKE 'Seed opportunity %'),
+            (SELECT min(user_id) FROM users
+                WHERE username LIKE 'seed_user_%');
+        """
+    ).fetchone()
+    return dict(zip(("account", "contact", "country", "opportunity", "user"), row))
@@ -0,0 +1,188 @@
+"""
+Unit tests for the filter and sort grammar of the list routes (see
+utils.filters). They only compile queries, so they need no database.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models.account import Account
+from models.contact import Contact
+from models.opportunity import Opportunity
+from models.user import User
+from utils.exceptions import InvalidCursorError, InvalidFilterError
+from utils.filters import ListQuery
+from utils.pagination import encode_cursor, paginate_rows
+
+PK = ("opportunity_id",)
+
+
+def compile(query: ListQuery) -> tuple[str, str]:
+    return query.where.as_string(None), query.order_by.as_string(None)
+
+
+def test_no_filter_or_sort_pages_by_primary_key():
+    query = ListQuery(Opportunity, PK)
+    assert compile(query) == ("TRUE", '"opportunity_id" ASC')
+    assert query.params == []
+    assert query.cursor_prefix == ()
+
+
+@pytest.mark.parametrize(
+    "filter, where, params",
+    [
+        ("amount:gt:50000", '"amount" > %s', [Decimal("50000")]),
+        ("close_date:gte:2026-10-01", '"close_date" >= %s', [date(2026, 10, 1)]),
+        ("stage_id:ne:3", '"stage_id" <> %s', [3]),
+        ("stage_id:in:1|2|3", '"stage_id" = ANY(%s)', [[1, 2, 3]]),
+        (
+            "opportunity_name:contains:50%_off",
+            '"opportunity_name" ILIKE %s',
+            ["%50\\%\\_off%"],
+        ),
+        ("close_date:null:true", '"close_date" IS NULL', []),
+        ("close_date:null:false", '"close_date" IS NOT NULL', []),
+        (
+            "account_id:eq:42,amount:lte:10",
+            '"account_id" = %s AND "amount" <= %s',
+            [42, Decimal("10")],
+        ),
+    ],
+)
+def test_filter_compiles_to_parameterized_sql(filter, where, params):
+    query = ListQuery(Opportunity, PK, filter=filter)
+    assert compile(query)[0] == where
+    assert query.params == params
+
+
+def test_contains_on_an_email_field():
+    query = ListQuery(User, ("user_id",), filter="email:contains:acme")
+    assert compile(query)[0] == '"email" ILIKE %s'
+    assert query.params == ["%acme%"]
+
+
+def test_escaped_separators_stay_in_the_value():
+    query = ListQuery(Opportunity, PK, filter=r"opportunity_name:in:a\,b|c\|d")
+    assert query.params == [["a,b", "c|d"]]
+
+
+def test_value_is_never_spliced_into_the_query():
+    value = "x'); DROP TABLE opportunities; --"
+    query = ListQuery(Opportunity, PK, filter=f"opportunity_name:eq:{value}")
+    assert value not in compile(query)[0]
+    assert query.params == [value]
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        "description:eq:x",  # not in filter_fields
+        "amount:like:5",  # unknown operator
+        "amount:5",  # not field:operator:value
+        "amount:gt:lots",  # not a number
+        "close_date:eq:2026-13-01",  # not a date
+        "stage_id:in:1|two",  # one bad value in a list
+        "amount:contains:5",  # contains on a non-text field
+        "close_date:null:maybe",
+    ],
+)
+def test_bad_filter_is_rejected(filter):
+    with pytest.raises(InvalidFilterError):
+        ListQuery(Opportunity, PK, filter=filter)
+
+
+def test_sort_appends_primary_key_in_last_direction():
+    query = ListQuery(Opportunity, PK, sort="amount,-close_date")
+    assert compile(query)[1] == (
+        '"amount" ASC, "close_date" DESC, "opportunity_id" DESC'
+    )
+    assert query.key == ("amount", "close_date", "opportunity_id")
+    assert query.cursor_prefix == ("amount,-close_date",)
+
+
+@pytest.mark.parametrize(
+    "sort",
+    ["description", "-description", "amount,amount", "amount,-amount"],
+)
+def test_bad_sort_is_rejected(sort):
+    with pytest.raises(InvalidFilterError):
+        ListQuery(Opportunity, PK, sort=sort)
+
+
+def test_select_adds_missing_sort_columns():
+    query = ListQuery(Opportunity, PK, sort="-amount")
+    assert query.select(("opportunity_name",)) == (
+        "opportunity_name",
+        "amount",
+        "opportunity_id",
+    )
+
+
+def next_cursor(query: ListQuery, row: dict) -> str:
+    page = paginate_rows([row, row], 1, query.key, query.cursor_prefix)
+    return page["next_cursor"]
+
+
+def test_cursor_round_trip_on_a_nullable_column():
+    sort = "-close_date"
+    first = ListQuery(Opportunity, PK, sort=sort)
+    cursor = next_cursor(first, {"close_date": date(2026, 10, 1), "opportunity_id": 7})
+    query = ListQuery(Opportunity, PK, sort=sort, cursor=cursor)
+    # close_date is nullable, so the OR form is used.
+    where, _ = compile(query)
+    assert '"close_date" < %s' in where
+    assert query.params == [date(2026, 10, 1), date(2026, 10, 1), 7]
+
+
+def test_cursor_on_not_null_columns_is_a_row_comparison():
+    sort = "opportunity_name"
+    first = ListQuery(Opportunity, PK, sort=sort)
+    cursor = next_cursor(first, {"opportunity_name": "Acme", "opportunity_id": 7})
+    query = ListQuery(Opportunity, PK, sort=sort, cursor=cursor)
+    assert compile(query)[0] == '("opportunity_name", "opportunity_id") > (%s, %s)'
+    assert query.params == ["Acme", 7]
+
+
+def test_cursor_with_null_sort_value():
+    sort = "amount"
+    first = ListQuery(Opportunity, PK, sort=sort)
+    cursor = next_cursor(first, {"amount": None, "opportunity_id": 7})
+    query = ListQuery(Opportunity, PK, sort=sort, cursor=cursor)
+    # NULLs sort last ascending: only later NULLs remain.
+    assert compile(query)[0] == '(("amount" IS NULL AND "opportunity_id" > %s))'
+    assert query.params == [7]
+
+
+def test_default_order_cursor_has_no_prefix():
+    cursor = encode_cursor([7])
+    query = ListQuery(Opportunity, PK, cursor=cursor)
+    assert compile(query)[0] == '("opportunity_id") > (%s)'
+    assert query.params == [7]
+
+
+@pytest.mark.parametrize(
+    "sort, cursor",
+    [
+        # A cursor from another sort order.
+        ("amount", encode_cursor(["-amount", 5, 7])),
+        # A default-order cursor used with a sort.
+        ("amount", encode_cursor([7])),
+        # Too few values.
+        ("amount", encode_cursor(["amount", 7])),
+        # A value of the wrong type.
+        ("close_date", encode_cursor(["close_date", "soon", 7])),
+        # Not a cursor at all.
+        ("amount", "not a cursor"),
+    ],
+)
+def test_bad_cursor_is_rejected(sort, cursor):
+    with pytest.raises(InvalidCursorError):
+        ListQuery(Opportunity, PK, sort=sort, cursor=cursor)
+
+
+@pytest.mark.parametrize("model", [Account, Contact, Opportunity, User])
+def test_whitelists_name_model_fields(model):
+    assert set(model.sort_fields) <= set(model.model_fields)
+    assert set(model.filter_fields) <= set(model.model_fields)
@@ -0,0 +1,371 @@
+"""
+Tests of the job queue (queries.job_queries) and of the cascading delete
+behind delete jobs (queries.cascade), against a migrated database. The
+queue is shared between connections, so these tests commit their jobs
+and rows, and delete them again afterwards. They assume no job worker is
+running on the database.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import psycopg
+import pytest
+
+
+@pytest.fixture
+def job_queries(database_url):
+    # queries.pool reads DATABASE_URL on import.
+    from queries import job_queries
+
+    return job_queries
+
+
+@pytest.fixture
+def connect(database_url):
+    """Opens autocommit connections, closed at the end of the test."""
+    connections = []
+
+    def connect():
+        conn = psycopg.connect(database_url, autocommit=True)
+        connections.append(conn)
+        return conn
+
+    yield connect
+    for conn in connections:
+        conn.close()
+
+
+@pytest.fixture
+def queued_jobs(connect):
+    """
+    Queues three jobs of up to three attempts, due before any other job,
+    and returns a function that reads a column of one of them.
+    """
+    conn = connect()
+    job_ids = [
+        row[0]
+        for row in conn.execute(
+            """--sql
+            INSERT INTO jobs (kind, max_attempts, run_at)
+            SELECT 'refresh_pipeline', 3, '2000-01-01'
+            FROM generate_series(1, 3)
+            RETURNING job_id;
+            """
+        )
+    ]
+
+    def read(job_id, column):
+        return conn.execute(
+            f"SELECT {column} FROM jobs WHERE job_id = %s;", (job_id,)
+        ).fetchone()[0]
+
+    read.job_ids = job_ids
+    yield read
+    conn.execute("DELETE FROM jobs WHERE job_id = ANY(%s);", (job_ids,))
+
+
+def claim(conn, job_queries) -> dict:
+    with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(job_queries.CLAIM, {"lease": 60})
+        return cur.fetchone()
+
+
+def fail(conn, job_queries, job: dict, retry: bool = True):
+    with conn.cursor() as cur:
+        cur.execute(
+            job_queries.FAIL,
+            {
+                **job,
+                "error": "failed",
+                "retry": retry,
+                "delay": 10,
+                "max_delay": 15,
+            },
+        )
+        row = cur.fetchone()
+        return row[0] if row else None
+
+
+def expire(conn, job: dict) -> None:
+    conn.execute(
+        "UPDATE jobs SET locked_until = now() - interval '1 second' "
+        "WHERE job_id = %s;",
+        (job["job_id"],),
+    )
+
+
+def make_due(conn, job: dict) -> None:
+    conn.execute(
+        "UPDATE jobs SET run_at = '2000-01-01' WHERE job_id = %s;",
+        (job["job_id"],),
+    )
+
+
+def test_claims_skip_jobs_locked_by_another_claim(connect, job_queries, queued_jobs):
+    first, second = connect(), connect()
+    with first.transaction():
+        # Holds the lock on the first job until the end of the block.
+        claimed = claim(first, job_queries)
+        other = claim(second, job_queries)
+    assert claimed["job_id"] == queued_jobs.job_ids[0]
+    assert other["job_id"] == queued_jobs.job_ids[1]
+    assert claimed["attempts"] == other["attempts"] == 1
+    assert queued_jobs(claimed["job_id"], "status") == "running"
+
+
+def test_failed_attempts_back_off_until_the_last(connect, job_queries, queued_jobs):
+    conn = connect()
+    delays = []
+    for attempt in range(1, 4):
+        job = claim(conn, job_queries)
+        assert job["job_id"] == queued_jobs.job_ids[0]
+        assert job["attempts"] == attempt
+        with conn.transaction():
+            status = fail(conn, job_queries, job)
+            # now() is the start of the transaction, as in FAIL.
+            delays.append(
+                conn.execute(
+                    "SELECT run_at - now() FROM jobs WHERE job_id = %s;",
+                    (job["job_id"],),
+                ).fetchone()[0]
+            )
+        if attempt < 3:
+            assert status == "queued"
+            assert queued_jobs(job["job_id"], "finished_at") is None
+            make_due(conn, job)
+    # Doubling from 10 seconds, capped at 15.
+    assert delays[:2] == [timedelta(seconds=10), timedelta(seconds=15)]
+    assert status == "failed"
+    assert queued_jobs(job["job_id"], "finished_at") is not None
+    assert queued_jobs(job["job_id"], "last_error") == "failed"
+
+
+def test_failure_without_retry_is_final(connect, job_queries, queued_jobs):
+    conn = connect()
+    job = claim(conn, job_queries)
+    assert fail(conn, job_queries, job, retry=False) == "failed"
+    assert queued_jobs(job["job_id"], "attempts") == 1
+
+
+def test_expired_leases_are_requeued_until_the_last_attempt(
+    connect, job_queries, queued_jobs
+):
+    conn = connect()
+    for attempt in range(1, 4):
+        job = claim(conn, job_queries)
+        assert job["job_id"] == queued_jobs.job_ids[0]
+        expire(conn, job)
+        conn.execute(job_queries.REQUEUE_EXPIRED)
+        assert queued_jobs(job["job_id"], "locked_until") is None
+        if attempt < 3:
+            assert queued_jobs(job["job_id"], "status") == "queued"
+            make_due(conn, job)
+    assert queued_jobs(job["job_id"], "status") == "failed"
+    assert queued_jobs(job["job_id"], "attempts") == 3
+
+
+def test_unexpired_leases_are_not_requeued(connect, job_queries, queued_jobs):
+    conn = connect()
+    job = claim(conn, job_queries)
+    conn.execute(job_queries.REQUEUE_EXPIRED)
+    assert queued_jobs(job["job_id"], "status") == "running"
+
+
+def test_attempt_cannot_record_its_outcome_after_a_takeover(
+    database_url, connect, job_queries, queued_jobs
+):
+    conn = connect()
+    stale = claim(conn, job_queries)
+    expire(conn, stale)
+    conn.execute(job_queries.REQUEUE_EXPIRED)
+    make_due(conn, stale)
+    current = claim(conn, job_queries)
+    assert current["job_id"] == stale["job_id"]
+    assert current["attempts"] == 2
+
+    async def record(job):
+        async with await psycopg.AsyncConnection.connect(database_url) as aconn:
+            return await job_queries.record_success(aconn, job, {"done": True})
+
+    assert asyncio.run(record(stale)) is False
+    assert fail(conn, job_queries, stale) is None
+    assert queued_jobs(current["job_id"], "status") == "running"
+    assert asyncio.run(record(current)) is True
+    assert queued_jobs(current["job_id"], "status") == "succeeded"
+
+
+@pytest.fixture
+def account_tree(connect):
+    """
+    A parent account with a subsidiary, each with a contact and an
+    opportunity; the opportunities have an activity, and association
+    rows linking them to the contacts and a user. Returns the ids.
+    """
+    conn = connect()
+    with conn.transaction():
+        seq, tombstone = conn.execute(
+            """--sql
+            SELECT
+                (SELECT coalesce(max(seq), 0) FROM change_outbox),
+                (SELECT coalesce(max(tombstone_id), 0) FROM tombstones);
+            """
+        ).fetchone()
+        ids = {
+            "user": conn.execute(
+                """--sql
+                INSERT INTO users (username, email, hashed_password)
+                VALUES ('cascade_user', 'cascade_user@example.com', 'x')
+                RETURNING user_id;
+                """
+            ).fetchone()[0],
+            "stage": conn.execute(
+                "INSERT INTO stages (stage_name) VALUES ('Cascade stage') "
+                "RETURNING stage_id;"
+            ).fetchone()[0],
+            "type": conn.execute(
+                "INSERT INTO activity_types (type_name) VALUES ('Cascade type') "
+                "RETURNING activity_type_id;"
+            ).fetchone()[0],
+        }
+        parent = conn.execute(
+            "INSERT INTO accounts (account_name) VALUES ('Cascade parent') "
+            "RETURNING account_id;"
+        ).fetchone()[0]
+        child = conn.execute(
+            "INSERT INTO accounts (account_name, parent_account_id) "
+            "VALUES ('Cascade child', %s) RETURNING account_id;",
+            (parent,),
+        ).fetchone()[0]
+        ids["accounts"] = [parent, child]
+        ids["contacts"], ids["opportunities"], ids["activities"] = [], [], []
+        for account in ids["accounts"]:
+            contact = conn.execute(
+                "INSERT INTO contacts (account_id, first_name, last_name, email) "
+                "VALUES (%s, 'Cascade', 'Contact', 'cascade@example.com') "
+                "RETURNING contact_id;",
+                (account,),
+            ).fetchone()[0]
+            opportunity = conn.execute(
+                "INSERT INTO opportunities (account_id, opportunity_name, stage_id) "
+                "VALUES (%s, 'Cascade opportunity', %s) RETURNING opportunity_id;",
+                (account, ids["stage"]),
+            ).fetchone()[0]
+            activity = conn.execute(
+                "INSERT INTO activities (activity_type_id, opportunity_id) "
+                "VALUES (%s, %s) RETURNING activity_id;",
+                (ids["type"], opportunity),
+            ).fetchone()[0]
+            for table, columns, values in (
+                (
+                    "opportunity_contacts",
+                    "opportunity_id, contact_id",
+                    (opportunity, contact),
+                ),
+                (
+                    "opportunity_owners",
+                    "opportunity_id, user_id",
+                    (opportunity, ids["user"]),
+                ),
+                ("activity_contacts", "activity_id, contact_id", (activity, contact)),
+                ("activity_users", "activity_id, user_id", (activity, ids["user"])),
+            ):
+                conn.execute(
+                    f"INSERT INTO {table} ({columns}) VALUES (%s, %s);", values
+                )
+            ids["contacts"].append(contact)
+            ids["opportunities"].append(opportunity)
+            ids["activities"].append(activity)
+    yield ids
+    with conn.transaction():
+        # Whatever the test left, and the change feed it wrote.
+        for statement in (
+            "DELETE FROM activity_users WHERE user_id = %(user)s;",
+            "DELETE FROM activity_contacts WHERE activity_id = ANY(%(activities)s);",
+            "DELETE FROM opportunity_owners WHERE user_id = %(user)s;",
+            "DELETE FROM opportunity_contacts "
+            "WHERE opportunity_id = ANY(%(opportunities)s);",
+            "DELETE FROM activities WHERE activity_id = ANY(%(activities)s);",
+            "DELETE FROM opportunities WHERE opportunity_id = ANY(%(opportunities)s);",
+            "DELETE FROM contacts WHERE contact_id = ANY(%(contacts)s);",
+            "DELETE FROM accounts WHERE account_id = ANY(%(accounts)s);",
+            "DELETE FROM activity_types WHERE activity_type_id = %(type)s;",
+            "DELETE FROM stages WHERE stage_id = %(stage)s;",
+            "DELETE FROM users WHERE user_id = %(user)s;",
+        ):
+            conn.execute(statement, ids)
+        conn.execute("DELETE FROM change_outbox WHERE seq > %s;", (seq,))
+        conn.execute("DELETE FROM tombstones WHERE tombstone_id > %s;", (tombstone,))
+
+
+def delete_cascading(*deletes: tuple[str, list[int]]) -> list[dict]:
+    """
+    Runs the (table, keys) deletes in turn. The pool cannot be opened
+    again once closed, so every delete of the session goes through here.
+    """
+    from queries.cascade import delete_cascading
+    from queries.pool import close_pool, open_pool
+    from queries.report_queries import stop_pipeline_refresh
+
+    async def run():
+        await open_pool()
+        try:
+            return [await delete_cascading(table, keys) for table, keys in deletes]
+        finally:
+            await stop_pipeline_refresh()
+            await close_pool()
+
+    return asyncio.run(run())
+
+
+def test_deleting_an_account_deletes_its_subtree(connect, account_tree):
+    parent = account_tree["accounts"][0]
+    contact, account = delete_cascading(
+        ("contacts", account_tree["contacts"][:1]), ("accounts", [parent, -1])
+    )
+    # A contact takes its association rows, not its account.
+    assert contact == {
+        "deleted": {
+            "activity_contacts": 1,
+            "opportunity_contacts": 1,
+            "contacts": 1,
+        },
+        "missing": [],
+    }
+    assert account == {
+        "deleted": {
+            "activity_users": 2,
+            "activity_contacts": 1,
+            "opportunity_owners": 2,
+            "opportunity_contacts": 1,
+            "activities": 2,
+            "opportunities": 2,
+            "contacts": 1,
+            "accounts": 2,
+        },
+        "missing": [-1],
+    }
+    conn = connect()
+    remaining = conn.execute(
+        """--sql
+        SELECT
+            (SELECT count(*) FROM accounts WHERE account_id = ANY(%(accounts)s)),
+            (SELECT count(*) FROM account_closure
+                WHERE descendant_id = ANY(%(accounts)s)),
+            (SELECT count(*) FROM contacts WHERE contact_id = ANY(%(contacts)s)),
+            (SELECT count(*) FROM opportunities
+                WHERE opportunity_id = ANY(%(opportunities)s)),
+            (SELECT count(*) FROM activities
+                WHERE activity_id = ANY(%(activities)s));
+        """,
+        account_tree,
+    ).fetchone()
+    assert remaining == (0, 0, 0, 0, 0)
+    deleted = conn.execute(
+        """--sql
+        SELECT key FROM change_outbox
+        WHERE table_name = 'accounts' AND operation = 'delete'
+        ORDER BY seq DESC LIMIT 2;
+        """
+    ).fetchall()
+    assert sorted(row[0] for row in deleted) == sorted(account_tree["accounts"])
@@ -0,0 +1,274 @@
+"""
+Plan regression tests: EXPLAIN the hot lookups against a seeded database
+and fail if any of them reads a table with a sequential scan. These
+catch dropped or missing indexes (see migration 014) before they show up
+as slow pages in production.
+"""
+
+import pytest
+
+# (description, query, parameters). Parameters name a seeded entity whose
+# id is substituted, see the seed_ids fixture; anything else is passed as is.
+HOT_QUERIES = [
+    (
+        "contacts of an account",
+        "SELECT * FROM contacts WHERE account_id = %s",
+        ("account",),
+    ),
+    (
+        "opportunities of an account",
+        "SELECT * FROM opportunities WHERE account_id = %s",
+        ("account",),
+    ),
+    (
+        "opportunities in a forecast category",
+        "SELECT * FROM opportunities WHERE forecast_category_id = %s",
+        (1,),
+    ),
+    (
+        "activities of an opportunity",
+        "SELECT * FROM activities WHERE opportunity_id = %s",
+        ("opportunity",),
+    ),
+    (
+        "accounts owned by a user",
+        "SELECT * FROM accounts WHERE account_owner_id = %s",
+        ("user",),
+    ),
+    (
+        "subsidiaries of an account",
+        "SELECT * FROM accounts WHERE parent_account_id = %s",
+        ("account",),
+    ),
+    (
+        "activities assigned to a user",
+        """
+        SELECT a.* FROM activity_users au
+        JOIN activities a ON a.activity_id = au.activity_id
+        WHERE au.user_id = %s
+        """,
+        ("user",),
+    ),
+    (
+        "opportunities owned by a user",
+        """
+        SELECT o.* FROM opportunity_owners oo
+        JOIN opportunities o ON o.opportunity_id = oo.opportunity_id
+        WHERE oo.user_id = %s
+        """,
+        ("user",),
+    ),
+    (
+        "activities of a contact",
+        "SELECT * FROM activity_contacts WHERE contact_id = %s",
+        ("contact",),
+    ),
+    (
+        "opportunities of a contact",
+        "SELECT * FROM opportunity_contacts WHERE contact_id = %s",
+        ("contact",),
+    ),
+    (
+        "contacts in a country (FK check on country delete)",
+        "SELECT 1 FROM contacts WHERE site_country_id = %s",
+        ("country",),
+    ),
+    (
+        "keyset page of contacts",
+        "SELECT * FROM contacts WHERE contact_id > %s ORDER BY contact_id LIMIT %s",
+        (1000, 51),
+    ),
+    (
+        "accounts sorted by name (migration 015)",
+        """
+        SELECT * FROM accounts
+        WHERE (account_name, account_id) > (%s, %s)
+        ORDER BY account_name ASC, account_id ASC
+        LIMIT %s
+        """,
+        ("Seed account 5", 0, 51),
+    ),
+    (
+        "opportunities sorted by close date, newest first",
+        """
+        SELECT * FROM opportunities
+        ORDER BY close_date DESC, opportunity_id DESC
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "accounts sorted by billing city",
+        """
+        SELECT * FROM accounts
+        ORDER BY billing_city ASC, account_id ASC
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "contacts sorted by email, last first",
+        """
+        SELECT * FROM contacts
+        ORDER BY email DESC, contact_id DESC
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "users sorted by last name",
+        """
+        SELECT * FROM users
+        ORDER BY last_name ASC, user_id ASC
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "activities sorted by due date",
+        """
+        SELECT * FROM activities
+        ORDER BY due_date ASC, activity_id ASC
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "lookup of accounts by id",
+        "SELECT * FROM accounts WHERE account_id = ANY(%s) ORDER BY account_id",
+        ([1, 2, 3],),
+    ),
+    (
+        "lookup of opportunity owners by key pair",
+        """
+        SELECT * FROM opportunity_owners
+        WHERE (opportunity_id, user_id) IN (
+            SELECT * FROM unnest(%s::integer[], %s::integer[])
+        )
+        ORDER BY opportunity_id, user_id
+        """,
+        ([1, 2], [1, 1]),
+    ),
+    (
+        "subtree of an account (migration 017)",
+        """
+        SELECT * FROM accounts
+        WHERE account_id IN (
+            SELECT descendant_id FROM account_closure WHERE ancestor_id = %s
+        )
+        ORDER BY account_id
+        LIMIT %s
+        """,
+        ("account", 51),
+    ),
+    (
+        "open pipeline under an account",
+        """
+        SELECT count(*), sum(o.amount)
+        FROM account_closure c
+        JOIN opportunities o ON o.account_id = c.descendant_id
+        JOIN stages s ON s.stage_id = o.stage_id
+        WHERE c.ancestor_id = %s AND NOT s.is_closed
+        """,
+        ("account",),
+    ),
+    (
+        "ancestors of an account",
+        "SELECT ancestor_id FROM account_closure WHERE descendant_id = %s",
+        ("account",),
+    ),
+    (
+        "overdue activities of a user (migration 018)",
+        """
+        SELECT * FROM activities
+        WHERE activity_id IN (
+            SELECT activity_id FROM activity_users WHERE user_id = %s
+        )
+            AND NOT completed AND due_date < CURRENT_DATE
+        ORDER BY due_date, activity_id
+        LIMIT %s
+        """,
+        ("user", 51),
+    ),
+    (
+        "oldest open activities",
+        """
+        SELECT * FROM activities
+        WHERE NOT completed AND due_date < CURRENT_DATE
+        ORDER BY due_date, activity_id
+        LIMIT %s
+        """,
+        (51,),
+    ),
+    (
+        "change feed after a change (migration 020)",
+        """
+        SELECT * FROM change_outbox
+        WHERE (xid, seq) > (%s::xid8, %s)
+            AND xid < pg_snapshot_xmin(pg_current_snapshot())
+        ORDER BY xid, seq
+        LIMIT %s
+        """,
+        ("0", 0, 51),
+    ),
+    (
+        "accounts changed since a sync (migration 022)",
+        """
+        SELECT * FROM accounts
+        WHERE updated_at >= %s::timestamptz AND updated_at < 'infinity'
+            AND (updated_at, account_id) > (%s::timestamptz, %s)
+        ORDER BY updated_at, account_id
+        LIMIT %s
+        """,
+        ("2999-01-01", "2999-01-01", 0, 51),
+    ),
+    (
+        "deletes of a table since a sync",
+        """
+        SELECT * FROM tombstones
+        WHERE table_name = %s
+            AND deleted_at >= %s::timestamptz AND deleted_at < 'infinity'
+            AND (deleted_at, tombstone_id) > (%s::timestamptz, %s)
+        ORDER BY deleted_at, tombstone_id
+        LIMIT %s
+        """,
+        ("contacts", "2999-01-01", "2999-01-01", 0, 51),
+    ),
+    (
+        "next job due (migration 023)",
+        """
+        SELECT job_id FROM jobs
+        WHERE status = 'queued' AND run_at <= now()
+        ORDER BY run_at, job_id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+        """,
+        (),
+    ),
+    (
+        "jobs whose worker stopped",
+        "SELECT job_id FROM jobs WHERE status = 'running' AND locked_until < now()",
+        (),
+    ),
+]
+
+
+def sequential_scans(plan: dict) -> list[str]:
+    scans = []
+    if plan["Node Type"] == "Seq Scan":
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(sequential_scans(child))
+    return scans
+
+
+@pytest.mark.parametrize(
+    "query, params",
+    [pytest.param(q, p, id=description) for description, q, p in HOT_QUERIES],
+)
+def test_hot_query_uses_indexes(seeded_db, seed_ids, query, params):
+    params = [seed_ids.get(p, p) if isinstance(p, str) else p for p in params]
+    with seeded_db.cursor() as cur:
+        cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+        plan = cur.fetchone()[0][0]["Plan"]
+    assert sequential_scans(plan) == []
@@ -0,0 +1,21 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def check_etag(
+    request: Request, response: Response, payload: BaseModel
+) -> Optional[Response]:
+    """
+    Sets an ETag on response for the JSON form of payload. Returns a 304
+    response to send instead when the client's If-None-Match already
+    holds that ETag, otherwise None.
+    """
+    etag = '"' + hashlib.sha1(payload.model_dump_json().encode()).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
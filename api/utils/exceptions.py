@@ -143,3 +143,59 @@ class ActivityContactDatabaseError(Exception):
 
 class ActivityContactDoesNotExist(Exception):
     pass
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class BulkImportDatabaseError(Exception):
+    pass
+
+
+class InvalidImportFileError(Exception):
+    pass
+
+
+class BulkOperationError(Exception):
+    pass
+
+
+class InvalidFieldsError(Exception):
+    pass
+
+
+class InvalidFilterError(Exception):
+    pass
+
+
+class ReportDatabaseError(Exception):
+    pass
+
+
+class InvalidChangeError(Exception):
+    pass
+
+
+class ChangeDatabaseError(Exception):
+    pass
+
+
+class SyncDatabaseError(Exception):
+    pass
+
+
+class JobDatabaseError(Exception):
+    pass
+
+
+class JobDoesNotExist(Exception):
+    pass
+
+
+class InvalidJobError(Exception):
+    pass
+
+
+class JobLeaseExpired(Exception):
+    pass
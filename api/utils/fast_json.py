@@ -0,0 +1,27 @@
+# Fast path for large responses.
+#
+# Normally a query builds one pydantic model per row (class_row), and
+# FastAPI then validates and serializes the result again against the
+# route's return annotation. For rows that come straight from our own
+# tables both passes are redundant. Routes that opt in select an explicit
+# list of the response model's columns (utils.fields) as plain dicts
+# (dict_row) and return a FastJSONResponse, which FastAPI sends as-is:
+# orjson turns the dicts into bytes in one step. Such routes declare the
+# model as response_model= to keep it in the OpenAPI schema.
+
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value):
+    # numeric columns are declared as float on the models.
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
@@ -0,0 +1,61 @@
+# Sparse fieldsets for the GET routes (?fields=account_id,account_name).
+#
+# The response model's fields are the whitelist of selectable columns;
+# the requested names are checked against it and compiled to an explicit
+# SELECT list, so nothing outside the model (users.hashed_password) can
+# ever be selected. The primary key columns are always included, since
+# list pages build their cursor from them. Without fields=, list routes
+# use the model's summary_fields, which leave out wide free-text and
+# address columns, and detail routes return every field.
+
+from functools import cache
+from typing import Optional, Sequence
+
+from psycopg import sql
+from pydantic import BaseModel, create_model
+
+from utils.exceptions import InvalidFieldsError
+
+
+def resolve_fields(
+    model: type[BaseModel],
+    pk: Sequence[str],
+    fields: Optional[str],
+    default: Optional[Sequence[str]] = None,
+) -> tuple[str, ...]:
+    """
+    Returns the columns to select, in model field order. fields is the
+    raw comma-separated query parameter; default (all fields if None) is
+    used when it is empty.
+    """
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(model.model_fields)
+        if unknown:
+            raise InvalidFieldsError(
+                f"Unknown fields: {', '.join(sorted(unknown))}. "
+                f"Choose from: {', '.join(model.model_fields)}."
+            )
+    else:
+        requested = set(default or model.model_fields)
+    requested.update(pk)
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+def column_list(columns: Sequence[str]) -> sql.Composed:
+    return sql.SQL(", ").join(map(sql.Identifier, columns))
+
+
+@cache
+def sparse_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    model with every field optional, for the OpenAPI schema of routes
+    that accept fields=.
+    """
+    return create_model(
+        f"{model.__name__}Fields",
+        **{
+            name: (Optional[field.annotation], None)
+            for name, field in model.model_fields.items()
+        },
+    )
@@ -0,0 +1,290 @@
+# Filter and sort grammar for the list routes.
+#
+#   ?filter=account_id:eq:42,close_date:gte:2026-10-01,amount:gt:50000
+#   ?sort=-close_date,opportunity_name
+#
+# filter is a comma-separated list of field:operator:value terms that must
+# all hold. Values are parsed with the model's type for the field; "in"
+# takes several values separated by "|", and a literal "," or "|" inside a
+# value is written "\," or "\|". sort is a comma-separated list of fields,
+# each optionally prefixed with "-" for descending order. Only the columns
+# a model whitelists in filter_fields and sort_fields are accepted, and
+# everything compiles to parameterized SQL: no part of the request is
+# ever spliced into the query text.
+#
+# The primary key is always appended to the sort as a tie-breaker, and a
+# sorted list's cursor holds the sort plus the last row's value of every
+# sort column. NULLs sort last ascending and first descending, as in
+# Postgres' defaults.
+
+from decimal import Decimal
+from functools import cache
+from typing import Optional, Sequence, Union, get_args, get_origin
+
+from psycopg import sql
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from utils.exceptions import InvalidCursorError, InvalidFilterError
+from utils.pagination import load_cursor
+
+COMPARISONS = {
+    "eq": "=",
+    "ne": "<>",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+OPERATORS = (*COMPARISONS, "in", "contains", "null")
+
+
+def _split(text: str, separator: str) -> list[str]:
+    """
+    Splits text on separator, except where it is escaped with a backslash.
+    Escapes are kept; _unescape() removes them once splitting is done.
+    """
+    parts, current, escaped = [], "", False
+    for char in text:
+        if escaped:
+            current += char
+            escaped = False
+        elif char == "\\":
+            current += char
+            escaped = True
+        elif char == separator:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def _unescape(text: str) -> str:
+    result, escaped = "", False
+    for char in text:
+        if char == "\\" and not escaped:
+            escaped = True
+        else:
+            result += char
+            escaped = False
+    return result
+
+
+def _field_type(model: type[BaseModel], name: str) -> type:
+    annotation = model.model_fields[name].annotation
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    return annotation
+
+
+@cache
+def _adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    field_type = _field_type(model, name)
+    # numeric columns are floats on the models; compare them exactly.
+    if field_type is float:
+        field_type = Decimal
+    return TypeAdapter(field_type)
+
+
+def _is_text(model: type[BaseModel], name: str) -> bool:
+    """
+    Whether the field holds text, including str types with validation of
+    their own such as EmailStr, which pydantic wraps around a str schema.
+    """
+    schema = _adapter(model, name).core_schema
+    while schema["type"].startswith("function-") and "schema" in schema:
+        schema = schema["schema"]
+    return schema["type"] == "str"
+
+
+def _parse(model: type[BaseModel], name: str, raw) -> object:
+    try:
+        return _adapter(model, name).validate_python(raw)
+    except ValidationError:
+        raise InvalidFilterError(f"{name}: {raw!r} is not a valid value.")
+
+
+def _nullable(model: type[BaseModel], name: str) -> bool:
+    return not model.model_fields[name].is_required()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _condition(model: type[BaseModel], term: str) -> tuple[sql.Composable, list]:
+    parts = term.split(":", 2)
+    if len(parts) != 3:
+        raise InvalidFilterError(
+            f"Filter {_unescape(term)!r} is not of the form field:operator:value."
+        )
+    name, operator, value = parts
+    if name not in model.filter_fields:
+        raise InvalidFilterError(
+            f"Cannot filter on {name!r}. "
+            f"Choose from: {', '.join(model.filter_fields)}."
+        )
+    column = sql.Identifier(name)
+    if operator in COMPARISONS:
+        return (
+            sql.SQL("{} {} %s").format(column, sql.SQL(COMPARISONS[operator])),
+            [_parse(model, name, _unescape(value))],
+        )
+    if operator == "in":
+        values = [_parse(model, name, _unescape(v)) for v in _split(value, "|")]
+        return sql.SQL("{} = ANY(%s)").format(column), [values]
+    if operator == "contains":
+        if not _is_text(model, name):
+            raise InvalidFilterError(f"{name!r} is not a text field.")
+        pattern = "%" + _escape_like(_unescape(value)) + "%"
+        return sql.SQL("{} ILIKE %s").format(column), [pattern]
+    if operator == "null":
+        if value not in ("true", "false"):
+            raise InvalidFilterError(f"{name}:null takes true or false.")
+        test = "IS NULL" if value == "true" else "IS NOT NULL"
+        return sql.SQL("{} {}").format(column, sql.SQL(test)), []
+    raise InvalidFilterError(
+        f"Unknown operator {operator!r}. Choose from: {', '.join(OPERATORS)}."
+    )
+
+
+class ListQuery:
+    """
+    The WHERE and ORDER BY clauses, their parameters, and the keyset
+    cursor layout for one request to a list route. pk is the model's
+    primary key column(s).
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        pk: Sequence[str],
+        filter: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ):
+        self.model = model
+        conditions, self.params = [], []
+        for term in _split(filter or "", ","):
+            if term:
+                condition, params = _condition(model, term)
+                conditions.append(condition)
+                self.params.extend(params)
+
+        self.sort = [] if not sort else self._parse_sort(sort)
+        descending = self.sort[-1][1] if self.sort else False
+        sorted_names = {name for name, _ in self.sort}
+        self.sort += [(name, descending) for name in pk if name not in sorted_names]
+        self.key = tuple(name for name, _ in self.sort)
+        # Cursors of the default (primary key) order keep the plain
+        # [pk...] layout; sorted ones are tagged with their sort.
+        self.cursor_prefix = (sort,) if sort else ()
+
+        if cursor:
+            condition, params = self._after(self._decode(cursor))
+            conditions.append(condition)
+            self.params.extend(params)
+
+        self.where = (
+            sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("TRUE")
+        )
+        self.order_by = sql.SQL(", ").join(
+            sql.SQL("{} {}").format(
+                sql.Identifier(name), sql.SQL("DESC" if desc else "ASC")
+            )
+            for name, desc in self.sort
+        )
+
+    def select(self, columns: Sequence[str]) -> tuple[str, ...]:
+        """
+        columns plus any sort column missing from it, which the next
+        cursor is built from.
+        """
+        return (*columns, *(name for name in self.key if name not in columns))
+
+    def _parse_sort(self, sort: str) -> list[tuple[str, bool]]:
+        result = []
+        for item in sort.split(","):
+            name = item.removeprefix("-")
+            if name not in self.model.sort_fields:
+                raise InvalidFilterError(
+                    f"Cannot sort on {name!r}. "
+                    f"Choose from: {', '.join(self.model.sort_fields)}."
+                )
+            if name in (n for n, _ in result):
+                raise InvalidFilterError(f"{name!r} appears twice in sort.")
+            result.append((name, item.startswith("-")))
+        return result
+
+    def _decode(self, cursor: str) -> list:
+        values = load_cursor(cursor)
+        size = len(self.cursor_prefix)
+        prefix, values = values[:size], values[size:]
+        if prefix != list(self.cursor_prefix) or len(values) != len(self.key):
+            raise InvalidCursorError(
+                f"Cursor {cursor!r} does not belong to this sort order."
+            )
+        try:
+            return [
+                (
+                    None
+                    if value is None and _nullable(self.model, name)
+                    else _parse(self.model, name, value)
+                )
+                for name, value in zip(self.key, values)
+            ]
+        except InvalidFilterError:
+            raise InvalidCursorError(f"Malformed cursor {cursor!r}.")
+
+    def _after(self, values: list) -> tuple[sql.Composable, list]:
+        """
+        The condition for rows that sort after the row with the given key
+        values.
+        """
+        nullable = [_nullable(self.model, name) for name in self.key]
+        directions = {desc for _, desc in self.sort}
+        if not any(nullable) and len(directions) == 1:
+            # A row comparison, which an index on the sort columns can
+            # answer directly.
+            columns = sql.SQL(", ").join(map(sql.Identifier, self.key))
+            placeholders = sql.SQL(", ").join(sql.Placeholder() * len(values))
+            return (
+                sql.SQL("({}) {} ({})").format(
+                    columns, sql.SQL("<" if directions.pop() else ">"), placeholders
+                ),
+                values,
+            )
+
+        alternatives, params = [], []
+        for i, ((name, desc), value) in enumerate(zip(self.sort, values)):
+            column = sql.Identifier(name)
+            if value is None:
+                if desc:
+                    after, after_params = sql.SQL("{} IS NOT NULL").format(column), []
+                else:
+                    continue
+            elif desc:
+                after, after_params = sql.SQL("{} < %s").format(column), [value]
+            elif nullable[i]:
+                after = sql.SQL("({0} > %s OR {0} IS NULL)").format(column)
+                after_params = [value]
+            else:
+                after, after_params = sql.SQL("{} > %s").format(column), [value]
+
+            parts = []
+            for (prior, _), prior_value in zip(self.sort[:i], values[:i]):
+                if prior_value is None:
+                    parts.append(sql.SQL("{} IS NULL").format(sql.Identifier(prior)))
+                else:
+                    parts.append(sql.SQL("{} = %s").format(sql.Identifier(prior)))
+                    params.append(prior_value)
+            parts.append(after)
+            params.extend(after_params)
+            alternatives.append(sql.SQL("({})").format(sql.SQL(" AND ").join(parts)))
+
+        if not alternatives:
+            return sql.SQL("FALSE"), []
+        return sql.SQL("({})").format(sql.SQL(" OR ").join(alternatives)), params
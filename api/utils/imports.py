@@ -0,0 +1,31 @@
+# Helpers for the bulk import endpoints and the `python -m imports` CLI.
+#
+# read_rows() turns an uploaded or local file into a stream of records:
+# dicts for CSV and raw lines for NDJSON (pydantic parses those directly
+# with model_validate_json). Nothing is buffered beyond the current line.
+# A CSV row with more cells than the header keeps the extra ones under
+# the key None, which the import reports as an error for that row.
+
+import csv
+import io
+from enum import Enum
+from typing import BinaryIO, Iterator, Union
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+def read_rows(stream: BinaryIO, format: ImportFormat) -> Iterator[Union[dict, str]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if format == ImportFormat.csv:
+        # strict: bad quoting is an error, not a value running to the end
+        # of the file.
+        for row in csv.DictReader(text, strict=True):
+            # An empty CSV cell means "no value", not an empty string.
+            yield {key: value for key, value in row.items() if value != ""}
+    else:
+        for line in text:
+            if line.strip():
+                yield line
@@ -0,0 +1,90 @@
+# Keyset (cursor) pagination helpers shared by the list queries.
+#
+# A cursor is the primary key of the last row on the previous page,
+# JSON encoded and base64'd so clients treat it as an opaque token. List
+# queries select "WHERE pk > cursor ORDER BY pk LIMIT n + 1"; the extra
+# row only tells us whether another page exists. Sorted lists (see
+# utils.filters) also put the sort and the last row's sort values in the
+# cursor.
+
+import base64
+import binascii
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from models.page import Page
+from utils.exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=_json_default)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def load_cursor(cursor: str) -> list:
+    """
+    The list of values in cursor. Raises InvalidCursorError if it is not
+    one of ours.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Malformed cursor {cursor!r}.")
+    if not isinstance(values, list):
+        raise InvalidCursorError(f"Malformed cursor {cursor!r}.")
+    return values
+
+
+def decode_cursor(cursor: Optional[str], default: tuple) -> tuple:
+    if not cursor:
+        return default
+    values = load_cursor(cursor)
+    if len(values) != len(default) or not all(
+        type(v) is type(d) for v, d in zip(values, default)
+    ):
+        raise InvalidCursorError(f"Malformed cursor {cursor!r}.")
+    return tuple(values)
+
+
+def _value(row, column: str):
+    return row[column] if isinstance(row, dict) else getattr(row, column)
+
+
+def _next_cursor(rows: list, key: Sequence[str], prefix: Sequence) -> str:
+    return encode_cursor([*prefix, *(_value(rows[-1], k) for k in key)])
+
+
+def paginate(rows: list, limit: int, key: Sequence[str], prefix: Sequence = ()) -> Page:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _next_cursor(rows, key, prefix)
+    return Page(items=rows, next_cursor=next_cursor)
+
+
+def paginate_rows(
+    rows: list[dict], limit: int, key: Sequence[str], prefix: Sequence = ()
+) -> dict:
+    """
+    paginate() for dict rows on the fast path (utils.fast_json); returns
+    the page as a plain dict in the shape of Page.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _next_cursor(rows, key, prefix)
+    return {"items": rows, "next_cursor": next_cursor}
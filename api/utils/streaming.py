@@ -0,0 +1,101 @@
+# Helpers for the /export endpoints and the change stream.
+#
+# Query methods yield rows from a server-side (named) cursor; these
+# helpers turn that row stream into NDJSON or CSV bytes for a
+# StreamingResponse. Rows are buffered into chunks of roughly
+# CHUNK_SIZE bytes so that a large export is not one ASGI message per row.
+
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+# Rows fetched from the server per network round trip.
+EXPORT_ITERSIZE = 2000
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def ndjson_chunks(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    async for row in rows:
+        buffer.write(json.dumps(row, default=_json_default))
+        buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def csv_chunks(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = None
+    async for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    rows: AsyncIterator[dict], format: ExportFormat, name: str
+) -> StreamingResponse:
+    if format == ExportFormat.csv:
+        body, media_type = csv_chunks(rows), "text/csv"
+    else:
+        body, media_type = ndjson_chunks(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+
+async def sse_chunks(
+    events: AsyncIterator[tuple[str, dict]],
+) -> AsyncIterator[bytes]:
+    """
+    Server-sent events from queries.change_stream: each event with its
+    seq as the event id, which browsers send back as Last-Event-ID when
+    they reconnect. Keepalives carry no data, only the id.
+    """
+    async for event, change in events:
+        if event == "keepalive":
+            yield f"id: {change['seq']}\n: keepalive\n\n".encode()
+        else:
+            data = json.dumps(change, default=_json_default)
+            yield f"id: {change['seq']}\nevent: {event}\ndata: {data}\n\n".encode()
+
+
+def sse_response(events: AsyncIterator[tuple[str, dict]]) -> StreamingResponse:
+    return StreamingResponse(
+        sse_chunks(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )